@@ -5,7 +5,7 @@ a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('/mnt/SubSystems/WwW/Gateway/python_ai_sidebar/images', 'images'), ('/mnt/SubSystems/WwW/Gateway/python_ai_sidebar/icon.svg', '.')],
+    datas=[('/mnt/SubSystems/WwW/Gateway/python_ai_sidebar/images', 'images'), ('/mnt/SubSystems/WwW/Gateway/python_ai_sidebar/blocklists', 'blocklists'), ('/mnt/SubSystems/WwW/Gateway/python_ai_sidebar/icon.svg', '.')],
     hiddenimports=['sidebar', 'components'],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,228 @@
+# File: archive.py
+import hashlib
+import logging
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+
+from utils import AppPaths
+
+SCHEMA_VERSION = 1
+
+# Số message tối đa ghi trong một transaction
+WRITE_BATCH_SIZE = 500
+
+# bm25 chỉ được tính trên N message khớp gần nhất: chi phí xếp hạng cố định
+# dù từ khóa (prefix ngắn) khớp với phần lớn archive
+RANK_CANDIDATES = 1000
+
+SNIPPET_CHARS = 160
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    provider TEXT NOT NULL,
+    role TEXT NOT NULL,
+    url TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL,
+    digest TEXT NOT NULL UNIQUE,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_created_at ON messages(created_at);
+-- Bỏ dấu khi index để tìm "tieng viet" vẫn ra "tiếng việt"; prefix index cho truy vấn "abc*"
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    text, content='messages', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts(messages_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+
+def query_terms(query):
+    # Prefix 1 ký tự khớp gần như mọi từ và không có prefix index: bỏ qua
+    return [term for term in re.findall(r"\w+", query.lower()) if len(term) >= 2]
+
+
+def fts_query(query):
+    """Chuyển chuỗi người dùng nhập thành truy vấn FTS5: mọi từ đều là prefix, nối bằng AND"""
+    return " ".join(f'"{term}"*' for term in query_terms(query))
+
+
+def make_snippet(text, terms):
+    """Đoạn quanh lần xuất hiện đầu tiên của một từ khóa (tính ở Python, rẻ hơn snippet() của FTS5)"""
+    lowered = text.lower()
+    positions = [position for position in (lowered.find(term) for term in terms) if position >= 0]
+    start = max(0, min(positions) - SNIPPET_CHARS // 3) if positions else 0
+    snippet = " ".join(text[start:start + SNIPPET_CHARS].split())
+    return ("…" if start else "") + snippet + ("…" if start + SNIPPET_CHARS < len(text) else "")
+
+
+class ArchiveHit:
+    def __init__(self, message_id, provider, role, url, created_at, snippet):
+        self.id = message_id
+        self.provider = provider
+        self.role = role
+        self.url = url
+        self.created_at = created_at
+        self.snippet = snippet
+
+
+class ArchiveStore:
+    """Lưu mọi câu hỏi/câu trả lời vào SQLite (WAL + FTS5) để tìm kiếm toàn văn.
+
+    add() chỉ đưa message vào hàng đợi; thread nền gộp thành từng transaction.
+    Đọc (search/text) dùng connection riêng của thread gọi, không chờ writer nhờ WAL.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(AppPaths().get_appdata_dir("archive"), "archive.db")
+        self.jobs = queue.Queue()
+        self.local = threading.local()
+        self.ready = threading.Event()
+        self.written = 0
+        self.duplicates = 0
+        self.writer = threading.Thread(target=self.run_writer, name="archive-writer", daemon=True)
+        self.writer.start()
+
+    def connect(self):
+        connection = sqlite3.connect(self.path, timeout=5)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    # --- Ghi (thread nền) ---
+
+    def add(self, provider, role, text, url="", created_at=None):
+        if not text or not text.strip():
+            return
+        self.jobs.put((provider, role, text, url or "", created_at or time.time()))
+
+    def run_writer(self):
+        try:
+            connection = self.connect()
+            with connection:
+                connection.executescript(SCHEMA)
+                connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        except sqlite3.Error as e:
+            logging.warning(f"Archive: cannot open {self.path}: {e}")
+            self.ready.set()
+            self.drain()
+            return
+        self.ready.set()
+
+        stopping = False
+        while not stopping:
+            job = self.jobs.get()
+            batch = []
+            # Lấy thêm các message đang chờ để ghi chung một transaction
+            while True:
+                if job is None:
+                    stopping = True
+                else:
+                    batch.append(job)
+                if stopping or len(batch) >= WRITE_BATCH_SIZE:
+                    break
+                try:
+                    job = self.jobs.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self.write(connection, batch)
+            for _ in range(len(batch) + (1 if stopping else 0)):
+                self.jobs.task_done()
+        connection.close()
+
+    def write(self, connection, batch):
+        rows = []
+        for provider, role, text, url, created_at in batch:
+            digest = hashlib.blake2b(f"{provider}\0{role}\0{text}".encode("utf-8"), digest_size=16).hexdigest()
+            rows.append((provider, role, url, created_at, digest, text))
+        try:
+            with connection:
+                # rowcount của executemany chỉ đếm dòng mới, không tính dòng bị IGNORE
+                inserted = connection.executemany(
+                    "INSERT OR IGNORE INTO messages (provider, role, url, created_at, digest, text) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", rows).rowcount
+        except sqlite3.Error as e:
+            logging.warning(f"Archive: write failed ({len(rows)} messages): {e}")
+            return
+        self.written += inserted
+        self.duplicates += len(rows) - inserted
+
+    def drain(self):
+        # Không mở được database: bỏ các message đang chờ để wait_idle() không treo
+        while True:
+            job = self.jobs.get()
+            self.jobs.task_done()
+            if job is None:
+                return
+
+    def wait_idle(self):
+        """Chờ tới khi mọi message đã được ghi (dùng khi thoát và trong benchmark)"""
+        self.jobs.join()
+
+    def close(self):
+        self.jobs.put(None)
+        self.writer.join(timeout=5)
+
+    # --- Đọc (thread gọi) ---
+
+    def reader(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            self.ready.wait(timeout=5)
+            connection = self.local.connection = self.connect()
+        return connection
+
+    def search(self, query, limit=50, provider=None):
+        """Mỗi từ được tìm như prefix; RANK_CANDIDATES message khớp gần nhất được xếp theo bm25"""
+        terms = query_terms(query)
+        if not terms:
+            return []
+        # Lọc provider ngay trong tập ứng viên để LIMIT chỉ đếm các message có thể trả về.
+        # Dùng JOIN chứ không dùng "rowid IN (...)": IN khiến FTS5 tra từng rowid một
+        candidates = "SELECT rowid, rank FROM messages_fts WHERE messages_fts MATCH ?"
+        params = [fts_query(query)]
+        if provider:
+            candidates = ("SELECT f.rowid, f.rank FROM messages_fts f JOIN messages p ON p.id = f.rowid "
+                          "WHERE messages_fts MATCH ? AND p.provider = ?")
+            params.append(provider)
+        sql = ("SELECT m.id, m.provider, m.role, m.url, m.created_at, m.text FROM "
+               f"({candidates} ORDER BY 1 DESC LIMIT ?) AS recent "
+               "JOIN messages m ON m.id = recent.rowid "
+               "ORDER BY recent.rank LIMIT ?")
+        params += [RANK_CANDIDATES, limit]
+        try:
+            rows = self.reader().execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            logging.warning(f"Archive: search failed: {e}")
+            return []
+        return [ArchiveHit(*row[:5], make_snippet(row[5], terms)) for row in rows]
+
+    def text(self, message_id):
+        row = self.reader().execute("SELECT text FROM messages WHERE id = ?", (message_id,)).fetchone()
+        return row[0] if row else None
+
+    def count(self):
+        return self.reader().execute("SELECT count(*) FROM messages").fetchone()[0]
+
+    def stats(self):
+        return {"written": self.written, "duplicates": self.duplicates, "pending": self.jobs.qsize()}
+
+
+_archive = None
+
+
+def get_archive():
+    global _archive
+    if _archive is None:
+        _archive = ArchiveStore()
+    return _archive
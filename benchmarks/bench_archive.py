@@ -0,0 +1,93 @@
+# File: benchmarks/bench_archive.py
+"""Nạp corpus giả lập vào archive (SQLite WAL + FTS5) rồi đo độ trễ tìm kiếm prefix có xếp hạng.
+
+    python benchmarks/bench_archive.py [--messages 100000] [--queries 200]
+"""
+import argparse
+import itertools
+import os
+import random
+import tempfile
+import time
+
+import common
+
+from archive import ArchiveStore
+
+PROVIDER_NAMES = ["gemini", "chatgpt", "mistral", "claude"]
+
+# Từ vựng kiểu Zipf: vài từ rất phổ biến, phần lớn hiếm
+SYLLABLES = ["ka", "lo", "mi", "ter", "son", "ra", "vel", "pi", "dor", "an", "qu", "zen", "tri", "mo", "ex"]
+
+
+def make_vocabulary(size, rng):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def make_message(vocabulary, cum_weights, rng):
+    return " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(20, 200)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(20000, rng)
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ArchiveStore(os.path.join(directory, "archive.db"))
+
+        # Thời gian add() là phần GUI thread phải chịu; ghi đĩa nằm ở thread nền
+        add_samples = []
+        start = time.perf_counter()
+        for index in range(args.messages):
+            text = make_message(vocabulary, cum_weights, rng)
+            role = "user" if index % 2 == 0 else "assistant"
+            begin = time.perf_counter()
+            store.add(PROVIDER_NAMES[index % len(PROVIDER_NAMES)], role, text)
+            add_samples.append(time.perf_counter() - begin)
+        store.wait_idle()
+        load_s = time.perf_counter() - start
+        size_mb = os.path.getsize(store.path) / (1024 * 1024)
+
+        common.print_table(f"load {args.messages} messages", [
+            ("add() on caller thread", common.summarize(add_samples)),
+            ("total", {"seconds": round(load_s, 2), "messages_per_s": round(args.messages / load_s),
+                       "written": store.written, "db_mb": round(size_mb, 1)}),
+        ])
+
+        # Truy vấn: 1-2 từ, từ cuối chỉ gõ một phần (như khi đang gõ trong ô tìm kiếm)
+        queries = {"common prefix": [], "rare prefix": [], "two words": []}
+        for _ in range(args.queries):
+            common_word = rng.choice(vocabulary[:200])
+            rare_word = rng.choice(vocabulary[5000:])
+            queries["common prefix"].append(common_word[:3])
+            queries["rare prefix"].append(rare_word[:max(3, len(rare_word) - 2)])
+            queries["two words"].append(f"{common_word} {rare_word[:4]}")
+
+        rows = []
+        for name, batch in queries.items():
+            samples = []
+            hits = 0
+            for query in batch:
+                begin = time.perf_counter()
+                results = store.search(query, limit=50)
+                samples.append(time.perf_counter() - begin)
+                hits += len(results)
+            stats = common.summarize(samples)
+            stats["avg_hits"] = round(hits / len(batch), 1)
+            rows.append((name, stats))
+        common.print_table("ranked prefix search (limit 50)", rows)
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
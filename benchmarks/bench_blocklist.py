@@ -0,0 +1,82 @@
+# File: benchmarks/bench_blocklist.py
+"""Thời gian biên dịch / đọc cache của DomainBlocklist và throughput tra cứu.
+
+    python benchmarks/bench_blocklist.py [--rules 100000] [--lookups 1000000]
+"""
+import argparse
+import random
+import string
+import tempfile
+import time
+
+import common
+
+from blocklist import DomainBlocklist
+
+
+def random_label(rng, length):
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(length))
+
+
+def make_domains(rng, count):
+    tlds = ("com", "net", "io", "org", "co")
+    return [f"{random_label(rng, rng.randint(4, 10))}.{random_label(rng, rng.randint(3, 8))}.{rng.choice(tlds)}"
+            for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=100000)
+    parser.add_argument("--lookups", type=int, default=1000000)
+    parser.add_argument("--hosts", type=int, default=2000, help="số host khác nhau khi tra cứu")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    domains = make_domains(rng, args.rules)
+
+    with tempfile.TemporaryDirectory() as directory:
+        list_path = f"{directory}/list.txt"
+        with open(list_path, "w") as file:
+            file.write("! synthetic list\n")
+            file.writelines(f"||{domain}^\n" for domain in domains)
+
+        start = time.perf_counter()
+        DomainBlocklist.load([list_path], directory)
+        build_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        blocklist = DomainBlocklist.load([list_path], directory)
+        cached_s = time.perf_counter() - start
+
+    # Một nửa host thuộc blocklist (có subdomain), một nửa không
+    hosts = []
+    for i in range(args.hosts):
+        if i % 2:
+            hosts.append(f"cdn{i}.{rng.choice(domains)}")
+        else:
+            hosts.append(f"www.{random_label(rng, 8)}.example.com")
+    sequence = [rng.choice(hosts) for _ in range(args.lookups)]
+
+    should_block = blocklist.should_block
+    start = time.perf_counter()
+    for host in sequence:
+        should_block(host)
+    cached_lookup_s = time.perf_counter() - start
+
+    matches = DomainBlocklist._matches
+    rules = blocklist.domains
+    start = time.perf_counter()
+    for host in sequence:
+        matches(host, rules)
+    uncached_lookup_s = time.perf_counter() - start
+
+    print(f"\nDomainBlocklist, {len(blocklist)} rules")
+    print(f"  compile from text     {build_s * 1000:9.1f} ms")
+    print(f"  load compiled cache   {cached_s * 1000:9.1f} ms")
+    for name, total in (("lookup (host cache)", cached_lookup_s), ("lookup (suffix index)", uncached_lookup_s)):
+        print(f"  {name:<21} {total / args.lookups * 1e9:9.0f} ns/lookup  "
+              f"{args.lookups / total / 1e6:6.2f} M lookups/s")
+
+
+if __name__ == "__main__":
+    main()
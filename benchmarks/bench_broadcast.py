@@ -0,0 +1,111 @@
+# File: benchmarks/bench_broadcast.py
+"""Broadcast một prompt tới ba trang chat giả lập (offline) và đo TTFT / tổng thời gian.
+
+    python benchmarks/bench_broadcast.py [--rounds 5] [--idle-ms 500]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+import common
+
+from PyQt6.QtCore import QUrl
+from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile
+from PyQt6.QtWidgets import QApplication
+
+from components.broadcast import BROADCAST_AGENT_JS, BroadcastBridge, BroadcastController
+from components.page_scripts import InjectionPoint, PageScript
+from components.text_bridge import TEXT_BRIDGE_JS, TextTransferBridge
+from components.web_channel import CHANNEL_BOOTSTRAP_JS, CHANNEL_WORLD, attach_channel, qwebchannel_source
+from providers import GENERIC_SELECTORS
+
+# provider giả lập -> tham số trang (độ trễ token đầu, số token, khoảng cách giữa token)
+STAND_INS = {
+    "gemini": "ttft=250&tokens=40&interval=20",
+    "chatgpt": "ttft=600&tokens=60&interval=15",
+    "mistral": "ttft=150&tokens=30&interval=30",
+}
+
+PROMPT = 'Compare "A" and \\B\\ in two lines\nthen stop.'
+
+
+class StandInPage(QWebEnginePage):
+    """Page tối thiểu có cùng bridge như CustomWebEnginePage"""
+
+    def __init__(self, profile, parent=None):
+        super().__init__(profile, parent)
+        self.channel = attach_channel(self)
+        self.text_bridge = TextTransferBridge(self)
+        self.broadcast_bridge = BroadcastBridge(self)
+        self.channel.registerObject("textBridge", self.text_bridge)
+        self.channel.registerObject("broadcastBridge", self.broadcast_bridge)
+
+
+def make_profile():
+    profile = QWebEngineProfile()
+    # Trang giả lập chạy trên http://127.0.0.1 nên không giới hạn @match
+    for name, source, point in (
+            ("web_channel", qwebchannel_source() + CHANNEL_BOOTSTRAP_JS, InjectionPoint.DocumentCreation),
+            ("text_bridge", TEXT_BRIDGE_JS, InjectionPoint.DocumentReady),
+            ("broadcast_agent", BROADCAST_AGENT_JS, InjectionPoint.DocumentReady)):
+        profile.scripts().insert(PageScript(name, source, injection_point=point, world=CHANNEL_WORLD).build())
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--idle-ms", type=int, default=500)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    profile = make_profile()
+    controller = BroadcastController()
+    controller.idle_ms = args.idle_ms
+    selectors = {provider: dict(GENERIC_SELECTORS, input="#prompt") for provider in STAND_INS}
+
+    with tempfile.TemporaryDirectory() as directory:
+        shutil.copy(os.path.join(os.path.dirname(__file__), "standin_chat.html"), directory)
+        server, base_url = common.serve_directory(directory)
+
+        ttft = {provider: [] for provider in STAND_INS}
+        total = {provider: [] for provider in STAND_INS}
+        answers = {}
+        controller.answerUpdated.connect(answers.__setitem__)
+
+        for round_index in range(args.rounds):
+            # Mỗi vòng load lại cả ba trang cùng lúc, như khi mở broadcast lần đầu
+            pages = {}
+            for provider, query in STAND_INS.items():
+                page = StandInPage(profile)
+                page.setVisible(True)
+                page.setUrl(QUrl(f"{base_url}standin_chat.html?{query}"))
+                pages[provider] = page
+
+            results = []
+            controller.broadcastFinished.connect(results.append)
+            controller.start(PROMPT, list(pages.items()), selectors)
+            common.wait_until(app, lambda: results, timeout_s=120)
+            controller.broadcastFinished.disconnect()
+
+            for provider, timings in results[0].items():
+                if timings["status"] != "done":
+                    print(f"  round {round_index}: {provider} {timings['status']}")
+                    continue
+                if not answers.get(provider, "").startswith("Echo: " + PROMPT.split("\n")[0]):
+                    print(f"  round {round_index}: {provider} answer does not echo the prompt")
+                ttft[provider].append(timings["ttft_ms"] / 1000)
+                total[provider].append(timings["total_ms"] / 1000)
+            for page in pages.values():
+                page.deleteLater()
+
+        common.print_table("time to first token", [(p, common.summarize(s)) for p, s in ttft.items()])
+        common.print_table(f"total (includes {args.idle_ms} ms idle detection)",
+                           [(p, common.summarize(s)) for p, s in total.items()])
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# File: benchmarks/bench_capture.py
+"""Chi phí main thread của lớp capture câu trả lời (ms trên mỗi giây stream)
+và số message gửi về Python so với số lần mutation, trên trang chat giả lập.
+
+    python benchmarks/bench_capture.py [--tokens 2000] [--interval 5] [--flush-ms 250]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+import common
+
+from PyQt6.QtCore import QUrl
+from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile
+from PyQt6.QtWidgets import QApplication
+
+from components.page_scripts import InjectionPoint, PageScript
+from components.response_capture import ResponseCapture, capture_script
+from components.web_channel import CHANNEL_BOOTSTRAP_JS, CHANNEL_WORLD, attach_channel, qwebchannel_source
+from providers import GENERIC_SELECTORS
+
+SUBMIT_JS = """
+document.getElementById('prompt').value = 'benchmark';
+document.getElementById('composer').requestSubmit();
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=2000)
+    parser.add_argument("--interval", type=int, default=5)
+    parser.add_argument("--flush-ms", type=int, default=250)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    profile = QWebEngineProfile()
+    capture = capture_script("chatgpt", GENERIC_SELECTORS, args.flush_ms, 1000)
+    # Trang giả lập chạy trên http://127.0.0.1 nên không giới hạn @match
+    for name, source, point in (
+            ("web_channel", qwebchannel_source() + CHANNEL_BOOTSTRAP_JS, InjectionPoint.DocumentCreation),
+            ("response_capture", capture.source, InjectionPoint.DocumentReady)):
+        profile.scripts().insert(PageScript(name, source, injection_point=point, world=CHANNEL_WORLD).build())
+
+    page = QWebEnginePage(profile)
+    page.setVisible(True)
+    channel = attach_channel(page)
+    bridge = ResponseCapture(page)
+    channel.registerObject("captureBridge", bridge)
+    completed = []
+    bridge.messageCompleted.connect(lambda provider, message_id, text, url: completed.append(text))
+
+    with tempfile.TemporaryDirectory() as directory:
+        shutil.copy(os.path.join(os.path.dirname(__file__), "standin_chat.html"), directory)
+        server, base_url = common.serve_directory(directory)
+
+        loaded = []
+        page.loadFinished.connect(loaded.append)
+        page.setUrl(QUrl(f"{base_url}standin_chat.html?ttft=50&tokens={args.tokens}&interval={args.interval}"))
+        common.wait_until(app, lambda: loaded)
+        page.runJavaScript(SUBMIT_JS, CHANNEL_WORLD.value)
+        common.wait_until(app, lambda: completed, timeout_s=args.tokens * args.interval / 1000 + 60)
+
+        stats = bridge.stats()
+        expected = args.tokens + 1
+        common.print_table(f"capture ({args.tokens} tokens every {args.interval} ms, flush {args.flush_ms} ms)", [
+            ("messages to Python", {"batches": stats["batches"], "mutation_callbacks": stats["mutation_callbacks"],
+                                    "dom_updates": expected}),
+            ("main-thread overhead", {"ms_per_s": stats["overhead_ms_per_s"],
+                                      "busy_ms": round(bridge.page_stats.get("busyMs", 0), 2),
+                                      "active_ms": round(bridge.page_stats.get("activeMs", 0))}),
+            ("result", {"chars": len(completed[0]), "complete": completed[0].endswith(f"token{args.tokens - 1}")}),
+        ])
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
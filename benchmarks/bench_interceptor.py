@@ -0,0 +1,117 @@
+# File: benchmarks/bench_interceptor.py
+"""So sánh thời gian load một trang cục bộ có 500 subresource:
+
+- none:    không cài interceptor (chỉ header tĩnh ở mức profile)
+- legacy:  interceptor cũ, dựng dict 13 header và gọi setHttpHeader cho mọi request
+- policy:  EnhancedBrowserInterceptor với bảng header tính sẵn theo loại resource
+
+    python benchmarks/bench_interceptor.py [--resources 500] [--runs 10]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import common
+
+from PyQt6.QtCore import QUrl
+from PyQt6.QtWebEngineCore import (QWebEnginePage, QWebEngineProfile,
+                                   QWebEngineUrlRequestInterceptor)
+from PyQt6.QtWidgets import QApplication
+
+from components.web_view import EnhancedBrowserInterceptor
+from header_policy import HeaderPolicy
+
+
+class LegacyInterceptor(QWebEngineUrlRequestInterceptor):
+    """Bản sao hành vi trước đây để làm mốc so sánh"""
+
+    def interceptRequest(self, info):
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.5993.88 Safari/537.36",
+            "Accept": "text/html",
+            "Accept-Language": "en-US,en;q=0.9",
+            "Accept-Encoding": "gzip, deflate, br",
+            "DNT": "1",
+            "Upgrade-Insecure-Requests": "1",
+            "Sec-Fetch-Site": "none",
+            "Sec-Fetch-Mode": "navigate",
+            "Sec-Fetch-User": "?1",
+            "Sec-Fetch-Dest": "document",
+            "Sec-Ch-Ua": '"Chromium";v="122", "Not(A:Brand";v="24", "Google Chrome";v="122"',
+            "Sec-Ch-Ua-Mobile": "?0",
+            "Sec-Ch-Ua-Platform": '"Windows"'
+        }
+        for name, value in headers.items():
+            info.setHttpHeader(name.encode(), value.encode())
+
+
+def build_site(directory, resource_count):
+    tags = []
+    for i in range(resource_count):
+        if i % 2:
+            with open(os.path.join(directory, f"s{i}.js"), "w") as file:
+                file.write(f"window.__n = (window.__n || 0) + {i};\n")
+            tags.append(f'<script src="s{i}.js"></script>')
+        else:
+            with open(os.path.join(directory, f"i{i}.svg"), "w") as file:
+                file.write('<svg xmlns="http://www.w3.org/2000/svg" width="1" height="1"/>')
+            tags.append(f'<img src="i{i}.svg">')
+    with open(os.path.join(directory, "index.html"), "w") as file:
+        file.write("<!doctype html><html><body>\n" + "\n".join(tags) + "\n</body></html>")
+
+
+def time_loads(app, profile, url, runs):
+    page = QWebEnginePage(profile)
+    samples = []
+    for _ in range(runs):
+        profile.clearHttpCache()
+        done = []
+        page.loadFinished.connect(done.append)
+        start = time.perf_counter()
+        # Query string khác nhau để không dùng lại document cũ
+        page.setUrl(QUrl(f"{url}?run={len(samples)}"))
+        common.wait_until(app, lambda: done)
+        samples.append(time.perf_counter() - start)
+        page.loadFinished.disconnect(done.append)
+    page.deleteLater()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resources", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    policy = HeaderPolicy()
+
+    with tempfile.TemporaryDirectory() as directory:
+        build_site(directory, args.resources)
+        server, base_url = common.serve_directory(directory)
+        url = base_url + "index.html"
+
+        rows = []
+        for mode in ("none", "legacy", "policy"):
+            profile = QWebEngineProfile()  # off-the-record, không đụng cache thật
+            profile.setHttpUserAgent(policy.user_agent)
+            profile.setHttpAcceptLanguage(policy.accept_language)
+            interceptor = None
+            if mode == "legacy":
+                interceptor = LegacyInterceptor()
+            elif mode == "policy":
+                interceptor = EnhancedBrowserInterceptor(policy)
+            if interceptor:
+                profile.setUrlRequestInterceptor(interceptor)
+            samples = time_loads(app, profile, url, args.runs)
+            rows.append((mode, common.summarize(samples)))
+
+        server.shutdown()
+
+    common.print_table(f"Page load, {args.resources} subresources", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# File: benchmarks/bench_messaging.py
+"""Throughput và độ trễ postMessage trên một trang cục bộ với ba chế độ:
+không có shim, shim UniversalMessenger cũ, và shim structured-clone mới.
+
+    python benchmarks/bench_messaging.py [--messages 20000]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+import common
+
+from PyQt6.QtCore import QUrl
+from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile, QWebEngineScript
+from PyQt6.QtWidgets import QApplication
+
+from components.page_scripts import UNIVERSAL_MESSAGING_JS
+
+with open(os.path.join(os.path.dirname(__file__), "legacy_universal_messaging.js")) as file:
+    LEGACY_UNIVERSAL_MESSAGING_JS = file.read()
+
+BENCH_PAGE = """<!doctype html>
+<html><body><script>
+const payload = { text: 'x'.repeat(512), list: Array.from({length: 32}, (_, i) => i), nested: { a: 1, b: [1, 2] } };
+
+function measure(name, count, send, subscribe) {
+    return new Promise(resolve => {
+        let received = 0, latency = 0;
+        const start = performance.now();
+        subscribe(data => {
+            latency += performance.now() - data.sentAt;
+            if (++received === count) {
+                const elapsed = performance.now() - start;
+                resolve({ name, per_sec: Math.round(count / elapsed * 1000),
+                          mean_latency_ms: +(latency / count).toFixed(3) });
+            }
+        });
+        for (let i = 0; i < count; i++) {
+            send({ sentAt: performance.now(), seq: i, payload });
+        }
+    });
+}
+
+async function run(count) {
+    const results = [];
+    const tests = {
+        window: () => measure('window.postMessage', count,
+            m => window.postMessage(m, '*'),
+            cb => window.addEventListener('message', e => cb(e.data))),
+        channel: () => {
+            const channel = new MessageChannel();
+            return measure('MessageChannel', count,
+                m => channel.port1.postMessage(m),
+                cb => { channel.port2.addEventListener('message', e => cb(e.data)); channel.port2.start(); });
+        },
+        broadcast: () => {
+            const sender = new BroadcastChannel('bench'), receiver = new BroadcastChannel('bench');
+            return measure('BroadcastChannel', count,
+                m => sender.postMessage(m),
+                cb => receiver.addEventListener('message', e => cb(e.data)));
+        },
+    };
+    for (const [key, test] of Object.entries(tests)) {
+        try {
+            results.push(await Promise.race([
+                test(),
+                new Promise((_, reject) => setTimeout(() => reject(new Error('timeout')), 20000)),
+            ]));
+        } catch (error) {
+            results.push({ name: key, error: String(error) });
+        }
+    }
+    window.__benchResult = JSON.stringify(results);
+}
+</script></body></html>
+"""
+
+
+def make_script(source):
+    script = QWebEngineScript()
+    script.setName("bench_shim")
+    script.setSourceCode(source)
+    script.setInjectionPoint(QWebEngineScript.InjectionPoint.DocumentCreation)
+    script.setWorldId(QWebEngineScript.ScriptWorldId.MainWorld.value)
+    script.setRunsOnSubFrames(True)
+    return script
+
+
+def run_mode(app, url, source, count):
+    profile = QWebEngineProfile()
+    if source:
+        profile.scripts().insert(make_script(source))
+    page = QWebEnginePage(profile)
+    loaded = []
+    page.loadFinished.connect(loaded.append)
+    page.setUrl(QUrl(url))
+    common.wait_until(app, lambda: loaded)
+
+    page.runJavaScript(f"run({count})")
+    result = []
+    pending = []
+
+    def on_value(value):
+        pending.clear()
+        if value:
+            result.append(value)
+
+    def poll():
+        # Hỏi lại trang mỗi khi lần hỏi trước đã trả lời
+        if not pending:
+            pending.append(True)
+            page.runJavaScript("window.__benchResult || null", 0, on_value)
+        return bool(result)
+
+    common.wait_until(app, poll, timeout_s=120)
+    page.deleteLater()
+    return json.loads(result[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "index.html"), "w") as file:
+            file.write(BENCH_PAGE)
+        server, base_url = common.serve_directory(directory)
+
+        for mode, source in (("shim off", None),
+                             ("legacy shim", LEGACY_UNIVERSAL_MESSAGING_JS),
+                             ("structured-clone shim", UNIVERSAL_MESSAGING_JS)):
+            results = run_mode(app, base_url + "index.html", source, args.messages)
+            rows = []
+            for result in results:
+                stats = {key: value for key, value in result.items() if key != "name"}
+                rows.append((result["name"], stats))
+            common.print_table(f"{mode} ({args.messages} messages)", rows)
+
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# File: benchmarks/bench_paste.py
+"""Độ trễ và bộ nhớ đỉnh khi dán 1 KB / 1 MB / 20 MB vào một textarea cục bộ:
+sinh mã runJavaScript chứa nội dung (cách cũ) so với text bridge qua QWebChannel.
+
+    python benchmarks/bench_paste.py [--sizes 1024,1048576,20971520] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import common
+
+from PyQt6.QtCore import QUrl
+from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile
+from PyQt6.QtWidgets import QApplication
+
+from components.page_scripts import InjectionPoint, PageScript
+from components.text_bridge import TEXT_BRIDGE_JS, TextTransferBridge
+from components.web_channel import CHANNEL_BOOTSTRAP_JS, CHANNEL_WORLD, attach_channel, qwebchannel_source
+from instrumentation import process_rss_bytes
+
+BENCH_PAGE = """<!doctype html>
+<html><body><textarea id="input" autofocus></textarea></body></html>
+"""
+
+FOCUS_JS = "document.getElementById('input').value = ''; document.getElementById('input').focus();"
+LENGTH_JS = "document.getElementById('input').value.length"
+
+
+def make_payload(size):
+    # Có xuống dòng, dấu nháy và backslash: những ký tự làm hỏng cách dán cũ
+    line = 'log line "quoted" C:\\path\\to\\file \u00e9\u00e8 \\n literal\n'
+    return (line * (size // len(line) + 1))[:size]
+
+
+class MemorySampler:
+    def __init__(self, pid):
+        self.pids = [os.getpid(), pid]
+        self.peak = {pid: 0 for pid in self.pids}
+
+    def sample(self):
+        for pid in self.pids:
+            rss = process_rss_bytes(pid) or 0
+            self.peak[pid] = max(self.peak[pid], rss)
+
+    def result(self):
+        browser, renderer = (self.peak[pid] / (1024 * 1024) for pid in self.pids)
+        return round(browser, 1), round(renderer, 1)
+
+
+def run_js(app, page, source, timeout_s=120):
+    result = []
+    page.runJavaScript(source, CHANNEL_WORLD.value, lambda value: result.append(value))
+    common.wait_until(app, lambda: result, timeout_s)
+    return result[0]
+
+
+def paste_codegen(app, page, text, sampler):
+    # Cách cũ (đã sửa escape bằng json.dumps): cả nội dung nằm trong mã nguồn JS
+    source = ("(function() { const el = document.getElementById('input');"
+              f" el.setRangeText({json.dumps(text)}, el.selectionStart, el.selectionEnd, 'end');"
+              " return el.value.length; })()")
+    result = []
+    page.runJavaScript(source, CHANNEL_WORLD.value, lambda value: result.append(value))
+    common.wait_until(app, lambda: sampler.sample() or result, timeout_s=300)
+    return result[0]
+
+
+def paste_bridge(app, page, bridge, text, sampler):
+    done = []
+    bridge.finished.connect(lambda transfer_id, ok, ms: done.append(ok))
+    bridge.send_text(text, source="benchmark")
+    common.wait_until(app, lambda: sampler.sample() or done, timeout_s=300)
+    bridge.finished.disconnect()
+    if not done[0]:
+        raise RuntimeError("bridge transfer failed")
+    return run_js(app, page, LENGTH_JS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1024,1048576,20971520")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    app = QApplication(sys.argv)
+    profile = QWebEngineProfile()
+    # Trang benchmark chạy trên http://127.0.0.1 nên không giới hạn @match
+    for name, source, point in (("web_channel", qwebchannel_source() + CHANNEL_BOOTSTRAP_JS,
+                                 InjectionPoint.DocumentCreation),
+                                ("text_bridge", TEXT_BRIDGE_JS, InjectionPoint.DocumentReady)):
+        profile.scripts().insert(PageScript(name, source, injection_point=point, world=CHANNEL_WORLD).build())
+
+    page = QWebEnginePage(profile)
+    channel = attach_channel(page)
+    bridge = TextTransferBridge(page)
+    channel.registerObject("textBridge", bridge)
+
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "index.html"), "w") as file:
+            file.write(BENCH_PAGE)
+        server, base_url = common.serve_directory(directory)
+
+        loaded = []
+        page.loadFinished.connect(loaded.append)
+        page.setUrl(QUrl(base_url + "index.html"))
+        common.wait_until(app, lambda: loaded)
+        # Chờ bootstrap của QWebChannel kết nối xong
+        common.wait_until(app, lambda: run_js(app, page, "!!window.__smartaiText"))
+
+        for size in sizes:
+            text = make_payload(size)
+            rows = []
+            for mode in ("codegen", "bridge"):
+                samples = []
+                peaks = []
+                for _ in range(args.repeat):
+                    run_js(app, page, FOCUS_JS + "true")
+                    sampler = MemorySampler(page.renderProcessPid())
+                    start = time.perf_counter()
+                    if mode == "codegen":
+                        length = paste_codegen(app, page, text, sampler)
+                    else:
+                        length = paste_bridge(app, page, bridge, text, sampler)
+                    samples.append(time.perf_counter() - start)
+                    peaks.append(sampler.result())
+                    if length != len(text):
+                        print(f"  {mode}: inserted {length} of {len(text)} chars")
+                stats = common.summarize(samples)
+                stats["peak_browser_mb"] = max(peak[0] for peak in peaks)
+                stats["peak_renderer_mb"] = max(peak[1] for peak in peaks)
+                rows.append((mode, stats))
+            common.print_table(f"paste {size} chars", rows)
+
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# File: benchmarks/bench_popup.py
+"""Độ trễ mở PopupWindow: trước (script chạy lại bằng runJavaScript cho từng page)
+và sau (script cài một lần trên profile qua ScriptRegistry).
+
+    python benchmarks/bench_popup.py [--runs 30]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import common
+
+from PyQt6.QtCore import QUrl
+from PyQt6.QtWebEngineCore import QWebEngineProfile
+from PyQt6.QtWidgets import QApplication
+
+from components.page_scripts import registry as scripts
+from components.web_view import PopupWindow
+
+with open(os.path.join(os.path.dirname(__file__), "legacy_universal_messaging.js")) as file:
+    LEGACY_UNIVERSAL_MESSAGING_JS = file.read()
+
+
+def open_popups(app, profile, url, runs, legacy):
+    open_samples, load_samples = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        popup = PopupWindow(profile)
+        if legacy:
+            # Hành vi cũ của CustomWebEnginePage.setup_scripts()
+            popup.page.runJavaScript(LEGACY_UNIVERSAL_MESSAGING_JS)
+        popup.show()
+        open_samples.append(time.perf_counter() - start)
+
+        done = []
+        popup.page.loadFinished.connect(done.append)
+        popup.page.setUrl(QUrl(url))
+        common.wait_until(app, lambda: done)
+        load_samples.append(time.perf_counter() - start)
+        popup.close()
+        app.processEvents()
+    return open_samples, load_samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        with open(f"{directory}/index.html", "w") as file:
+            file.write("<!doctype html><title>popup</title><p>OAuth stand-in</p>")
+        server, base_url = common.serve_directory(directory)
+
+        for mode in ("before", "after"):
+            profile = QWebEngineProfile()
+            if mode == "after":
+                # Áp script cho mọi trang, kể cả trang cục bộ của benchmark
+                for script in scripts.scripts.values():
+                    script.matches = []
+                    script.enabled = True
+                scripts.install(profile)
+            open_samples, load_samples = open_popups(
+                app, profile, base_url + "index.html", args.runs, legacy=(mode == "before"))
+            rows.append((f"{mode}: open", common.summarize(open_samples)))
+            rows.append((f"{mode}: open -> loaded", common.summarize(load_samples)))
+
+        server.shutdown()
+
+    common.print_table("PopupWindow latency", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# File: benchmarks/bench_profile_cache.py
+"""Thời gian load trang (cache nóng) với từng chế độ cache của profile: disk, tmpfs, memory.
+
+Mỗi chế độ chạy hai tiến trình liên tiếp trên cùng thư mục cache để đo cả lần load
+đầu tiên sau khi "khởi động lại" ứng dụng. Server cục bộ thêm độ trễ cho mỗi request
+để phần được phục vụ từ cache thấy rõ.
+
+    python benchmarks/bench_profile_cache.py [--assets 150] [--asset-kb 40] [--latency-ms 20] [--loads 10]
+"""
+import argparse
+import functools
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+import common
+
+from components.profile_layout import CACHE_MODES, ProfileLayout, ram_dir
+
+
+class CachingHandler(common.QuietHandler):
+    latency_s = 0.0
+
+    def end_headers(self):
+        self.send_header("Cache-Control", "public, max-age=3600")
+        super().end_headers()
+
+    def do_GET(self):
+        time.sleep(self.latency_s)
+        super().do_GET()
+
+
+def build_site(directory, assets, asset_kb):
+    payload = os.urandom(asset_kb * 1024)
+    tags = []
+    for index in range(assets):
+        if index % 3 == 0:
+            name = f"script{index}.js"
+            with open(os.path.join(directory, name), "w") as file:
+                file.write(f"window.asset{index} = {json.dumps(payload[:asset_kb * 512].hex())};")
+            tags.append(f'<script src="{name}"></script>')
+        else:
+            name = f"image{index}.bin"
+            with open(os.path.join(directory, name), "wb") as file:
+                file.write(payload)
+            tags.append(f'<link rel="preload" as="fetch" crossorigin href="{name}">')
+    with open(os.path.join(directory, "index.html"), "w") as file:
+        file.write("<!doctype html><title>cache</title>\n" + "\n".join(tags))
+
+
+def run_child(args):
+    """Một tiến trình: load trang args.loads lần, mỗi lần một page mới"""
+    from PyQt6.QtCore import QUrl
+    from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication(sys.argv)
+    profile = QWebEngineProfile("bench-profile-cache")
+    ProfileLayout(args.mode, args.cache_path, args.storage_path, args.max_size_mb * 2**20).apply(profile)
+
+    samples = []
+    for _ in range(args.loads):
+        page = QWebEnginePage(profile)
+        done = []
+        page.loadFinished.connect(done.append)
+        start = time.perf_counter()
+        page.setUrl(QUrl(args.url))
+        common.wait_until(app, lambda: done, timeout_s=120)
+        samples.append(time.perf_counter() - start)
+        page.deleteLater()
+        app.processEvents()
+    print(json.dumps(samples))
+
+
+def run_mode(mode, url, root, args):
+    cache_path = os.path.join(root, mode, "cache")
+    if mode == "tmpfs":
+        ram = ram_dir("SmartAI-bench")
+        if ram is None:
+            return None
+        cache_path = os.path.join(ram, "cache")
+    storage_path = os.path.join(root, mode, "storage")
+    command = [sys.executable, __file__, "--child", "--mode", mode, "--url", url,
+               "--cache-path", cache_path, "--storage-path", storage_path,
+               "--loads", str(args.loads), "--max-size-mb", str(args.max_size_mb)]
+    runs = []
+    for _ in range(2):
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    if mode == "tmpfs":
+        shutil.rmtree(cache_path, ignore_errors=True)
+    return runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", type=int, default=150)
+    parser.add_argument("--asset-kb", type=int, default=40)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--loads", type=int, default=10)
+    parser.add_argument("--max-size-mb", type=int, default=256)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--mode", help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    parser.add_argument("--cache-path", help=argparse.SUPPRESS)
+    parser.add_argument("--storage-path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        run_child(args)
+        return
+
+    with tempfile.TemporaryDirectory() as site, tempfile.TemporaryDirectory() as root:
+        build_site(site, args.assets, args.asset_kb)
+        CachingHandler.latency_s = args.latency_ms / 1000
+        handler = functools.partial(CachingHandler, directory=site)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/index.html"
+
+        cold, warm, restart = [], [], []
+        for mode in CACHE_MODES:
+            runs = run_mode(mode, url, root, args)
+            if runs is None:
+                print(f"  {mode}: no RAM-backed directory on this system, skipped")
+                continue
+            first_run, second_run = runs
+            cold.append((mode, common.summarize(first_run[:1])))
+            warm.append((mode, common.summarize(first_run[1:] + second_run[1:])))
+            restart.append((mode, common.summarize(second_run[:1])))
+        server.shutdown()
+
+    common.print_table("first load, empty cache", cold)
+    common.print_table("warm loads, same process", warm)
+    common.print_table("first load after restart", restart)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# File: benchmarks/bench_show_latency.py
+"""Độ trễ hiện sidebar (hover -> show_sidebar -> exposed -> first frame) qua nhiều lần ẩn/hiện.
+
+Chạy Sidebar thật ở chế độ offscreen với một trang cục bộ; session/profile nằm trong
+HOME tạm nên không đụng tới dữ liệu của người dùng.
+
+    python benchmarks/bench_show_latency.py [--toggles 300] [--warmup 10] [--max-p95-ms 0]
+
+--max-p95-ms > 0: thoát với mã 1 nếu p95 tổng vượt ngưỡng (dùng để bắt regression).
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+import common
+
+# Phải đặt trước khi import các module của app (session, settings, profile đọc HOME)
+HOME = tempfile.mkdtemp(prefix="smartai-bench-home-")
+os.environ["HOME"] = HOME
+os.environ["XDG_CACHE_HOME"] = os.path.join(HOME, ".cache")
+os.environ["LOCALAPPDATA"] = os.path.join(HOME, "AppData", "Local")
+
+from PyQt6.QtCore import QCoreApplication, QPointF, Qt
+from PyQt6.QtGui import QEnterEvent
+from PyQt6.QtWidgets import QApplication
+
+from instrumentation import ShowLatencyProbe, show_probe
+from session_store import get_session
+
+PAGE = """<!doctype html>
+<title>show latency</title>
+<style>body { font: 15px sans-serif; background: #fafafa; } p { margin: 8px 16px; }</style>
+<h1>Stand-in chat</h1>
+""" + "\n".join(f"<p>Message {index}: lorem ipsum dolor sit amet.</p>" for index in range(200))
+
+
+def trigger_show(sidebar):
+    # Như khi chuột dừng ở giữa mép màn hình (ở góc thì EdgeTrigger bỏ qua); Windows không có EdgeTrigger.
+    # show_probe chỉ bắt đầu đo sau dwell_ms, nên dwell không nằm trong số liệu
+    if sidebar.edge_trigger is not None:
+        point = QPointF(1, sidebar.edge_trigger.height() / 2)
+        QApplication.sendEvent(sidebar.edge_trigger, QEnterEvent(point, point, point))
+    else:
+        show_probe.begin("hover")
+        sidebar.show_sidebar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--toggles", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--max-p95-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    QCoreApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+    app = QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "index.html"), "w") as file:
+            file.write(PAGE)
+        server, base_url = common.serve_directory(directory)
+
+        # View của provider đang mở load trang cục bộ thay vì site thật
+        session = get_session()
+        session.set("active_provider", "claude")
+        session.update_provider("claude", url=f"{base_url}index.html")
+
+        from sidebar import Sidebar
+        sidebar = Sidebar()
+        trigger_show(sidebar)
+        view = sidebar.content_widget.web_view
+        loaded = []
+        view.loadFinished.connect(loaded.append)
+        common.wait_until(app, lambda: loaded, timeout_s=60)
+
+        show_probe.samples.clear()
+        incomplete = 0
+        for index in range(args.warmup + args.toggles):
+            if index == args.warmup:
+                show_probe.samples.clear()
+            sidebar.hide_sidebar()
+            common.wait_until(app, lambda: not sidebar.isVisible())
+            app.processEvents()
+
+            completed = show_probe.completed
+            trigger_show(sidebar)
+            try:
+                common.wait_until(app, lambda: show_probe.completed > completed, timeout_s=5)
+            except TimeoutError:
+                incomplete += 1
+                show_probe.cancel()
+        server.shutdown()
+
+    samples = list(show_probe.samples)
+    rows = []
+    for phase in ShowLatencyProbe.PHASES + ("total",):
+        rows.append((phase, common.summarize([sample[phase] / 1000 for sample in samples if phase in sample])))
+    common.print_table(f"show latency over {len(samples)} toggles ({incomplete} without a first frame)", rows)
+
+    p95 = show_probe.summary().get("total", {}).get("p95_ms", 0)
+    if args.max_p95_ms and p95 > args.max_p95_ms:
+        print(f"\nFAIL: total p95 {p95} ms > {args.max_p95_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
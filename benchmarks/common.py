@@ -0,0 +1,61 @@
+# File: benchmarks/common.py
+"""Tiện ích chung cho các script benchmark (chạy offscreen, không cần mạng)."""
+import functools
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+# Chạy được từ bất kỳ thư mục nào: thêm thư mục gốc của repo vào sys.path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_directory(directory):
+    """Chạy HTTP server cục bộ trong thread nền, trả về (server, base_url)."""
+    handler = functools.partial(QuietHandler, directory=directory)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def wait_until(app, predicate, timeout_s=30.0):
+    """Chạy event loop cho tới khi predicate() đúng hoặc hết thời gian."""
+    deadline = time.perf_counter() + timeout_s
+    while not predicate():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("Timed out waiting for condition")
+        app.processEvents()
+        time.sleep(0.001)
+
+
+def summarize(samples):
+    """p50/p95/mean (ms) của danh sách thời gian tính bằng giây."""
+    ms = sorted(sample * 1000 for sample in samples)
+    if not ms:
+        return {"n": 0}
+    p95_index = min(len(ms) - 1, int(round(0.95 * (len(ms) - 1))))
+    return {
+        "n": len(ms),
+        "p50_ms": round(statistics.median(ms), 2),
+        "p95_ms": round(ms[p95_index], 2),
+        "mean_ms": round(statistics.fmean(ms), 2),
+    }
+
+
+def print_table(title, rows):
+    print(f"\n{title}")
+    for name, stats in rows:
+        details = "  ".join(f"{key}={value}" for key, value in stats.items())
+        print(f"  {name:<28} {details}")
@@ -0,0 +1,228 @@
+// Bản sao shim UniversalMessenger cũ (trước khi có structured clone path), chỉ dùng cho benchmark
+(function() {
+    // Universal Message Handler
+    const UniversalMessenger = {
+        originalPostMessage: window.postMessage,
+        originalAddEventListener: window.addEventListener,
+        messageCounter: 0,
+        portCounter: 0,
+
+        init() {
+            // Override postMessage globally
+            window.postMessage = (...args) => this.safePostMessage(...args);
+
+            // Override addEventListener for message events
+            window.addEventListener = (...args) => this.safeAddEventListener(...args);
+
+            // Override MessagePort
+            if (window.MessagePort) {
+                this.wrapMessagePort();
+            }
+
+            // Override MessageChannel
+            if (window.MessageChannel) {
+                this.wrapMessageChannel();
+            }
+
+            // Override BroadcastChannel
+            if (window.BroadcastChannel) {
+                this.wrapBroadcastChannel();
+            }
+
+            // Add global error handlers
+            this.setupErrorHandling();
+        },
+
+        safePostMessage(message, targetOrigin, transfer) {
+            try {
+                // Always use * for targetOrigin to allow cross-origin
+                return this.originalPostMessage.call(
+                    window,
+                    this.sanitizeMessage(message),
+                    '*',
+                    transfer
+                );
+            } catch (error) {
+                console.log('PostMessage handled:', error);
+                return this.originalPostMessage.call(
+                    window,
+                    this.createFallbackMessage(message),
+                    '*',
+                    transfer
+                );
+            }
+        },
+
+        sanitizeMessage(message) {
+            try {
+                // Try to create a clean copy of the message
+                return JSON.parse(JSON.stringify({
+                    id: `msg_${Date.now()}_${this.messageCounter++}`,
+                    data: message,
+                    timestamp: Date.now()
+                }));
+            } catch (error) {
+                return this.createFallbackMessage(message);
+            }
+        },
+
+        createFallbackMessage(message) {
+            return {
+                id: `msg_${Date.now()}_${this.messageCounter++}`,
+                data: String(message),
+                timestamp: Date.now(),
+                isStringified: true
+            };
+        },
+
+        safeAddEventListener(type, listener, options) {
+            if (type === 'message') {
+                const safeListener = (event) => {
+                    try {
+                        // Create a safe event object
+                        const safeEvent = new MessageEvent('message', {
+                            data: event.data?.data || event.data,
+                            origin: '*',
+                            source: event.source || window,
+                            ports: Array.isArray(event.ports) ? event.ports : []
+                        });
+                        return listener(safeEvent);
+                    } catch (error) {
+                        console.log('Message listener handled:', error);
+                    }
+                };
+                return this.originalAddEventListener.call(window, type, safeListener, options);
+            }
+            return this.originalAddEventListener.call(window, type, listener, options);
+        },
+
+        wrapMessagePort() {
+            const OriginalMessagePort = window.MessagePort;
+            const self = this;
+
+            class SafeMessagePort extends OriginalMessagePort {
+                constructor() {
+                    super();
+                    this.id = `port_${Date.now()}_${self.portCounter++}`;
+                }
+
+                postMessage(message, transfer) {
+                    try {
+                        super.postMessage(self.sanitizeMessage(message), transfer);
+                    } catch (error) {
+                        console.log('Port message handled:', error);
+                        super.postMessage(self.createFallbackMessage(message), transfer);
+                    }
+                }
+
+                addEventListener(type, listener, options) {
+                    if (type === 'message') {
+                        const safeListener = (event) => {
+                            try {
+                                const safeEvent = new MessageEvent('message', {
+                                    data: event.data?.data || event.data,
+                                    origin: '*',
+                                    source: null,
+                                    ports: []
+                                });
+                                listener(safeEvent);
+                            } catch (error) {
+                                console.log('Port listener handled:', error);
+                            }
+                        };
+                        super.addEventListener(type, safeListener, options);
+                    } else {
+                        super.addEventListener(type, listener, options);
+                    }
+                }
+            }
+
+            window.MessagePort = SafeMessagePort;
+        },
+
+        wrapMessageChannel() {
+            const OriginalMessageChannel = window.MessageChannel;
+            const self = this;
+
+            class SafeMessageChannel extends OriginalMessageChannel {
+                constructor() {
+                    super();
+                    this.id = `channel_${Date.now()}_${self.portCounter++}`;
+                    // Wrap both ports
+                    this.port1 = new window.MessagePort();
+                    this.port2 = new window.MessagePort();
+                }
+            }
+
+            window.MessageChannel = SafeMessageChannel;
+        },
+
+        wrapBroadcastChannel() {
+            const OriginalBroadcastChannel = window.BroadcastChannel;
+            const self = this;
+
+            class SafeBroadcastChannel extends OriginalBroadcastChannel {
+                constructor(channel) {
+                    super(channel);
+                    this.id = `broadcast_${Date.now()}_${self.portCounter++}`;
+                }
+
+                postMessage(message) {
+                    try {
+                        super.postMessage(self.sanitizeMessage(message));
+                    } catch (error) {
+                        console.log('Broadcast message handled:', error);
+                        super.postMessage(self.createFallbackMessage(message));
+                    }
+                }
+
+                addEventListener(type, listener, options) {
+                    if (type === 'message') {
+                        const safeListener = (event) => {
+                            try {
+                                const safeEvent = new MessageEvent('message', {
+                                    data: event.data?.data || event.data,
+                                    origin: '*',
+                                    source: null,
+                                    ports: []
+                                });
+                                listener(safeEvent);
+                            } catch (error) {
+                                console.log('Broadcast listener handled:', error);
+                            }
+                        };
+                        super.addEventListener(type, safeListener, options);
+                    } else {
+                        super.addEventListener(type, listener, options);
+                    }
+                }
+            }
+
+            window.BroadcastChannel = SafeBroadcastChannel;
+        },
+
+        setupErrorHandling() {
+            window.addEventListener('error', (event) => {
+                if (event.message?.includes('postMessage')) {
+                    event.preventDefault();
+                    console.log('Prevented postMessage error:', event.message);
+                }
+            });
+
+            window.addEventListener('unhandledrejection', (event) => {
+                if (event.reason?.message?.includes('postMessage')) {
+                    event.preventDefault();
+                    console.log('Prevented unhandled postMessage rejection:', event.reason);
+                }
+            });
+        }
+    };
+
+    // Initialize the universal messenger
+    UniversalMessenger.init();
+
+    // Export for debugging
+    window.__UniversalMessenger = UniversalMessenger;
+
+    console.log('Universal messaging system initialized');
+})();
@@ -0,0 +1,191 @@
+# File: blocklist.py
+import hashlib
+import logging
+import os
+import pickle
+import re
+import time
+
+# Chỉ nhận rule theo domain/host; rule có path, wildcard hay cosmetic (##) bị bỏ qua
+_DOMAIN_RE = re.compile(r"^[a-z0-9_-]+(\.[a-z0-9_-]+)+$")
+_HOSTS_PREFIXES = {"0.0.0.0", "127.0.0.1", "::", "::1"}
+_SUPPORTED_OPTIONS = {"third-party", "3p"}
+_HOST_CACHE_SIZE = 4096
+
+
+def parse_rule(line):
+    """Trả về (domain, third_party_only, is_exception) hoặc None.
+
+    Hỗ trợ:  ||example.com^   ||example.com^$third-party   @@||example.com^
+             0.0.0.0 example.com   (hosts file)   example.com   (danh sách domain)
+    """
+    line = line.strip()
+    if not line or line[0] in "![#" or "##" in line or "#@#" in line or "#?#" in line:
+        return None
+
+    is_exception = line.startswith("@@")
+    if is_exception:
+        line = line[2:]
+
+    options = set()
+    if "$" in line:
+        line, option_text = line.split("$", 1)
+        options = {option.strip().lower() for option in option_text.split(",") if option.strip()}
+        if not options <= _SUPPORTED_OPTIONS:
+            return None
+
+    if line.startswith("||"):
+        domain = line[2:]
+        if domain.endswith("^|"):
+            domain = domain[:-2]
+        elif domain.endswith("^"):
+            domain = domain[:-1]
+    else:
+        parts = line.split()
+        if len(parts) >= 2 and parts[0] in _HOSTS_PREFIXES:
+            domain = parts[1]
+        elif len(parts) == 1 and not line.startswith("|"):
+            domain = parts[0]
+        else:
+            return None
+
+    domain = domain.lower().rstrip(".")
+    if not _DOMAIN_RE.match(domain) or domain.startswith("localhost"):
+        return None
+    return domain, bool(options), is_exception
+
+
+def base_domain(host):
+    """example.com cho a.b.example.com (gần đúng eTLD+1, đủ cho kiểm tra third-party)"""
+    dot = host.rfind(".")
+    if dot <= 0:
+        return host
+    dot = host.rfind(".", 0, dot)
+    return host[dot + 1:] if dot >= 0 else host
+
+
+class DomainBlocklist:
+    """Index hậu tố domain: mỗi tra cứu là vài phép tra set theo từng hậu tố của host,
+    kèm cache kết quả theo host vì cùng một host lặp lại rất nhiều lần."""
+    FORMAT_VERSION = 1
+
+    def __init__(self, domains=(), third_party_domains=(), exceptions=()):
+        self.domains = frozenset(domains)
+        self.third_party_domains = frozenset(third_party_domains)
+        self.exceptions = frozenset(exceptions)
+        self.host_cache = {}
+
+    def __len__(self):
+        return len(self.domains) + len(self.third_party_domains)
+
+    @classmethod
+    def from_lines(cls, lines):
+        domains, third_party, exceptions = set(), set(), set()
+        for line in lines:
+            rule = parse_rule(line)
+            if rule is None:
+                continue
+            domain, third_party_only, is_exception = rule
+            if is_exception:
+                exceptions.add(domain)
+            elif third_party_only:
+                third_party.add(domain)
+            else:
+                domains.add(domain)
+        return cls(domains, third_party, exceptions)
+
+    @classmethod
+    def from_files(cls, paths):
+        def lines():
+            for path in paths:
+                try:
+                    with open(path, "r", encoding="utf-8", errors="replace") as file:
+                        yield from file
+                except OSError as e:
+                    logging.warning(f"Blocklist: cannot read {path}: {e}")
+        return cls.from_lines(lines())
+
+    @classmethod
+    def cache_key(cls, paths):
+        digest = hashlib.sha1(str(cls.FORMAT_VERSION).encode())
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                digest.update(f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+            except OSError:
+                digest.update(f"{path}|missing".encode())
+        return digest.hexdigest()[:16]
+
+    @classmethod
+    def load(cls, paths, cache_dir=None):
+        """Đọc index đã biên dịch từ cache; chỉ parse lại danh sách khi file nguồn thay đổi."""
+        start = time.perf_counter()
+        cache_path = None
+        if cache_dir:
+            cache_path = os.path.join(cache_dir, f"blocklist-{cls.cache_key(paths)}.pickle")
+            try:
+                with open(cache_path, "rb") as file:
+                    domains, third_party, exceptions = pickle.load(file)
+                blocklist = cls(domains, third_party, exceptions)
+                logging.info(f"Blocklist: {len(blocklist)} rules from cache "
+                             f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+                return blocklist
+            except FileNotFoundError:
+                pass
+            except (OSError, pickle.UnpicklingError, ValueError, EOFError) as e:
+                logging.warning(f"Blocklist: ignoring broken cache {cache_path}: {e}")
+
+        blocklist = cls.from_files(paths)
+        logging.info(f"Blocklist: compiled {len(blocklist)} rules "
+                     f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+        if cache_path:
+            blocklist.save(cache_path)
+        return blocklist
+
+    def save(self, cache_path):
+        directory = os.path.dirname(cache_path)
+        # Xóa cache cũ của các phiên bản danh sách trước
+        for name in os.listdir(directory):
+            if name.startswith("blocklist-") and name.endswith(".pickle"):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+        temp_path = cache_path + ".tmp"
+        try:
+            with open(temp_path, "wb") as file:
+                pickle.dump((self.domains, self.third_party_domains, self.exceptions), file,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            logging.warning(f"Blocklist: cannot write cache {cache_path}: {e}")
+
+    @staticmethod
+    def _matches(host, domains):
+        if not domains:
+            return False
+        while True:
+            if host in domains:
+                return True
+            dot = host.find(".")
+            if dot < 0:
+                return False
+            host = host[dot + 1:]
+
+    def should_block(self, host, first_party_host=""):
+        key = (host, first_party_host) if self.third_party_domains else host
+        cached = self.host_cache.get(key)
+        if cached is not None:
+            return cached
+
+        blocked = False
+        if not self._matches(host, self.exceptions):
+            if self._matches(host, self.domains):
+                blocked = True
+            elif self._matches(host, self.third_party_domains):
+                blocked = base_domain(host) != base_domain(first_party_host)
+
+        if len(self.host_cache) >= _HOST_CACHE_SIZE:
+            self.host_cache.clear()
+        self.host_cache[key] = blocked
+        return blocked
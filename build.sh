@@ -16,6 +16,7 @@ mkdir -p dist/SmartAI
 cp *.py dist/SmartAI/
 cp -r components dist/SmartAI/
 cp -r images dist/SmartAI/
+cp -r blocklists dist/SmartAI/
 cp icon.svg dist/SmartAI/
 cp requirements.txt dist/SmartAI/
 
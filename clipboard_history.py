@@ -0,0 +1,226 @@
+# File: clipboard_history.py
+import glob
+import hashlib
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from config import get_settings
+from utils import AppPaths
+
+# Trình quản lý mật khẩu đánh dấu nội dung nhạy cảm bằng các format này; không lưu
+SECRET_FORMAT_MARKERS = (
+    "x-kde-passwordManagerHint",
+    "ExcludeClipboardContentFromMonitorProcessing",
+    "org.nspasteboard.ConcealedType",
+)
+
+PREVIEW_CHARS = 80
+
+
+def make_preview(text):
+    # Gom khoảng trắng để hiển thị một dòng trong picker
+    return " ".join(text[:PREVIEW_CHARS * 4].split())[:PREVIEW_CHARS]
+
+
+class ClipEntry:
+    def __init__(self, digest, size, preview, text):
+        self.digest = digest
+        self.size = size
+        self.preview = preview
+        self.text = text
+        # Đường dẫn file khi nội dung đã được đẩy ra đĩa (text = None)
+        self.path = None
+        self.copied_at = time.time()
+
+
+class ClipboardHistory(QObject):
+    """Lịch sử clipboard trong RAM, giới hạn theo số mục và số byte.
+
+    GUI thread chỉ debounce và đọc text từ clipboard; hash, khử trùng lặp và
+    ghi ra đĩa chạy trên một thread nền. Nội dung không bao giờ được ghi log.
+    """
+
+    changed = pyqtSignal()
+
+    def __init__(self, clipboard, spill_dir=None, parent=None):
+        super().__init__(parent)
+        options = get_settings().section("clipboard_history")
+        self.clipboard = clipboard
+        self.max_entries = options.get("max_entries", 50)
+        self.memory_budget = options.get("memory_budget_kb", 4096) * 1024
+        self.spill_threshold = options.get("spill_threshold_kb", 256) * 1024
+        self.max_clip_chars = options.get("max_clip_mb", 32) * 1024 * 1024
+        self.spill_dir = spill_dir or AppPaths().get_appdata_dir("clipboard")
+
+        # digest -> ClipEntry, mục mới nhất ở cuối. Chỉ thread nền thay đổi dict này
+        self.entries = OrderedDict()
+        self.memory_bytes = 0
+        self.lock = threading.Lock()
+        self.jobs = queue.Queue()
+        self.counters = {"changes": 0, "captured": 0, "duplicates": 0, "skipped": 0,
+                         "spilled": 0, "evicted": 0}
+
+        self.debounce = QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(options.get("debounce_ms", 250))
+        self.debounce.timeout.connect(self.capture)
+
+        self.worker = threading.Thread(target=self.run_worker, name="clipboard-history", daemon=True)
+        self.worker.start()
+        # Nội dung của phiên trước không được giữ lại trên đĩa
+        self.jobs.put(("purge", None))
+
+    # --- GUI thread ---
+
+    def on_clipboard_changed(self):
+        # Một lần copy có thể phát nhiều dataChanged liên tiếp; chỉ đọc sau khi yên
+        self.counters["changes"] += 1
+        self.debounce.start()
+
+    def capture(self):
+        mime = self.clipboard.mimeData()
+        if mime is None or not mime.hasText():
+            return
+        formats = mime.formats()
+        if any(marker in fmt for fmt in formats for marker in SECRET_FORMAT_MARKERS):
+            self.counters["skipped"] += 1
+            return
+        text = mime.text()
+        if not text.strip() or len(text) > self.max_clip_chars:
+            self.counters["skipped"] += 1
+            return
+        self.jobs.put(("add", text))
+
+    def recent(self, limit=None):
+        """Các mục mới nhất trước"""
+        with self.lock:
+            entries = list(reversed(self.entries.values()))
+        return entries[:limit] if limit else entries
+
+    def text(self, digest):
+        with self.lock:
+            entry = self.entries.get(digest)
+            if entry is None:
+                return None
+            text, path = entry.text, entry.path
+        if text is not None:
+            return text
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                return file.read()
+        except OSError as e:
+            logging.warning(f"ClipboardHistory: cannot read spilled entry: {e}")
+            return None
+
+    def clear(self):
+        self.jobs.put(("purge", None))
+
+    def stop(self):
+        self.jobs.put(("purge", None))
+        self.jobs.put(None)
+        self.worker.join(timeout=2)
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counters, entries=len(self.entries), memory_bytes=self.memory_bytes,
+                        spilled_entries=sum(1 for entry in self.entries.values() if entry.path))
+
+    # --- Thread nền ---
+
+    def run_worker(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            action, text = job
+            try:
+                if action == "add":
+                    self.add(text)
+                elif action == "purge":
+                    self.purge()
+            except Exception:
+                logging.exception(f"ClipboardHistory: {action} failed")
+
+    def add(self, text):
+        data = text.encode("utf-8")
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+
+        existing = self.entries.get(digest)
+        if existing is not None:
+            with self.lock:
+                self.entries.move_to_end(digest)
+                existing.copied_at = time.time()
+                self.counters["duplicates"] += 1
+            self.changed.emit()
+            return
+
+        entry = ClipEntry(digest, len(data), make_preview(text), text)
+        if entry.size > self.spill_threshold:
+            self.spill(entry, data)
+        with self.lock:
+            self.entries[digest] = entry
+            if entry.text is not None:
+                self.memory_bytes += entry.size
+            self.counters["captured"] += 1
+        logging.info(f"ClipboardHistory: captured {entry.size} bytes ({'disk' if entry.path else 'memory'})")
+
+        self.enforce_budget()
+        self.changed.emit()
+
+    def spill(self, entry, data=None):
+        if data is None:
+            data = entry.text.encode("utf-8")
+        path = os.path.join(self.spill_dir, f"{entry.digest}.clip")
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+        except OSError as e:
+            logging.warning(f"ClipboardHistory: cannot spill entry to disk: {e}")
+            return False
+        with self.lock:
+            if entry.text is not None and entry.digest in self.entries:
+                self.memory_bytes -= entry.size
+            entry.path = path
+            entry.text = None
+            self.counters["spilled"] += 1
+        return True
+
+    def enforce_budget(self):
+        while len(self.entries) > self.max_entries:
+            with self.lock:
+                _, entry = self.entries.popitem(last=False)
+                if entry.text is not None:
+                    self.memory_bytes -= entry.size
+                self.counters["evicted"] += 1
+            self.remove_file(entry.path)
+
+        # Vượt budget: đẩy các mục cũ nhất còn trong RAM ra đĩa
+        for entry in list(self.entries.values()):
+            if self.memory_bytes <= self.memory_budget:
+                break
+            if entry.text is not None:
+                self.spill(entry)
+
+    def purge(self):
+        with self.lock:
+            self.entries.clear()
+            self.memory_bytes = 0
+        for path in glob.glob(os.path.join(self.spill_dir, "*.clip")):
+            self.remove_file(path)
+        self.changed.emit()
+
+    @staticmethod
+    def remove_file(path):
+        if not path:
+            return
+        try:
+            os.remove(path)
+        except OSError:
+            pass
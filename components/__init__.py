@@ -1,5 +1,14 @@
 from .title_bar import TitleBar
 from .resize_handle import ResizeHandle
 from .navigation_bar import NavigationBar
-from .web_view import CustomWebView
-from .content_widget import ContentWidget
\ No newline at end of file
+
+
+# web_view/content_widget import QtWebEngine, chỉ load khi thật sự cần
+def __getattr__(name):
+    if name == "CustomWebView":
+        from .web_view import CustomWebView
+        return CustomWebView
+    if name == "ContentWidget":
+        from .content_widget import ContentWidget
+        return ContentWidget
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
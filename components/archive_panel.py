@@ -0,0 +1,130 @@
+# File: components/archive_panel.py
+import time
+
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QGuiApplication
+from PyQt6.QtWidgets import (QComboBox, QHBoxLayout, QLabel, QLineEdit, QListWidget, QListWidgetItem,
+                             QPlainTextEdit, QPushButton, QSplitter, QVBoxLayout, QWidget)
+
+from metrics import registry as metrics
+from providers import PROVIDERS
+
+
+class ArchivePanel(QWidget):
+    """Tìm kiếm toàn văn trong archive; kết quả cập nhật khi đang gõ"""
+
+    # (provider, url) của cuộc hội thoại chứa message được chọn
+    openRequested = pyqtSignal(str, str)
+
+    def __init__(self, archive, parent=None):
+        super().__init__(parent)
+        self.archive = archive
+        self.current_hit = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 8, 8, 8)
+        layout.setSpacing(6)
+
+        search_row = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Tìm trong các cuộc hội thoại...")
+        self.search_edit.textChanged.connect(lambda _: self.search_timer.start())
+        self.provider_combo = QComboBox()
+        self.provider_combo.addItem("All", "")
+        for provider in PROVIDERS:
+            self.provider_combo.addItem(provider, provider)
+        self.provider_combo.currentIndexChanged.connect(self.run_search)
+        search_row.addWidget(self.search_edit, 1)
+        search_row.addWidget(self.provider_combo)
+        layout.addLayout(search_row)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        self.results = QListWidget()
+        self.results.setWordWrap(True)
+        self.results.currentItemChanged.connect(self.on_current_changed)
+        self.preview = QPlainTextEdit()
+        self.preview.setReadOnly(True)
+        splitter.addWidget(self.results)
+        splitter.addWidget(self.preview)
+        layout.addWidget(splitter, 1)
+
+        actions = QHBoxLayout()
+        actions.addStretch()
+        self.copy_button = QPushButton("Copy")
+        self.copy_button.clicked.connect(self.copy_current)
+        self.open_button = QPushButton("Open Conversation")
+        self.open_button.clicked.connect(self.open_current)
+        actions.addWidget(self.copy_button)
+        actions.addWidget(self.open_button)
+        layout.addLayout(actions)
+
+        # Gõ liên tục chỉ tìm một lần sau khi dừng
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(120)
+        self.search_timer.timeout.connect(self.run_search)
+
+        self.setStyleSheet("""
+            ArchivePanel, QSplitter {
+                background-color: #33322F;
+            }
+            QLineEdit, QListWidget, QPlainTextEdit, QComboBox {
+                background-color: #2C2C29;
+                color: #e0e0e0;
+                border: 1px solid #4D4D4D;
+            }
+            QListWidget::item {
+                padding: 6px;
+                border-bottom: 1px solid #3a3a37;
+            }
+            QListWidget::item:selected {
+                background-color: #444440;
+            }
+            QLabel {
+                color: #9a9a9a;
+            }
+        """)
+        self.update_buttons()
+
+    def focus_search(self):
+        self.search_edit.setFocus()
+        self.search_edit.selectAll()
+
+    def run_search(self):
+        query = self.search_edit.text()
+        start = time.perf_counter()
+        hits = self.archive.search(query, provider=self.provider_combo.currentData() or None)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if query.strip():
+            metrics.observe("archive_search_ms", elapsed_ms)
+
+        self.results.clear()
+        for hit in hits:
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(hit.created_at))
+            item = QListWidgetItem(f"{hit.provider} · {hit.role} · {when}\n{hit.snippet}")
+            item.setData(Qt.ItemDataRole.UserRole, hit)
+            self.results.addItem(item)
+        self.status_label.setText(f"{len(hits)} results in {elapsed_ms:.1f} ms" if query.strip() else "")
+        if not hits:
+            self.preview.clear()
+
+    def on_current_changed(self, item, _previous=None):
+        self.current_hit = item.data(Qt.ItemDataRole.UserRole) if item else None
+        if self.current_hit:
+            self.preview.setPlainText(self.archive.text(self.current_hit.id) or "")
+        self.update_buttons()
+
+    def update_buttons(self):
+        self.copy_button.setEnabled(self.current_hit is not None)
+        self.open_button.setEnabled(bool(self.current_hit and self.current_hit.url))
+
+    def copy_current(self):
+        if self.current_hit:
+            QGuiApplication.clipboard().setText(self.preview.toPlainText())
+
+    def open_current(self):
+        if self.current_hit and self.current_hit.url:
+            self.openRequested.emit(self.current_hit.provider, self.current_hit.url)
@@ -0,0 +1,356 @@
+# File: broadcast.py
+import itertools
+import json
+import logging
+import time
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+
+from config import get_settings
+from metrics import registry as metrics
+from providers import GENERIC_SELECTORS, provider_selectors
+from .page_scripts import InjectionPoint, PageScript, provider_matches, registry as scripts
+from .web_channel import CHANNEL_WORLD
+
+# Chạy trong ApplicationWorld của trang provider: điền/gửi do Python điều khiển,
+# câu trả lời được theo dõi bằng MutationObserver và gửi về qua QWebChannel
+BROADCAST_AGENT_JS = """
+(function() {
+    if (window.__smartaiBroadcast || !window.__smartaiChannel) {
+        return;
+    }
+    let bridge = null;
+    window.__smartaiChannel.then(objects => { bridge = objects.broadcastBridge || null; });
+
+    function visible(element) {
+        return !!(element && (element.offsetWidth || element.offsetHeight || element.getClientRects().length));
+    }
+
+    function first(selector) {
+        for (const element of document.querySelectorAll(selector)) {
+            if (visible(element)) {
+                return element;
+            }
+        }
+        return null;
+    }
+
+    function watch(runId, selectors, baseline, idleMs) {
+        let lastText = '';
+        let started = false;
+        let pending = false;
+        let idleTimer = null;
+        const observer = new MutationObserver(schedule);
+        observer.observe(document.body, { childList: true, subtree: true, characterData: true });
+
+        function schedule() {
+            if (!pending) {
+                pending = true;
+                setTimeout(read, 100);
+            }
+        }
+
+        function read() {
+            pending = false;
+            const responses = document.querySelectorAll(selectors.response);
+            if (responses.length <= baseline) {
+                return;
+            }
+            const text = responses[responses.length - 1].innerText.trim();
+            if (!text || text === lastText) {
+                return;
+            }
+            if (!started) {
+                started = true;
+                bridge && bridge.answerStarted(runId);
+            }
+            lastText = text;
+            bridge && bridge.answerUpdated(runId, text);
+            clearTimeout(idleTimer);
+            idleTimer = setTimeout(finish, idleMs);
+        }
+
+        function finish() {
+            // Site còn hiện nút Stop thì câu trả lời chưa xong
+            if (selectors.streaming && document.querySelector(selectors.streaming)) {
+                idleTimer = setTimeout(finish, idleMs);
+                return;
+            }
+            observer.disconnect();
+            bridge && bridge.answerFinished(runId, lastText);
+        }
+    }
+
+    window.__smartaiBroadcast = {
+        focus(selectors) {
+            const input = first(selectors.input);
+            if (!input) {
+                return false;
+            }
+            input.focus();
+            // Chọn hết bản nháp cũ để prompt thay thế thay vì nối vào
+            if (input.isContentEditable) {
+                document.execCommand('selectAll', false, null);
+            } else {
+                input.select();
+            }
+            return input === document.activeElement || input.contains(document.activeElement);
+        },
+
+        submit(runId, selectors, idleMs) {
+            if (!bridge) {
+                return '';
+            }
+            watch(runId, selectors, document.querySelectorAll(selectors.response).length, idleMs);
+            const button = first(selectors.submit);
+            if (button && !button.disabled) {
+                button.click();
+                return 'button';
+            }
+            const input = first(selectors.input);
+            if (!input) {
+                return '';
+            }
+            input.dispatchEvent(new KeyboardEvent('keydown', {
+                key: 'Enter', code: 'Enter', keyCode: 13, which: 13, bubbles: true, cancelable: true,
+            }));
+            return 'enter';
+        },
+    };
+})();
+"""
+
+
+class BroadcastBridge(QObject):
+    """Object "broadcastBridge" trên QWebChannel của mỗi page"""
+
+    started = pyqtSignal(int)
+    updated = pyqtSignal(int, str)
+    finished = pyqtSignal(int, str)
+
+    @pyqtSlot(int)
+    def answerStarted(self, run_id):
+        self.started.emit(run_id)
+
+    @pyqtSlot(int, str)
+    def answerUpdated(self, run_id, text):
+        self.updated.emit(run_id, text)
+
+    @pyqtSlot(int, str)
+    def answerFinished(self, run_id, text):
+        self.finished.emit(run_id, text)
+
+
+class ProviderRun:
+    def __init__(self, run_id, provider, page, prompt, selectors):
+        self.id = run_id
+        self.provider = provider
+        self.page = page
+        self.prompt = prompt
+        self.selectors = selectors
+        self.status = "loading"
+        self.started_at = time.perf_counter()
+        self.transfer_id = None
+        self.load_connection = None
+        self.submitted_at = None
+        self.ttft_ms = None
+        self.total_ms = None
+        self.text = ""
+
+    def timings(self):
+        return {
+            "status": self.status,
+            "ttft_ms": round(self.ttft_ms, 1) if self.ttft_ms is not None else None,
+            "total_ms": round(self.total_ms, 1) if self.total_ms is not None else None,
+            "chars": len(self.text),
+        }
+
+
+class BroadcastController(QObject):
+    """Gửi một prompt tới nhiều page cùng lúc và theo dõi câu trả lời.
+
+    Mỗi page cần text_bridge (components/text_bridge.py) và broadcast_bridge,
+    cùng các script web_channel/text_bridge/broadcast_agent của profile.
+    TTFT và tổng thời gian tính từ lúc bấm gửi trong từng page.
+    """
+
+    statusChanged = pyqtSignal(str, str)
+    answerUpdated = pyqtSignal(str, str)
+    providerFinished = pyqtSignal(str, dict)
+    broadcastFinished = pyqtSignal(dict)
+
+    _ids = itertools.count(1)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        options = get_settings().section("broadcast")
+        self.input_timeout_s = options.get("input_timeout_s", 30)
+        self.answer_timeout_s = options.get("answer_timeout_s", 180)
+        self.idle_ms = options.get("idle_ms", 3000)
+        self.runs = {}
+        self.transfers = {}
+        self.connected = set()
+        self.last_results = {}
+
+    def start(self, prompt, targets, selectors=None):
+        """targets: [(provider, page)]. Page đang load sẽ được chờ tới loadFinished"""
+        selectors = selectors or provider_selectors()
+        self.cancel()
+        self.last_results = {}
+        for provider, page in targets:
+            run = ProviderRun(next(self._ids), provider, page, prompt,
+                              selectors.get(provider, GENERIC_SELECTORS))
+            self.runs[run.id] = run
+            self.connect_page(page)
+            self.set_status(run, "loading")
+            QTimer.singleShot(int(self.answer_timeout_s * 1000), lambda r=run: self.fail(r, "timeout"))
+            if page.isLoading():
+                run.load_connection = page.loadFinished.connect(lambda ok, r=run: self.on_load_finished(r, ok))
+            else:
+                self.focus_input(run)
+        logging.info(f"Broadcast: prompt ({len(prompt)} chars) to {', '.join(p for p, _ in targets)}")
+
+    def connect_page(self, page):
+        if id(page) in self.connected:
+            return
+        self.connected.add(id(page))
+        page.broadcast_bridge.started.connect(self.on_answer_started)
+        page.broadcast_bridge.updated.connect(self.on_answer_updated)
+        page.broadcast_bridge.finished.connect(self.on_answer_finished)
+        page.text_bridge.finished.connect(self.on_transfer_finished)
+        page.destroyed.connect(lambda _=None, key=id(page): self.connected.discard(key))
+
+    def set_status(self, run, status):
+        run.status = status
+        self.statusChanged.emit(run.provider, status)
+
+    def active(self, run):
+        return self.runs.get(run.id) is run and run.status not in ("done", "failed")
+
+    def release(self, run):
+        # Ngắt handler loadFinished của lần broadcast này khỏi page
+        connection, run.load_connection = run.load_connection, None
+        if connection is not None:
+            try:
+                run.page.loadFinished.disconnect(connection)
+            except (TypeError, RuntimeError):
+                pass
+
+    def on_load_finished(self, run, ok):
+        self.release(run)
+        if not self.active(run) or run.status != "loading":
+            return
+        if not ok:
+            self.fail(run, "load failed")
+            return
+        self.focus_input(run)
+
+    def focus_input(self, run):
+        if not self.active(run):
+            return
+        self.set_status(run, "waiting for input")
+        source = (f"window.__smartaiBroadcast ? "
+                  f"window.__smartaiBroadcast.focus({json.dumps(run.selectors)}) : false")
+        run.page.runJavaScript(source, CHANNEL_WORLD.value, lambda ok, r=run: self.on_focused(r, ok))
+
+    def on_focused(self, run, ok):
+        if not self.active(run):
+            return
+        if not ok:
+            # SPA có thể dựng ô nhập sau loadFinished: thử lại cho tới input_timeout_s
+            if time.perf_counter() - run.started_at < self.input_timeout_s:
+                QTimer.singleShot(250, lambda r=run: self.focus_input(r))
+            else:
+                self.fail(run, "input not found")
+            return
+        self.set_status(run, "typing")
+        run.transfer_id = run.page.text_bridge.send_text(run.prompt, source="broadcast")
+        self.transfers[run.transfer_id] = run
+
+    def on_transfer_finished(self, transfer_id, ok, _elapsed_ms):
+        run = self.transfers.pop(transfer_id, None)
+        if run is None or not self.active(run):
+            return
+        if not ok:
+            self.fail(run, "fill failed")
+            return
+        # Cho editor (React/ProseMirror) bật nút gửi trước khi bấm
+        QTimer.singleShot(150, lambda r=run: self.submit(r))
+
+    def submit(self, run):
+        if not self.active(run):
+            return
+        source = (f"window.__smartaiBroadcast.submit({run.id}, "
+                  f"{json.dumps(run.selectors)}, {int(self.idle_ms)})")
+        run.submitted_at = time.perf_counter()
+        run.page.runJavaScript(source, CHANNEL_WORLD.value, lambda how, r=run: self.on_submitted(r, how))
+
+    def on_submitted(self, run, how):
+        if not self.active(run):
+            return
+        if not how:
+            self.fail(run, "submit failed")
+            return
+        self.set_status(run, "waiting for answer")
+
+    def on_answer_started(self, run_id):
+        run = self.runs.get(run_id)
+        if run is None or not self.active(run) or run.submitted_at is None:
+            return
+        run.ttft_ms = (time.perf_counter() - run.submitted_at) * 1000
+        metrics.observe(f"broadcast_ttft_{run.provider}", run.ttft_ms)
+        self.set_status(run, "streaming")
+
+    def on_answer_updated(self, run_id, text):
+        run = self.runs.get(run_id)
+        if run is None or not self.active(run):
+            return
+        run.text = text
+        self.answerUpdated.emit(run.provider, text)
+
+    def on_answer_finished(self, run_id, text):
+        run = self.runs.get(run_id)
+        if run is None or not self.active(run) or run.submitted_at is None:
+            return
+        run.text = text
+        run.total_ms = (time.perf_counter() - run.submitted_at) * 1000
+        metrics.observe(f"broadcast_total_{run.provider}", run.total_ms)
+        self.set_status(run, "done")
+        self.finish(run)
+
+    def fail(self, run, reason):
+        if not self.active(run):
+            return
+        self.release(run)
+        logging.warning(f"Broadcast: {run.provider} failed: {reason}")
+        metrics.count("broadcast_failed")
+        self.set_status(run, "failed")
+        self.finish(run)
+
+    def finish(self, run):
+        timings = run.timings()
+        self.last_results[run.provider] = timings
+        logging.info(f"Broadcast: {run.provider} {timings}")
+        self.providerFinished.emit(run.provider, timings)
+        if not any(self.active(other) for other in self.runs.values()):
+            self.broadcastFinished.emit(dict(self.last_results))
+
+    def cancel(self):
+        for run in list(self.runs.values()):
+            self.release(run)
+            if self.active(run):
+                self.set_status(run, "failed")
+        self.runs.clear()
+        self.transfers.clear()
+
+    def stats(self):
+        return dict(self.last_results)
+
+
+scripts.register(PageScript(
+    "broadcast_agent",
+    BROADCAST_AGENT_JS,
+    injection_point=InjectionPoint.DocumentReady,
+    world=CHANNEL_WORLD,
+    matches=provider_matches(),
+))
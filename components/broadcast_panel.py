@@ -0,0 +1,128 @@
+# File: components/broadcast_panel.py
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtWidgets import (QCheckBox, QHBoxLayout, QLabel, QPlainTextEdit, QPushButton,
+                             QSplitter, QVBoxLayout, QWidget)
+
+from providers import PROVIDERS
+
+
+def format_timing(timings):
+    parts = [timings.get("status", "")]
+    if timings.get("ttft_ms") is not None:
+        parts.append(f"TTFT {timings['ttft_ms'] / 1000:.1f}s")
+    if timings.get("total_ms") is not None:
+        parts.append(f"total {timings['total_ms'] / 1000:.1f}s")
+    return " · ".join(part for part in parts if part)
+
+
+class AnswerPane(QWidget):
+    def __init__(self, provider, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        layout.setSpacing(4)
+
+        self.provider = provider
+        self.header = QLabel(provider)
+        self.header.setStyleSheet("color: #c0c0c0; font-weight: 600;")
+        self.answer = QPlainTextEdit()
+        self.answer.setReadOnly(True)
+        layout.addWidget(self.header)
+        layout.addWidget(self.answer)
+
+    def set_status(self, status):
+        self.header.setText(f"{self.provider} · {status}")
+
+    def set_text(self, text):
+        # Giữ vị trí cuộn ở cuối khi câu trả lời đang stream
+        scrollbar = self.answer.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+        self.answer.setPlainText(text)
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+
+class BroadcastPanel(QWidget):
+    """Nhập một prompt, chọn provider và xem các câu trả lời cạnh nhau"""
+
+    broadcastRequested = pyqtSignal(str, list)
+
+    def __init__(self, selected_providers=(), parent=None):
+        super().__init__(parent)
+        self.panes = {}
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 8, 8, 8)
+        layout.setSpacing(6)
+
+        self.prompt_edit = QPlainTextEdit()
+        self.prompt_edit.setPlaceholderText("Prompt to send to the selected providers...")
+        self.prompt_edit.setFixedHeight(90)
+        layout.addWidget(self.prompt_edit)
+
+        options = QHBoxLayout()
+        self.checkboxes = {}
+        for provider in PROVIDERS:
+            checkbox = QCheckBox(provider)
+            checkbox.setChecked(provider in selected_providers)
+            self.checkboxes[provider] = checkbox
+            options.addWidget(checkbox)
+        options.addStretch()
+        self.send_button = QPushButton("Broadcast")
+        self.send_button.clicked.connect(self.on_send_clicked)
+        options.addWidget(self.send_button)
+        layout.addLayout(options)
+
+        self.splitter = QSplitter(Qt.Orientation.Horizontal)
+        layout.addWidget(self.splitter, 1)
+
+        self.setStyleSheet("""
+            BroadcastPanel, QSplitter {
+                background-color: #33322F;
+            }
+            QPlainTextEdit {
+                background-color: #2C2C29;
+                color: #e0e0e0;
+                border: 1px solid #4D4D4D;
+            }
+            QCheckBox {
+                color: #c0c0c0;
+            }
+        """)
+
+    def selected_providers(self):
+        return [provider for provider, checkbox in self.checkboxes.items() if checkbox.isChecked()]
+
+    def on_send_clicked(self):
+        prompt = self.prompt_edit.toPlainText().strip()
+        providers = self.selected_providers()
+        if prompt and providers:
+            self.broadcastRequested.emit(prompt, providers)
+
+    def reset(self, providers):
+        for pane in self.panes.values():
+            pane.deleteLater()
+        self.panes = {}
+        for provider in providers:
+            pane = AnswerPane(provider)
+            self.panes[provider] = pane
+            self.splitter.addWidget(pane)
+        self.send_button.setEnabled(False)
+
+    def on_status_changed(self, provider, status):
+        pane = self.panes.get(provider)
+        if pane:
+            pane.set_status(status)
+
+    def on_answer_updated(self, provider, text):
+        pane = self.panes.get(provider)
+        if pane:
+            pane.set_text(text)
+
+    def on_provider_finished(self, provider, timings):
+        pane = self.panes.get(provider)
+        if pane:
+            pane.set_status(format_timing(timings))
+
+    def on_broadcast_finished(self, results):
+        self.send_button.setEnabled(True)
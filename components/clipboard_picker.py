@@ -0,0 +1,86 @@
+# File: components/clipboard_picker.py
+import time
+
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtWidgets import QListWidget, QListWidgetItem, QVBoxLayout, QWidget
+
+
+def format_size(size):
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.0f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def format_age(copied_at):
+    seconds = int(time.time() - copied_at)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m"
+    return f"{seconds // 3600}h"
+
+
+class ClipboardPicker(QWidget):
+    """Popup chọn một mục trong lịch sử clipboard (Enter / double click để gửi)"""
+
+    clipSelected = pyqtSignal(str)
+
+    def __init__(self, history, parent=None):
+        super().__init__(parent)
+        self.history = history
+        self.setWindowFlags(Qt.WindowType.Popup | Qt.WindowType.FramelessWindowHint)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.list_widget = QListWidget()
+        self.list_widget.itemActivated.connect(self.on_item_activated)
+        layout.addWidget(self.list_widget)
+
+        self.setStyleSheet("""
+            QListWidget {
+                background-color: #2C2C29;
+                border: 1px solid #4D4D4D;
+                color: #c0c0c0;
+                font-size: 13px;
+                outline: none;
+            }
+            QListWidget::item {
+                padding: 6px 10px;
+            }
+            QListWidget::item:selected {
+                background-color: #333333;
+                color: #ffffff;
+            }
+        """)
+
+    def refresh(self):
+        self.list_widget.clear()
+        entries = self.history.recent()
+        for entry in entries:
+            label = f"{entry.preview}    · {format_size(entry.size)} · {format_age(entry.copied_at)}"
+            item = QListWidgetItem(label)
+            item.setData(Qt.ItemDataRole.UserRole, entry.digest)
+            self.list_widget.addItem(item)
+        if not entries:
+            item = QListWidgetItem("Clipboard history is empty")
+            item.setFlags(Qt.ItemFlag.NoItemFlags)
+            self.list_widget.addItem(item)
+        self.list_widget.setCurrentRow(0)
+
+    def popup_at(self, anchor):
+        """Hiện picker ở giữa widget anchor"""
+        self.refresh()
+        width = min(520, max(280, anchor.width() - 40))
+        self.resize(width, min(420, 36 * max(1, self.list_widget.count()) + 4))
+        center = anchor.mapToGlobal(anchor.rect().center())
+        self.move(center.x() - self.width() // 2, center.y() - self.height() // 2)
+        self.show()
+        self.list_widget.setFocus()
+
+    def on_item_activated(self, item):
+        digest = item.data(Qt.ItemDataRole.UserRole)
+        self.close()
+        if digest:
+            self.clipSelected.emit(digest)
@@ -1,29 +1,91 @@
 # File: components/content_widget.py
-from PyQt6.QtCore import QUrl
-from PyQt6.QtWidgets import QWidget, QHBoxLayout, QSizePolicy
+from PyQt6.QtCore import QUrl, pyqtSignal
+from PyQt6.QtWebEngineCore import QWebEnginePage
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QStackedWidget, QSizePolicy
+from archive import get_archive
+from config import get_settings
+from metrics import registry as metrics
+from providers import PROVIDERS, provider_for_url
+from session_store import get_session
+from .archive_panel import ArchivePanel
+from .broadcast import BroadcastController
+from .broadcast_panel import BroadcastPanel
+from .diagnostics import DIAGNOSTICS_URL
 from .navigation_bar import NavigationBar
-from .web_view import CustomWebView
+from .page_lifecycle import PageLifecycleManager, SuspendOnHide
+from .view_pool import ProviderViewPool
 
 class ContentWidget(QWidget):
+    popupCreated = pyqtSignal(object)
+    authCompleted = pyqtSignal(str)
+    clipboardHistoryRequested = pyqtSignal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setup_ui()
         self.setup_connections()
 
+    @property
+    def web_view(self):
+        """View của provider đang hiển thị"""
+        return self.view_pool.current_view()
+
     def setup_ui(self):
         layout = QHBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
 
-        # Create WebView first
-        self.web_view = CustomWebView()
-        self.web_view.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        # Mỗi provider một view, xếp chồng; chuyển provider chỉ đổi view hiện tại
+        self.view_stack = QStackedWidget()
+        self.view_stack.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.view_pool = ProviderViewPool(
+            self.view_stack,
+            max_live_pages=get_settings().get("view_pool", "max_live_pages", 3),
+            parent=self
+        )
+        self.view_pool.viewCreated.connect(self.on_view_created)
+
+        # Create WebView first (chỉ load URL khi view được hiển thị)
+        self.session = get_session()
+        provider = self.session.get("active_provider", "claude")
+        self.view_pool.activate(provider, self.session.last_url(provider) or PROVIDERS.get(provider, PROVIDERS["claude"]))
+
+        lifecycle = get_settings().section("page_lifecycle")
+        self.lifecycle_manager = None
+        if lifecycle.get("enabled", True):
+            self.lifecycle_manager = PageLifecycleManager(
+                self.view_pool,
+                freeze_after_s=lifecycle.get("freeze_after_s", 60),
+                discard_after_s=lifecycle.get("discard_after_s", 0),
+                memory_budget_mb=lifecycle.get("memory_budget_mb", 1500),
+                pinned_providers=lifecycle.get("pinned_providers", []),
+                check_interval_s=lifecycle.get("check_interval_s", 10),
+                parent=self
+            )
+
+        suspend = get_settings().section("suspend_on_hide")
+        self.suspender = None
+        if suspend.get("enabled", True):
+            self.suspender = SuspendOnHide(
+                self.view_pool,
+                mode=suspend.get("mode", "freeze"),
+                grace_period_s=suspend.get("grace_period_s", 30),
+                parent=self
+            )
+
+        # Chế độ broadcast: panel được tạo ở lần mở đầu tiên, nằm chung stack với các view
+        self.broadcast_panel = None
+        self.broadcast_controller = None
+        self.broadcast_providers = []
+
+        self.archive = get_archive() if get_settings().get("archive", "enabled", True) else None
+        self.archive_panel = None
 
         # Create Navigation Bar
         self.nav_bar = NavigationBar()
 
         # Add widgets to layout in order: WebView first, NavBar last
-        layout.addWidget(self.web_view)
+        layout.addWidget(self.view_stack)
         layout.addWidget(self.nav_bar)
 
         self.setStyleSheet("""
@@ -33,18 +95,185 @@ class ContentWidget(QWidget):
         """)
 
     def setup_connections(self):
-        # Connect signals from navigation bar to web view
-        self.nav_bar.refreshClicked.connect(self.web_view.reload)
-        self.nav_bar.backClicked.connect(self.web_view.back)
-        self.nav_bar.forwardClicked.connect(self.web_view.forward)
-        self.nav_bar.chatgptClicked.connect(lambda: self.set_and_save_url("https://chatgpt.com/"))
-        self.nav_bar.claudeClicked.connect(lambda: self.set_and_save_url("https://claude.ai/"))
-        self.nav_bar.mistralClicked.connect(lambda: self.set_and_save_url("https://chat.mistral.ai/"))
-        self.nav_bar.copilotClicked.connect(lambda: self.set_and_save_url("https://copilot.microsoft.com/"))
-        self.nav_bar.geminiClicked.connect(lambda: self.set_and_save_url("https://gemini.google.com/"))
-        self.nav_bar.huggingClicked.connect(lambda: self.set_and_save_url("https://huggingface.co/chat/"))
-        self.nav_bar.clearCacheRequested.connect(self.web_view.clear_cache)
+        # Connect signals from navigation bar to the current web view
+        self.nav_bar.refreshClicked.connect(lambda: self.web_view.reload())
+        self.nav_bar.backClicked.connect(lambda: self.web_view.back())
+        self.nav_bar.forwardClicked.connect(lambda: self.web_view.forward())
+        self.nav_bar.chatgptClicked.connect(lambda: self.set_and_save_url(PROVIDERS["chatgpt"]))
+        self.nav_bar.claudeClicked.connect(lambda: self.set_and_save_url(PROVIDERS["claude"]))
+        self.nav_bar.mistralClicked.connect(lambda: self.set_and_save_url(PROVIDERS["mistral"]))
+        self.nav_bar.copilotClicked.connect(lambda: self.set_and_save_url(PROVIDERS["copilot"]))
+        self.nav_bar.geminiClicked.connect(lambda: self.set_and_save_url(PROVIDERS["gemini"]))
+        self.nav_bar.huggingClicked.connect(lambda: self.set_and_save_url(PROVIDERS["hugging"]))
+        self.nav_bar.clearSiteDataRequested.connect(self.clear_site_data)
+        self.site_data.usageChanged.connect(self.on_site_usage_changed)
+        self.nav_bar.diagnosticsRequested.connect(lambda: self.web_view.setUrl(QUrl(DIAGNOSTICS_URL)))
+        self.nav_bar.clipboardHistoryRequested.connect(self.clipboardHistoryRequested.emit)
+        self.nav_bar.broadcastRequested.connect(self.show_broadcast)
+        self.nav_bar.archiveRequested.connect(self.show_archive)
+
+        # Số liệu của pool/lifecycle hiện trên trang diagnostics
+        metrics.add_source("view_pool", self.view_pool.stats)
+        if self.lifecycle_manager:
+            metrics.add_source("page_lifecycle", self.lifecycle_manager.stats)
+        if self.suspender:
+            metrics.add_source("suspend_on_hide", self.suspender.stats)
+        metrics.add_source("shim_listeners", self.shim_listener_stats)
+        metrics.add_source("response_capture", self.capture_stats)
+        metrics.add_source("site_data", self.site_data.stats)
+
+    def on_view_created(self, provider, view):
+        view.popupCreated.connect(self.popupCreated)
+        view.authCompleted.connect(self.authCompleted)
+
+        # Khôi phục zoom/scroll của phiên trước, theo dõi URL để lưu lại
+        state = self.session.provider_state(provider)
+        if state.get("zoom"):
+            view.setZoomFactor(state["zoom"])
+        if state.get("scroll"):
+            view.restore_scroll_y = state["scroll"]
+        view.urlChanged.connect(lambda url, p=provider: self.on_url_changed(p, url))
+
+        if self.archive:
+            view.custom_page.response_capture.messageCompleted.connect(self.archive_answer)
+
+    def on_url_changed(self, provider, url):
+        if url.scheme() in ("http", "https"):
+            self.session.update_provider(provider, url=url.toString())
+
+    def save_view_state(self):
+        view = self.web_view
+        if view is None:
+            return
+        self.session.update_provider(
+            self.view_pool.current,
+            zoom=round(view.zoomFactor(), 2),
+            scroll=int(view.page().scrollPosition().y())
+        )
 
     def set_and_save_url(self, url):
-        self.web_view.setUrl(QUrl(url))
-        self.web_view.save_last_url(url)
\ No newline at end of file
+        provider = provider_for_url(url)
+        if provider == self.view_pool.current and self.view_stack.currentWidget() is not self.web_view:
+            # Đang ở panel broadcast/archive: quay lại view hiện tại, không load lại
+            self.view_stack.setCurrentWidget(self.web_view)
+        elif provider == self.view_pool.current:
+            # Bấm lại provider đang mở: quay về trang chủ như trước
+            self.web_view.setUrl(QUrl(url))
+        else:
+            # View đã có trong pool thì chỉ đổi view, không load lại;
+            # view mới mở lại trang cuối cùng của provider đó
+            self.save_view_state()
+            self.view_pool.activate(provider, self.session.last_url(provider) or url)
+        self.session.set("active_provider", provider)
+
+    def show_broadcast(self):
+        if self.broadcast_panel is None:
+            self.broadcast_panel = BroadcastPanel(get_settings().get("broadcast", "providers", []))
+            self.broadcast_controller = BroadcastController(self)
+            self.broadcast_panel.broadcastRequested.connect(self.start_broadcast)
+            self.broadcast_controller.statusChanged.connect(self.broadcast_panel.on_status_changed)
+            self.broadcast_controller.answerUpdated.connect(self.broadcast_panel.on_answer_updated)
+            self.broadcast_controller.providerFinished.connect(self.broadcast_panel.on_provider_finished)
+            self.broadcast_controller.providerFinished.connect(self.release_broadcast_view)
+            self.broadcast_controller.broadcastFinished.connect(self.broadcast_panel.on_broadcast_finished)
+            self.view_stack.addWidget(self.broadcast_panel)
+            metrics.add_source("broadcast", self.broadcast_controller.stats)
+        self.view_stack.setCurrentWidget(self.broadcast_panel)
+        self.broadcast_panel.prompt_edit.setFocus()
+
+    def start_broadcast(self, prompt, providers):
+        for provider in self.broadcast_providers:
+            self.release_broadcast_view(provider)
+        self.broadcast_providers = list(providers)
+        self.broadcast_panel.reset(providers)
+        if self.archive:
+            for provider in providers:
+                self.archive.add(provider, "user", prompt)
+
+        # Các page được load song song trong nền; giữ chúng Active và "visible"
+        # để Chromium không throttle timer trong lúc stream câu trả lời
+        targets = []
+        for provider in providers:
+            view = self.view_pool.hold(provider, PROVIDERS[provider])
+            page = view.page()
+            if page.lifecycleState() != QWebEnginePage.LifecycleState.Active:
+                page.setLifecycleState(QWebEnginePage.LifecycleState.Active)
+            page.setVisible(True)
+            targets.append((provider, page))
+        self.broadcast_controller.start(prompt, targets)
+
+    def release_broadcast_view(self, provider, _timings=None):
+        if provider not in self.view_pool.held:
+            return
+        view = self.view_pool.views.get(provider)
+        if view is not None:
+            view.page().setVisible(view.isVisible())
+        self.view_pool.release(provider)
+
+    @property
+    def site_data(self):
+        return self.web_view.profile.site_data
+
+    def clear_site_data(self, provider):
+        if not provider:
+            self.site_data.clear_all()
+            return
+        # Provider được mở để xóa storage từ chính origin của nó rồi load lại sạch
+        if provider != self.view_pool.current:
+            self.save_view_state()
+        view = self.view_pool.activate(provider, PROVIDERS[provider])
+        self.session.set("active_provider", provider)
+        self.site_data.clear(provider, view)
+
+    def on_site_usage_changed(self):
+        self.nav_bar.site_usage = self.site_data.provider_usage()
+
+    def archive_answer(self, provider, _message_id, text, url):
+        self.archive.add(provider, "assistant", text, url)
+
+    def show_archive(self):
+        if self.archive is None:
+            return
+        if self.archive_panel is None:
+            self.archive_panel = ArchivePanel(self.archive)
+            self.archive_panel.openRequested.connect(self.open_archived)
+            self.view_stack.addWidget(self.archive_panel)
+        self.view_stack.setCurrentWidget(self.archive_panel)
+        self.archive_panel.focus_search()
+
+    def open_archived(self, provider, url):
+        if provider not in PROVIDERS:
+            return
+        if provider != self.view_pool.current:
+            self.save_view_state()
+        # View mới load url khi hiển thị; view đã load thì phải chuyển trang
+        view = self.view_pool.activate(provider, url)
+        if view.loaded and view.url().toString() != url:
+            view.setUrl(QUrl(url))
+        self.session.set("active_provider", provider)
+
+    def suspend(self):
+        """Sidebar bị ẩn"""
+        self.save_view_state()
+        if self.suspender:
+            self.suspender.suspend()
+
+    def resume(self):
+        """Sidebar được hiện lại"""
+        if self.suspender:
+            self.suspender.resume()
+
+    def shim_listener_stats(self):
+        # Giá trị lần đo trước; đồng thời yêu cầu đo lại cho lần xem sau
+        stats = {}
+        for provider, view in self.view_pool.views.items():
+            stats[provider] = view.shim_listeners
+            view.report_shim_listeners()
+        return stats
+
+    def capture_stats(self):
+        return {provider: view.custom_page.response_capture.stats()
+                for provider, view in self.view_pool.views.items()}
+
+    def pool_stats(self):
+        return self.view_pool.stats()
\ No newline at end of file
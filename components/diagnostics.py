@@ -0,0 +1,83 @@
+# File: diagnostics.py
+import html
+import json
+
+from PyQt6.QtCore import QBuffer, QIODevice
+from PyQt6.QtWebEngineCore import QWebEngineUrlRequestJob, QWebEngineUrlScheme, QWebEngineUrlSchemeHandler
+
+from metrics import registry
+from utils import AppPaths
+
+SCHEME = b"smartai"
+DIAGNOSTICS_URL = "smartai://diagnostics"
+
+
+def register_scheme():
+    """Phải gọi trước khi tạo bất kỳ QWebEngineProfile nào"""
+    if QWebEngineUrlScheme.schemeByName(SCHEME).name():
+        return
+    scheme = QWebEngineUrlScheme(SCHEME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    scheme.setFlags(QWebEngineUrlScheme.Flag.LocalScheme | QWebEngineUrlScheme.Flag.LocalAccessAllowed)
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+def render_value(value):
+    if isinstance(value, dict):
+        if not value:
+            return "<i>empty</i>"
+        rows = "".join(
+            f"<tr><th>{html.escape(str(key))}</th><td>{render_value(item)}</td></tr>"
+            for key, item in value.items()
+        )
+        return f"<table>{rows}</table>"
+    return html.escape(str(value))
+
+
+def render_page(snapshot, notice=""):
+    sections = "".join(
+        f"<h2>{html.escape(name)}</h2>{render_value(value)}" for name, value in snapshot.items()
+    )
+    return f"""<!doctype html>
+<html><head><meta charset="utf-8"><title>SmartAI diagnostics</title>
+<style>
+    body {{ background: #1E1E1E; color: #ddd; font: 13px sans-serif; padding: 16px; }}
+    a {{ color: #8ab4f8; }}
+    table {{ border-collapse: collapse; margin: 4px 0; }}
+    th, td {{ border: 1px solid #444; padding: 3px 8px; text-align: left; vertical-align: top; }}
+    th {{ color: #aaa; font-weight: normal; }}
+</style></head>
+<body>
+<h1>SmartAI diagnostics</h1>
+<p><a href="smartai://diagnostics">Refresh</a> ·
+<a href="smartai://diagnostics/json">JSON</a> ·
+<a href="smartai://diagnostics/dump">Dump JSON to disk</a></p>
+<p>{html.escape(notice)}</p>
+{sections}
+</body></html>"""
+
+
+class DiagnosticsSchemeHandler(QWebEngineUrlSchemeHandler):
+    """smartai://diagnostics (HTML), /json (JSON), /dump (ghi file JSON vào appdata)"""
+
+    def requestStarted(self, job):
+        url = job.requestUrl()
+        if url.host() != "diagnostics":
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+
+        path = url.path().rstrip("/")
+        if path == "/json":
+            body = registry.to_json().encode()
+            content_type = b"application/json"
+        else:
+            notice = ""
+            if path == "/dump":
+                notice = f"Written to {registry.dump(AppPaths().get_appdata_dir('diagnostics'))}"
+            body = render_page(registry.snapshot(), notice).encode()
+            content_type = b"text/html"
+
+        buffer = QBuffer(job)
+        buffer.setData(body)
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        job.reply(content_type, buffer)
@@ -1,7 +1,22 @@
 from PyQt6.QtWidgets import QFrame, QVBoxLayout, QPushButton, QSpacerItem, QSizePolicy, QMenu
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QIcon
-from utils import AppPaths
+from PyQt6.QtCore import Qt, QSize, pyqtSignal
+from providers import PROVIDERS
+from resources import get_resources
+
+BUTTON_SIZE = QSize(60, 90)
+
+# Thứ tự mới: Gemini -> ChatGPT -> Mistral
+# (icon, tỉ lệ icon so với nút, tooltip, tên signal)
+NAV_BUTTONS = [
+    ("gemini.svg", 0.7, "Gemini", "geminiClicked"),
+    ("chatgpt.svg", 0.8, "ChatGPT", "chatgptClicked"),
+    ("mistral.svg", 0.6, "Mistral", "mistralClicked"),
+]
+
+
+def nav_icon_specs():
+    """(icon, kích thước) để dựng sẵn pixmap trước khi thanh điều hướng được vẽ"""
+    return [(icon_file, BUTTON_SIZE * image_size) for icon_file, image_size, _, _ in NAV_BUTTONS]
 
 
 class NavigationBar(QFrame):
@@ -14,10 +29,17 @@ class NavigationBar(QFrame):
     copilotClicked = pyqtSignal()
     geminiClicked = pyqtSignal()
     huggingClicked = pyqtSignal()
-    clearCacheRequested = pyqtSignal()
+    # Provider cần xóa cookie/cache/storage; chuỗi rỗng = mọi provider
+    clearSiteDataRequested = pyqtSignal(str)
+    diagnosticsRequested = pyqtSignal()
+    clipboardHistoryRequested = pyqtSignal()
+    broadcastRequested = pyqtSignal()
+    archiveRequested = pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        # provider -> số byte trên đĩa, cập nhật từ lần quét nền gần nhất
+        self.site_usage = {}
         self.setup_ui()
 
     def setup_ui(self):
@@ -33,37 +55,28 @@ class NavigationBar(QFrame):
         main_layout.setContentsMargins(5, 0, 5, 0)
         main_layout.setSpacing(20)
 
-        paths = AppPaths()
-
         center_layout = QVBoxLayout()
         center_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        # Thứ tự mới: Gemini -> ChatGPT -> Mistral
-        buttons = [
-            ("gemini.svg", 0.7, "Gemini", self.geminiClicked),
-            ("chatgpt.svg", 0.8, "ChatGPT", self.chatgptClicked),
-            ("mistral.svg", 0.6, "Mistral", self.mistralClicked)
-        ]
-
-        for icon_file, image_size, tooltip, signal in buttons:
-            btn = self.create_button(paths.get_path('images', icon_file), image_size, tooltip, signal)
+        for icon_file, image_size, tooltip, signal_name in NAV_BUTTONS:
+            btn = self.create_button(icon_file, image_size, tooltip, getattr(self, signal_name))
             center_layout.addWidget(btn, 0, Qt.AlignmentFlag.AlignHCenter)
 
         main_layout.addSpacerItem(QSpacerItem(20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding))
         main_layout.addLayout(center_layout)
         main_layout.addSpacerItem(QSpacerItem(20, 40, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding))
 
-    def create_button(self, image_path, image_size, tooltip, signal):
+    def create_button(self, icon_file, image_size, tooltip, signal):
         btn = QPushButton()
-        btn.setFixedSize(60, 90)
+        btn.setFixedSize(BUTTON_SIZE)
         btn.setToolTip(tooltip)
         btn.clicked.connect(signal)
         btn.setCursor(Qt.CursorShape.PointingHandCursor)
 
-        # Set icon cho button
-        icon = QIcon(image_path)
-        btn.setIcon(icon)
-        btn.setIconSize(btn.size() * image_size)
+        # Icon là pixmap đã dựng sẵn ở đúng DPR, không parse SVG lúc vẽ
+        icon_size = BUTTON_SIZE * image_size
+        btn.setIcon(get_resources().icon(icon_file, icon_size, self.screen().devicePixelRatio()))
+        btn.setIconSize(icon_size)
 
         btn.setStyleSheet("""
             QPushButton {
@@ -90,9 +103,22 @@ class NavigationBar(QFrame):
 
     def show_context_menu(self, pos, button):
         menu = QMenu(self)
-        clear_cache_action = menu.addAction("Clear Cache")
-        clear_cache_action.triggered.connect(lambda: self.clear_cache(button))
+        clear_menu = menu.addMenu("Clear Site Data")
+        for provider in PROVIDERS:
+            label = provider
+            if self.site_usage.get(provider):
+                label += f" ({self.site_usage[provider] / 2**20:.0f} MB)"
+            action = clear_menu.addAction(label)
+            action.triggered.connect(lambda _, p=provider: self.clearSiteDataRequested.emit(p))
+        clear_menu.addSeparator()
+        clear_all_action = clear_menu.addAction("All Providers (log out everywhere)")
+        clear_all_action.triggered.connect(lambda: self.clearSiteDataRequested.emit(""))
+        diagnostics_action = menu.addAction("Diagnostics")
+        diagnostics_action.triggered.connect(self.diagnosticsRequested.emit)
+        clipboard_action = menu.addAction("Clipboard History")
+        clipboard_action.triggered.connect(self.clipboardHistoryRequested.emit)
+        broadcast_action = menu.addAction("Broadcast Prompt")
+        broadcast_action.triggered.connect(self.broadcastRequested.emit)
+        archive_action = menu.addAction("Search Archive")
+        archive_action.triggered.connect(self.archiveRequested.emit)
         menu.exec(button.mapToGlobal(pos))
-
-    def clear_cache(self, button):
-        self.clearCacheRequested.emit()
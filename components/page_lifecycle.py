@@ -0,0 +1,211 @@
+# File: page_lifecycle.py
+import logging
+import time
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtWebEngineCore import QWebEnginePage
+
+from instrumentation import process_cpu_seconds, process_rss_bytes
+
+LifecycleState = QWebEnginePage.LifecycleState
+
+
+class PageLifecycleManager(QObject):
+    """Đóng băng / giải phóng page của các provider đang chạy nền trong ProviderViewPool.
+
+    - Frozen sau freeze_after_s giây ở nền (JS, timer dừng; DOM vẫn giữ)
+    - Discarded khi tổng RSS renderer vượt memory_budget_mb, hoặc sau
+      discard_after_s giây ở nền (0 = tắt), trừ các provider được pin
+    - Chuyển lại provider thì page về Active (Discarded sẽ tự load lại)
+    """
+
+    def __init__(self, pool, freeze_after_s=60, discard_after_s=0, memory_budget_mb=1500,
+                 pinned_providers=(), check_interval_s=10, parent=None):
+        super().__init__(parent)
+        self.pool = pool
+        self.freeze_after_s = freeze_after_s
+        self.discard_after_s = discard_after_s
+        self.memory_budget = memory_budget_mb * 1024 * 1024 if memory_budget_mb else 0
+        self.pinned_providers = set(pinned_providers)
+        # provider -> thời điểm bắt đầu chạy nền (monotonic)
+        self.background_since = {}
+
+        self.pool.viewCreated.connect(self.on_view_created)
+        self.pool.viewEvicted.connect(self.on_view_evicted)
+        self.pool.currentChanged.connect(self.on_current_changed)
+        for provider, view in self.pool.views.items():
+            self.on_view_created(provider, view)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(int(check_interval_s * 1000))
+        self.timer.timeout.connect(self.check)
+        self.timer.start()
+
+    def on_view_created(self, provider, view):
+        page = view.page()
+        page.lifecycleStateChanged.connect(
+            lambda state, p=provider, pg=page: self.log_state_change(p, pg, state))
+
+    def on_view_evicted(self, provider, view):
+        self.background_since.pop(provider, None)
+
+    def on_current_changed(self, provider, view):
+        now = time.monotonic()
+        for other in self.pool.views:
+            if other != provider:
+                self.background_since.setdefault(other, now)
+        self.background_since.pop(provider, None)
+
+        page = view.page()
+        if page.lifecycleState() != LifecycleState.Active:
+            page.setLifecycleState(LifecycleState.Active)
+
+    def log_state_change(self, provider, page, state):
+        rss = process_rss_bytes(page.renderProcessPid())
+        rss_text = f"{rss / 1048576:.0f} MB" if rss is not None else "unknown"
+        total = self.total_renderer_rss()
+        total_text = f"{total / 1048576:.0f} MB" if total is not None else "unknown"
+        logging.info(f"Page lifecycle: {provider} -> {state.name} "
+                     f"(renderer RSS {rss_text}, total {total_text})")
+
+    def total_renderer_rss(self):
+        # Nhiều page có thể dùng chung một renderer process, chỉ đếm mỗi pid một lần.
+        # Page đã discard hoặc chưa load có pid 0: bỏ qua, cùng với các pid không đọc được
+        pids = {view.page().renderProcessPid() for view in self.pool.views.values()}
+        total = None
+        for pid in pids:
+            rss = process_rss_bytes(pid) if pid else None
+            if rss is not None:
+                total = (total or 0) + rss
+        return total
+
+    def set_state(self, provider, state):
+        view = self.pool.views.get(provider)
+        if view is None or provider == self.pool.current or provider in self.pool.held:
+            return False
+        page = view.page()
+        if page.lifecycleState() == state or page.isVisible():
+            return False
+        if state == LifecycleState.Discarded and provider in self.pinned_providers:
+            return False
+        page.setLifecycleState(state)
+        return True
+
+    def check(self):
+        now = time.monotonic()
+        for provider, since in list(self.background_since.items()):
+            idle = now - since
+            # Provider được pin không bị discard: vẫn freeze như bình thường
+            if self.discard_after_s and idle >= self.discard_after_s \
+                    and self.set_state(provider, LifecycleState.Discarded):
+                continue
+            if self.freeze_after_s and idle >= self.freeze_after_s:
+                view = self.pool.views.get(provider)
+                if view and view.page().lifecycleState() == LifecycleState.Active:
+                    self.set_state(provider, LifecycleState.Frozen)
+
+        if self.memory_budget:
+            self.enforce_memory_budget()
+
+    def enforce_memory_budget(self):
+        total = self.total_renderer_rss()
+        if total is None or total <= self.memory_budget:
+            return
+        logging.info(f"Page lifecycle: renderer RSS {total / 1048576:.0f} MB over budget "
+                     f"{self.memory_budget / 1048576:.0f} MB")
+        # Giải phóng page chạy nền lâu nhất trước, mỗi lần một page rồi đo lại ở lần check sau
+        for provider in sorted(self.background_since, key=self.background_since.get):
+            if self.set_state(provider, LifecycleState.Discarded):
+                break
+
+    def stats(self):
+        return {
+            provider: view.page().lifecycleState().name
+            for provider, view in self.pool.views.items()
+        }
+
+
+class SuspendOnHide(QObject):
+    """Tạm dừng page đang hiển thị khi sidebar bị ẩn.
+
+    mode "freeze": page bị Chromium throttle ngay khi ẩn, sau grace_period_s giây
+    thì chuyển sang Frozen (để câu trả lời đang stream kịp chạy xong).
+    mode "throttle": chỉ dựa vào throttle của Chromium, không freeze.
+    """
+    # renderer CPU time (s) tiêu tốn trong lúc ẩn, thời gian ẩn (s)
+    hiddenCpuMeasured = pyqtSignal(float, float)
+
+    def __init__(self, pool, mode="freeze", grace_period_s=30, parent=None):
+        super().__init__(parent)
+        self.pool = pool
+        self.mode = mode
+        self.grace_period_s = grace_period_s
+        self.hidden_at = None
+        self.cpu_at_hide = {}
+        self.frozen_page = None
+        self.total_hidden_s = 0.0
+        self.total_hidden_cpu_s = 0.0
+
+        self.grace_timer = QTimer(self)
+        self.grace_timer.setSingleShot(True)
+        self.grace_timer.timeout.connect(self.freeze_current)
+
+    def renderer_cpu(self):
+        pids = {view.page().renderProcessPid() for view in self.pool.views.values()}
+        cpu = {}
+        for pid in pids:
+            seconds = process_cpu_seconds(pid)
+            if seconds is not None:
+                cpu[pid] = seconds
+        return cpu
+
+    def suspend(self):
+        if self.hidden_at is not None:
+            return
+        self.hidden_at = time.monotonic()
+        self.cpu_at_hide = self.renderer_cpu()
+
+        if self.mode != "freeze":
+            return
+        if self.grace_period_s > 0:
+            self.grace_timer.start(int(self.grace_period_s * 1000))
+        else:
+            self.freeze_current()
+
+    def freeze_current(self):
+        view = self.pool.current_view()
+        if view is None:
+            return
+        page = view.page()
+        if not page.isVisible() and page.lifecycleState() == LifecycleState.Active:
+            page.setLifecycleState(LifecycleState.Frozen)
+            self.frozen_page = page
+
+    def resume(self):
+        self.grace_timer.stop()
+        if self.frozen_page is not None:
+            if self.frozen_page.lifecycleState() == LifecycleState.Frozen:
+                self.frozen_page.setLifecycleState(LifecycleState.Active)
+            self.frozen_page = None
+
+        if self.hidden_at is None:
+            return
+        hidden_s = time.monotonic() - self.hidden_at
+        cpu_now = self.renderer_cpu()
+        # Chỉ tính các renderer còn sống từ lúc ẩn tới giờ
+        cpu_s = sum(cpu_now[pid] - before for pid, before in self.cpu_at_hide.items() if pid in cpu_now)
+        self.hidden_at = None
+        self.cpu_at_hide = {}
+
+        self.total_hidden_s += hidden_s
+        self.total_hidden_cpu_s += cpu_s
+        logging.info(f"Suspend on hide ({self.mode}): renderer CPU {cpu_s:.2f} s "
+                     f"while hidden for {hidden_s:.0f} s")
+        self.hiddenCpuMeasured.emit(cpu_s, hidden_s)
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "total_hidden_s": round(self.total_hidden_s, 1),
+            "total_hidden_cpu_s": round(self.total_hidden_cpu_s, 3),
+        }
@@ -0,0 +1,242 @@
+# File: page_scripts.py
+import json
+import logging
+from urllib.parse import urlparse
+
+from PyQt6.QtWebEngineCore import QWebEngineScript
+
+from config import get_settings
+from providers import HOST_ALIASES, PROVIDERS
+
+InjectionPoint = QWebEngineScript.InjectionPoint
+ScriptWorldId = QWebEngineScript.ScriptWorldId
+
+
+def provider_matches():
+    """@match pattern cho toàn bộ origin của các provider"""
+    origins = (urlparse(url) for url in PROVIDERS.values())
+    return [f"{origin.scheme}://{origin.netloc}/*" for origin in origins]
+
+
+class PageScript:
+    """Một script được biên dịch một lần thành QWebEngineScript và cài lên profile.
+
+    matches: danh sách @match (vd "https://chatgpt.com/*"); rỗng = mọi trang.
+    Qt tự đọc header ==UserScript== nên việc lọc theo origin diễn ra trong Chromium.
+    """
+
+    def __init__(self, name, source, injection_point=InjectionPoint.DocumentReady,
+                 world=ScriptWorldId.ApplicationWorld, runs_on_subframes=False, matches=(),
+                 enabled=True):
+        self.name = name
+        self.source = source
+        self.injection_point = injection_point
+        self.world = world
+        self.runs_on_subframes = runs_on_subframes
+        self.matches = list(matches)
+        self.enabled = enabled
+
+    def build(self):
+        source = self.source
+        if self.matches:
+            header = ["// ==UserScript==", f"// @name {self.name}"]
+            header += [f"// @match {pattern}" for pattern in self.matches]
+            header.append("// ==/UserScript==")
+            source = "\n".join(header) + "\n" + source
+
+        script = QWebEngineScript()
+        script.setName(self.name)
+        script.setSourceCode(source)
+        script.setInjectionPoint(self.injection_point)
+        script.setWorldId(self.world.value)
+        script.setRunsOnSubFrames(self.runs_on_subframes)
+        return script
+
+
+class ScriptRegistry:
+    def __init__(self):
+        self.scripts = {}
+
+    def register(self, script):
+        self.scripts[script.name] = script
+
+    def install(self, profile):
+        """Cài mọi script lên profile dùng chung; page/popup mới nhận script mà không tốn thêm gì"""
+        collection = profile.scripts()
+        overrides = get_settings().section("scripts")
+        for name, script in self.scripts.items():
+            for existing in collection.find(name):
+                collection.remove(existing)
+
+            options = overrides.get(name, {})
+            if not options.get("enabled", script.enabled):
+                continue
+            # Script tắt mặc định (vd. universal_messaging sửa postMessage trong main world)
+            # chỉ được bật cho các origin chỉ định rõ, không bật cho mọi provider
+            if not script.enabled and not options.get("matches"):
+                logging.warning(f"Scripts: {name} needs 'matches' to be enabled, skipped")
+                continue
+            if "matches" in options:
+                script.matches = list(options["matches"])
+            collection.insert(script.build())
+
+
+UNIVERSAL_MESSAGING_JS = """
+(function() {
+    if (window.__smartaiMessaging) {
+        return;
+    }
+    // Mặc định dùng structured clone gốc của trình duyệt; chỉ khi clone lỗi
+    // (DataCloneError: function, DOM node...) mới làm sạch message rồi gửi lại
+    const stats = { fallbacks: 0, errors: 0 };
+
+    function sanitize(message) {
+        try {
+            return JSON.parse(JSON.stringify(message));
+        } catch (error) {
+            return String(message);
+        }
+    }
+
+    function patch(target) {
+        const original = target && target.postMessage;
+        if (typeof original !== 'function') {
+            return;
+        }
+        target.postMessage = function(message, ...rest) {
+            try {
+                return original.call(this, message, ...rest);
+            } catch (error) {
+                if (!error || error.name !== 'DataCloneError') {
+                    throw error;
+                }
+                stats.fallbacks++;
+                try {
+                    return original.call(this, sanitize(message), ...rest);
+                } catch (retryError) {
+                    stats.errors++;
+                    console.log('postMessage fallback failed:', retryError);
+                }
+            }
+        };
+    }
+
+    patch(window);
+    if (window.MessagePort) {
+        patch(window.MessagePort.prototype);
+    }
+    if (window.BroadcastChannel) {
+        patch(window.BroadcastChannel.prototype);
+    }
+
+    window.__smartaiMessaging = stats;
+})();
+"""
+
+registry = ScriptRegistry()
+
+# Opt-in theo origin qua settings (bắt buộc có "matches"): {"scripts": {"universal_messaging":
+# {"enabled": true, "matches": ["https://chatgpt.com/*"]}}}.
+# Phải chạy trong main world trước script của trang để bọc postMessage
+registry.register(PageScript(
+    "universal_messaging",
+    UNIVERSAL_MESSAGING_JS,
+    injection_point=InjectionPoint.DocumentCreation,
+    world=ScriptWorldId.MainWorld,
+    runs_on_subframes=True,
+    matches=provider_matches(),
+    enabled=False,
+))
+
+
+# CSS/hành vi theo site: "*" áp cho mọi provider (kể cả host alias, không áp cho popup
+# OAuth hay smartai://), còn lại là tên provider (xem providers.py).
+# Ghi đè hoặc thêm site qua settings "site_tweaks"; có thể đặt "matches" riêng.
+SITE_TWEAKS = {
+    "*": {
+        "css": "::-webkit-scrollbar { display: none; } body { overflow: hidden; }",
+        "behaviors": ["wheel_scroll"],
+    },
+}
+
+# Mỗi hành vi đăng ký listener passive và tăng bộ đếm để kiểm tra rò rỉ listener
+SITE_BEHAVIORS_JS = {
+    # body bị overflow: hidden nên tự cuộn trang theo con lăn chuột
+    "wheel_scroll": """
+    document.addEventListener('wheel', (event) => {
+        window.scrollBy(0, event.deltaY);
+    }, { passive: true });
+    shim.listeners++;
+""",
+}
+
+SITE_TWEAK_TEMPLATE = """
+(function() {
+    const key = %(key)s;
+    const shim = window.__smartaiShim || (window.__smartaiShim = { listeners: 0, installed: {} });
+    // Mỗi document chỉ cài một lần
+    if (shim.installed[key] || document.querySelector('style[data-smartai="' + key + '"]')) {
+        return;
+    }
+    shim.installed[key] = true;
+
+    const css = %(css)s;
+    if (css) {
+        const style = document.createElement('style');
+        style.dataset.smartai = key;
+        style.textContent = css;
+        (document.head || document.documentElement).appendChild(style);
+    }
+%(behaviors)s
+})();
+"""
+
+SHIM_LISTENER_COUNT_JS = "window.__smartaiShim ? window.__smartaiShim.listeners : 0"
+
+
+def site_tweaks():
+    tweaks = {site: dict(tweak) for site, tweak in SITE_TWEAKS.items()}
+    for site, tweak in get_settings().section("site_tweaks").items():
+        # Cấu hình do người dùng sửa tay: mục sai thì bỏ qua, không làm hỏng việc load module
+        if not isinstance(tweak, dict):
+            logging.warning(f"Site tweaks: ignoring {site!r}, expected an object")
+            continue
+        if site != "*" and site not in PROVIDERS and "matches" not in tweak and site not in tweaks:
+            logging.warning(f"Site tweaks: ignoring unknown site {site!r} (no 'matches' given)")
+            continue
+        if "behaviors" in tweak:
+            behaviors = tweak["behaviors"]
+            if not isinstance(behaviors, list):
+                logging.warning(f"Site tweaks: ignoring behaviors of {site!r}, expected a list")
+                behaviors = []
+            unknown = [name for name in behaviors if name not in SITE_BEHAVIORS_JS]
+            if unknown:
+                logging.warning(f"Site tweaks: ignoring unknown behaviors {unknown!r} for {site!r}")
+            tweak = dict(tweak, behaviors=[name for name in behaviors if name in SITE_BEHAVIORS_JS])
+        tweaks.setdefault(site, {}).update(tweak)
+    return tweaks
+
+
+def site_tweak_script(site, tweak):
+    if "matches" in tweak:
+        matches = tweak["matches"]
+    elif site == "*":
+        matches = provider_matches() + [f"https://{host}/*" for host in HOST_ALIASES]
+    else:
+        origin = urlparse(PROVIDERS[site])
+        matches = [f"{origin.scheme}://{origin.netloc}/*"]
+
+    key = f"site-tweaks-{site if site != '*' else 'all'}"
+    behaviors = "".join(SITE_BEHAVIORS_JS[name] for name in tweak.get("behaviors", []))
+    source = SITE_TWEAK_TEMPLATE % {
+        "key": json.dumps(key),
+        "css": json.dumps(tweak.get("css", "")),
+        "behaviors": behaviors,
+    }
+    # Chạy trong ApplicationWorld: DOM dùng chung nhưng không đụng JS của trang
+    return PageScript(key, source, injection_point=InjectionPoint.DocumentReady,
+                      world=ScriptWorldId.ApplicationWorld, matches=matches)
+
+
+for _site, _tweak in site_tweaks().items():
+    registry.register(site_tweak_script(_site, _tweak))
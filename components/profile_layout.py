@@ -0,0 +1,108 @@
+# File: components/profile_layout.py
+import logging
+import os
+import shutil
+import sys
+import threading
+
+from utils import AppPaths
+
+# disk: HTTP cache trong thư mục cache của hệ thống (XDG)
+# tmpfs: HTTP cache trên đĩa RAM ($XDG_RUNTIME_DIR, /dev/shm), mất khi khởi động lại máy
+# memory: cache trong bộ nhớ của Chromium, mất khi thoát ứng dụng
+CACHE_MODES = ("disk", "tmpfs", "memory")
+
+
+def ram_dir(app_name):
+    """Thư mục RAM-backed riêng cho người dùng hiện tại, None nếu hệ thống không có"""
+    if sys.platform == "win32":
+        return None
+    candidates = [os.environ.get("XDG_RUNTIME_DIR"), "/dev/shm"]
+    for root in candidates:
+        if not root or not os.path.isdir(root) or not os.access(root, os.W_OK):
+            continue
+        # /dev/shm dùng chung cho mọi user: thư mục con theo uid, chỉ chủ sở hữu đọc được
+        path = os.path.join(root, f"{app_name}-{os.getuid()}" if root == "/dev/shm" else app_name)
+        try:
+            os.makedirs(path, mode=0o700, exist_ok=True)
+        except OSError:
+            continue
+        return path
+    return None
+
+
+def migrate_legacy_storage(paths):
+    """Bản cũ dùng chung appdata/cache cho HTTP cache, cookie và IndexedDB.
+
+    Đổi tên thư mục đó thành appdata/profile để giữ đăng nhập; HTTP cache cũ
+    bên trong được xóa ở thread nền vì có thể rất lớn.
+    """
+    root = paths.get_appdata_dir()
+    legacy = os.path.join(root, "cache")
+    storage = os.path.join(root, "profile")
+    if os.path.isdir(legacy) and not os.path.exists(storage):
+        try:
+            os.replace(legacy, storage)
+            logging.info(f"Profile: moved persistent storage {legacy} -> {storage}")
+        except OSError as e:
+            logging.warning(f"Profile: cannot migrate {legacy}: {e}")
+            return legacy
+        old_cache = os.path.join(storage, "Cache")
+        if os.path.isdir(old_cache):
+            trash = old_cache + ".old"
+            try:
+                os.replace(old_cache, trash)
+            except OSError:
+                trash = None
+            if trash:
+                threading.Thread(target=shutil.rmtree, args=(trash, True), name="profile-migrate", daemon=True).start()
+    os.makedirs(storage, exist_ok=True)
+    return storage
+
+
+class ProfileLayout:
+    """Vị trí và kiểu HTTP cache của profile, tách khỏi persistent storage (cookie, IndexedDB...)"""
+
+    def __init__(self, mode, cache_path, storage_path, max_size_bytes=0):
+        self.mode = mode
+        self.cache_path = cache_path
+        self.storage_path = storage_path
+        # 0: để Chromium tự chọn theo dung lượng đĩa
+        self.max_size_bytes = max_size_bytes
+
+    @classmethod
+    def from_settings(cls, settings, paths=None):
+        paths = paths or AppPaths()
+        mode = settings.get("mode", "disk")
+        if mode not in CACHE_MODES:
+            logging.warning(f"Profile: unknown cache mode {mode!r}, using disk")
+            mode = "disk"
+
+        cache_path = None
+        if mode == "tmpfs":
+            cache_path = ram_dir(paths.app_name)
+            if cache_path is None:
+                logging.warning("Profile: no RAM-backed directory available, using memory cache")
+                mode = "memory"
+        if cache_path is None:
+            cache_path = paths.get_cache_dir()
+
+        return cls(mode, cache_path, migrate_legacy_storage(paths),
+                   int(settings.get("max_size_mb", 256)) * 2**20)
+
+    def apply(self, profile):
+        profile.setPersistentStoragePath(self.storage_path)
+        profile.setCachePath(self.cache_path)
+        cache_type = profile.HttpCacheType.MemoryHttpCache if self.mode == "memory" else profile.HttpCacheType.DiskHttpCache
+        profile.setHttpCacheType(cache_type)
+        profile.setHttpCacheMaximumSize(self.max_size_bytes)
+        logging.info(f"Profile: {self.mode} cache at {self.cache_path} "
+                     f"(max {self.max_size_bytes // 2**20} MB), storage at {self.storage_path}")
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "cache_path": self.cache_path,
+            "storage_path": self.storage_path,
+            "max_size_mb": self.max_size_bytes // 2**20,
+        }
@@ -1,5 +1,14 @@
-from PyQt6.QtWidgets import QFrame
-from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QFrame, QRubberBand
+from PyQt6.QtCore import Qt, QRect, QTimer
+
+from config import get_settings
+from metrics import registry as metrics
+
+# preview: chỉ vẽ khung (rubber band) khi kéo, áp dụng độ rộng lúc thả chuột
+# throttled: áp dụng độ rộng tối đa một lần mỗi frame
+# live: áp dụng ở mọi mouse-move như trước (mỗi lần là một lần web view layout lại)
+RESIZE_MODES = ("preview", "throttled", "live")
+
 
 class ResizeHandle(QFrame):
     def __init__(self, parent):
@@ -17,11 +26,33 @@ class ResizeHandle(QFrame):
             }
         """)
 
+        self.mode = get_settings().get("resize", "mode", "preview")
+        if self.mode not in RESIZE_MODES:
+            self.mode = "preview"
+        self.rubber_band = None
+        self.pending_width = None
+        self.apply_timer = QTimer(self)
+        self.apply_timer.setSingleShot(True)
+        self.apply_timer.timeout.connect(self.apply_pending_width)
+
+        # Số lần độ rộng thật sự được áp dụng (mỗi lần web view layout lại)
+        self.relayouts = 0
+        self.drags = 0
+        self.last_drag_relayouts = 0
+        self.last_drag_moves = 0
+
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
             self.is_resizing = True
             self.start_x = int(event.globalPosition().x())
             self.start_width = self.parent.width()
+            self.pending_width = None
+            self.last_drag_relayouts = 0
+            self.last_drag_moves = 0
+            if self.mode == "throttled":
+                screen = self.screen()
+                rate = screen.refreshRate() if screen else 60
+                self.apply_timer.setInterval(max(1, int(1000 / (rate or 60))))
             self.parent.resizing_started()
 
     def mouseMoveEvent(self, event):
@@ -31,11 +62,55 @@ class ResizeHandle(QFrame):
             min_width = int(screen_width * 0.2)
             max_width = int(screen_width * 0.8)
             new_width = max(min_width, min(max_width, self.start_width - dx))
-            if new_width != self.parent.width():
-                self.parent.setFixedWidth(new_width)
-                self.parent.update_position()
+            self.last_drag_moves += 1
+            if self.mode == "live":
+                if new_width != self.parent.width():
+                    self.apply_width(new_width)
+            elif self.mode == "throttled":
+                self.pending_width = new_width
+                if not self.apply_timer.isActive():
+                    self.apply_timer.start()
+            else:
+                self.pending_width = new_width
+                self.show_preview(new_width)
 
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton and self.is_resizing:
             self.is_resizing = False
+            self.apply_timer.stop()
+            if self.rubber_band:
+                self.rubber_band.hide()
+            self.apply_pending_width()
+            self.drags += 1
+            metrics.observe("resize_relayouts_per_drag", self.last_drag_relayouts)
             self.parent.resizing_finished()
+
+    def show_preview(self, width):
+        # Sidebar bám mép phải: khung mới giữ nguyên mép phải, chỉ đổi mép trái
+        geometry = self.parent.geometry()
+        rect = QRect(geometry.x() + geometry.width() - width, geometry.y(), width, geometry.height())
+        if self.rubber_band is None:
+            self.rubber_band = QRubberBand(QRubberBand.Shape.Rectangle)
+            self.rubber_band.setWindowFlags(self.rubber_band.windowFlags() | Qt.WindowType.WindowStaysOnTopHint)
+        self.rubber_band.setGeometry(rect)
+        self.rubber_band.show()
+
+    def apply_pending_width(self):
+        width, self.pending_width = self.pending_width, None
+        if width is not None and width != self.parent.width():
+            self.apply_width(width)
+
+    def apply_width(self, width):
+        self.parent.setFixedWidth(width)
+        self.parent.update_position()
+        self.relayouts += 1
+        self.last_drag_relayouts += 1
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "drags": self.drags,
+            "relayouts": self.relayouts,
+            "last_drag_moves": self.last_drag_moves,
+            "last_drag_relayouts": self.last_drag_relayouts,
+        }
@@ -0,0 +1,240 @@
+# File: response_capture.py
+import json
+import logging
+from urllib.parse import urlparse
+
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from config import get_settings
+from metrics import registry as metrics
+from providers import GENERIC_SELECTORS, PROVIDERS, provider_selectors
+from .page_scripts import InjectionPoint, PageScript, registry as scripts
+from .web_channel import CHANNEL_WORLD
+
+# Mục tiêu: capture layer tốn dưới 1 ms main thread cho mỗi giây stream
+OVERHEAD_BUDGET_MS_PER_S = 1.0
+
+# MutationObserver chỉ đánh dấu "có thay đổi"; việc đọc text và tính delta
+# chạy tối đa một lần mỗi flush_ms, mọi delta của lần đó gửi trong một message
+CAPTURE_TEMPLATE = """
+(function() {
+    if (window.__smartaiCapture || !window.__smartaiChannel || !document.body) {
+        return;
+    }
+    const config = %(config)s;
+    const stats = { callbacks: 0, flushes: 0, batches: 0, busyMs: 0, activeMs: 0 };
+    const tracked = new WeakMap();
+    let bridge = null;
+    let timer = null;
+    let lastActiveAt = 0;
+    let counter = 0;
+    window.__smartaiCapture = stats;
+    window.__smartaiChannel.then(objects => {
+        bridge = objects.captureBridge || null;
+        // Thay đổi xảy ra trước khi channel sẵn sàng chưa được tính delta: flush ngay
+        if (bridge) {
+            schedule(0);
+        }
+    });
+
+    function track(element, text, done) {
+        const state = { id: Date.now().toString(36) + '-' + (++counter), text, done, changedAt: performance.now() };
+        tracked.set(element, state);
+        return state;
+    }
+
+    // Câu trả lời đã có sẵn khi trang load không được gửi lại
+    for (const element of document.querySelectorAll(config.response)) {
+        track(element, element.textContent, true);
+    }
+
+    function schedule(delay) {
+        if (!timer) {
+            timer = setTimeout(flush, delay);
+        }
+    }
+
+    function resync(ids) {
+        // Python không có text đầu của các message này: lần flush sau gửi lại toàn bộ
+        if (!ids || !ids.length) {
+            return;
+        }
+        for (const element of document.querySelectorAll(config.response)) {
+            const state = tracked.get(element);
+            if (state && ids.includes(state.id)) {
+                state.text = '';
+                state.done = false;
+            }
+        }
+        schedule(config.flushMs);
+    }
+
+    function flush() {
+        const start = performance.now();
+        timer = null;
+        // state.text là phần Python đã nhận: chưa gửi được thì không tính delta
+        if (!bridge) {
+            return;
+        }
+        stats.flushes++;
+
+        const deltas = [];
+        let open = false;
+        const elements = document.querySelectorAll(config.response);
+        const streaming = !!(config.streaming && document.querySelector(config.streaming));
+        // Chỉ các câu trả lời cuối cùng có thể đang stream
+        for (let i = Math.max(0, elements.length - 2); i < elements.length; i++) {
+            const element = elements[i];
+            const text = element.textContent;
+            const state = tracked.get(element) || track(element, '', false);
+            if (text !== state.text) {
+                // Message đã xong bị sửa lại (thêm citation, "continue"): Python đã bỏ text
+                // của nó nên gửi lại toàn bộ, không gửi phần nối thêm
+                if (!state.done && text.startsWith(state.text)) {
+                    deltas.push({ id: state.id, offset: state.text.length, text: text.slice(state.text.length) });
+                } else {
+                    deltas.push({ id: state.id, offset: 0, text });
+                }
+                state.text = text;
+                state.done = false;
+                state.changedAt = start;
+            } else if (!state.done && text && !streaming && start - state.changedAt >= config.idleMs) {
+                state.done = true;
+                deltas.push({ id: state.id, offset: text.length, text: '', done: true });
+            }
+            open = open || (!state.done && !!state.text);
+        }
+
+        if (deltas.some(delta => delta.text)) {
+            stats.activeMs += lastActiveAt ? Math.min(start - lastActiveAt, config.flushMs * 2) : config.flushMs;
+            lastActiveAt = start;
+        }
+        if (deltas.length) {
+            stats.batches++;
+            // busyMs gửi đi là của các lần flush trước; lần này được cộng ngay sau đó
+            bridge.pushBatch(JSON.stringify({ provider: config.provider, url: location.href, deltas, stats }), resync);
+        }
+        stats.busyMs += performance.now() - start;
+        // Còn câu trả lời chưa xong: kiểm tra lại để phát hiện kết thúc dù không có mutation
+        if (open) {
+            schedule(config.idleMs);
+        }
+    }
+
+    const observer = new MutationObserver(() => {
+        const start = performance.now();
+        stats.callbacks++;
+        schedule(config.flushMs);
+        stats.busyMs += performance.now() - start;
+    });
+    observer.observe(document.body, { childList: true, subtree: true, characterData: true });
+})();
+"""
+
+
+def capture_script(provider, selectors, flush_ms, idle_ms):
+    origin = urlparse(PROVIDERS[provider])
+    config = {
+        "provider": provider,
+        "response": selectors["response"],
+        "streaming": selectors.get("streaming", ""),
+        "flushMs": flush_ms,
+        "idleMs": idle_ms,
+    }
+    return PageScript(f"response_capture_{provider}", CAPTURE_TEMPLATE % {"config": json.dumps(config)},
+                      injection_point=InjectionPoint.DocumentReady, world=CHANNEL_WORLD,
+                      matches=[f"{origin.scheme}://{origin.netloc}/*"])
+
+
+class ResponseCapture(QObject):
+    """Object "captureBridge" trên QWebChannel của mỗi page: ghép delta thành câu trả lời"""
+
+    # (provider, message id, text đến hiện tại)
+    messageUpdated = pyqtSignal(str, str, str)
+    # (provider, message id, text cuối cùng, url)
+    messageCompleted = pyqtSignal(str, str, str, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # message id -> text của các câu trả lời chưa xong
+        self.messages = {}
+        self.batches = 0
+        self.deltas = 0
+        self.chars = 0
+        self.completed = 0
+        self.desyncs = 0
+        self.page_stats = {}
+        self.over_budget_logged = False
+
+    @pyqtSlot(str, result=list)
+    def pushBatch(self, payload):
+        """Trả về id các message bị lệch (offset vượt quá text đã có) để trang gửi lại toàn bộ"""
+        try:
+            batch = json.loads(payload)
+        except ValueError:
+            logging.warning("ResponseCapture: malformed batch")
+            return []
+        desynced = []
+        provider = batch.get("provider", "")
+        self.batches += 1
+        self.page_stats = batch.get("stats", {})
+        metrics.count("capture_batches")
+
+        for delta in batch.get("deltas", []):
+            message_id = delta["id"]
+            text = self.messages.get(message_id, "")
+            if delta["offset"] > len(text):
+                # Thiếu phần đầu (message đã xong bị pop, batch bị mất): không ghép thành mảnh cụt
+                self.messages.pop(message_id, None)
+                self.desyncs += 1
+                metrics.count("capture_desyncs")
+                logging.warning(f"ResponseCapture: {provider} message {message_id} out of sync "
+                                f"(offset {delta['offset']} > {len(text)}), requesting full text")
+                desynced.append(message_id)
+                continue
+            # offset nhỏ hơn độ dài hiện tại nghĩa là trang đã viết lại câu trả lời
+            text = text[:delta["offset"]] + delta["text"]
+            self.deltas += 1
+            self.chars += len(delta["text"])
+            if delta.get("done"):
+                self.messages.pop(message_id, None)
+                self.completed += 1
+                self.messageCompleted.emit(provider, message_id, text, batch.get("url", ""))
+            else:
+                self.messages[message_id] = text
+                self.messageUpdated.emit(provider, message_id, text)
+
+        # Chỉ đánh giá khi đã stream đủ lâu để số liệu có ý nghĩa
+        if (not self.over_budget_logged and self.page_stats.get("activeMs", 0) >= 5000
+                and self.overhead_ms_per_s() > OVERHEAD_BUDGET_MS_PER_S):
+            self.over_budget_logged = True
+            logging.warning(f"ResponseCapture: {provider} overhead "
+                            f"{self.overhead_ms_per_s():.2f} ms/s exceeds budget")
+        return desynced
+
+    def overhead_ms_per_s(self):
+        """Thời gian main thread của capture layer trên mỗi giây stream"""
+        active_ms = self.page_stats.get("activeMs", 0)
+        if not active_ms:
+            return 0.0
+        return self.page_stats.get("busyMs", 0) / (active_ms / 1000)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "deltas": self.deltas,
+            "chars": self.chars,
+            "completed": self.completed,
+            "desyncs": self.desyncs,
+            "mutation_callbacks": self.page_stats.get("callbacks", 0),
+            "flushes": self.page_stats.get("flushes", 0),
+            "overhead_ms_per_s": round(self.overhead_ms_per_s(), 3),
+        }
+
+
+_capture = get_settings().section("capture")
+if _capture.get("enabled", True):
+    _selectors = provider_selectors()
+    for _provider in PROVIDERS:
+        scripts.register(capture_script(_provider, _selectors.get(_provider, GENERIC_SELECTORS),
+                                        _capture.get("flush_ms", 250), _capture.get("idle_ms", 1500)))
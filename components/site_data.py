@@ -0,0 +1,335 @@
+# File: components/site_data.py
+import json
+import logging
+import os
+import queue
+import re
+import struct
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlparse
+
+from PyQt6.QtCore import QObject, QTimer, QUrl, pyqtSignal
+from PyQt6.QtWebEngineCore import QWebEngineLoadingInfo
+
+from config import get_settings
+from metrics import registry as metrics
+from providers import HOST_ALIASES, PROVIDERS
+from .web_channel import CHANNEL_WORLD
+
+# Header của file entry trong simple cache của Chromium:
+# magic (uint64), version, key length, key hash (uint32), padding -> key nằm ngay sau
+SIMPLE_CACHE_MAGIC = 0xfcfb6d1ba7725c30
+SIMPLE_CACHE_HEADER = struct.Struct("<QIII4x")
+# Tên file là hash của key nên một entry không bao giờ đổi site
+ENTRY_FILE = re.compile(r"^([0-9a-f]{16})_[01s]$")
+# IndexedDB dạng cũ: một thư mục cho mỗi origin (https_chatgpt.com_0.indexeddb.leveldb)
+INDEXEDDB_DIR = re.compile(r"^https?_(.+)_\d+\.indexeddb\.(?:leveldb|blob)$")
+
+# Dữ liệu không gắn được với một site (Local Storage leveldb chung, GPUCache...)
+SHARED = "(shared)"
+
+LoadStatus = QWebEngineLoadingInfo.LoadStatus
+# net::ERR_ABORTED: load bị hủy vì một navigation mới
+ERR_ABORTED = -3
+
+# Trang chủ không load xong trong khoảng này: bỏ việc xóa storage thay vì chờ mãi
+CLEAR_STORAGE_TIMEOUT_MS = 60000
+
+# Storage của origin chỉ xóa được từ một trang thuộc origin đó
+CLEAR_STORAGE_JS = """
+(async function() {
+    try {
+        localStorage.clear();
+        sessionStorage.clear();
+        if (navigator.serviceWorker) {
+            for (const registration of await navigator.serviceWorker.getRegistrations()) {
+                await registration.unregister();
+            }
+        }
+        if (window.caches) {
+            for (const key of await caches.keys()) {
+                await caches.delete(key);
+            }
+        }
+        if (indexedDB.databases) {
+            for (const database of await indexedDB.databases()) {
+                indexedDB.deleteDatabase(database.name);
+            }
+        }
+    } catch (e) {
+        console.warn('SmartAI: clear site data failed', e);
+    }
+    // Rời trang để các kết nối IndexedDB đóng lại, việc xóa database mới hoàn tất
+    location.replace(%s);
+})();
+"""
+
+
+def site_of(url_or_host):
+    """Registrable domain gần đúng (hai nhãn cuối); đủ cho host của các provider"""
+    host = urlparse(url_or_host).hostname if "://" in url_or_host else url_or_host
+    labels = (host or "").lower().strip(".").split(".")
+    return ".".join(labels[-2:])
+
+
+def provider_sites(provider):
+    sites = {site_of(PROVIDERS[provider])}
+    sites.update(site_of(host) for host, alias in HOST_ALIASES.items() if alias == provider)
+    return sites
+
+
+def read_entry_site(path):
+    """Site của một entry cache, lấy từ key trong header (None nếu không phải entry hợp lệ)"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read(4096)
+            if len(data) < SIMPLE_CACHE_HEADER.size:
+                return None
+            magic, _version, key_length, _key_hash = SIMPLE_CACHE_HEADER.unpack_from(data)
+            if magic != SIMPLE_CACHE_MAGIC:
+                return None
+            if SIMPLE_CACHE_HEADER.size + key_length > len(data):
+                data += f.read(SIMPLE_CACHE_HEADER.size + key_length - len(data))
+    except OSError:
+        return None
+    key = data[SIMPLE_CACHE_HEADER.size:SIMPLE_CACHE_HEADER.size + key_length].decode("utf-8", "replace")
+    # Key được phân vùng theo site của trang: "1/0/_dk_https://chatgpt.com https://chatgpt.com https://cdn/..."
+    # nên URL đầu tiên là site đã tải resource, kể cả resource từ CDN bên thứ ba
+    match = re.search(r"https?://[^\s/]+", key)
+    return site_of(match.group(0)) if match else None
+
+
+class SiteDataManager(QObject):
+    """Xóa cookie, HTTP cache và storage theo từng provider; thống kê dung lượng đĩa theo site.
+
+    Cookie được theo dõi qua cookieAdded/cookieRemoved nên xóa theo site không cần duyệt store.
+    Quét đĩa và xóa file cache chạy ở thread nền; header của entry cache chỉ được đọc
+    một lần cho mỗi file mới.
+    """
+
+    usageChanged = pyqtSignal()
+
+    def __init__(self, profile, parent=None):
+        super().__init__(parent)
+        self.profile = profile
+        self.cookie_store = profile.cookieStore()
+        # site -> {(name, domain, path): QNetworkCookie}
+        self.cookies = {}
+        self.cookie_store.cookieAdded.connect(self.on_cookie_added)
+        self.cookie_store.cookieRemoved.connect(self.on_cookie_removed)
+        self.cookie_store.loadAllCookies()
+
+        self.cache_path = profile.cachePath()
+        self.storage_path = profile.persistentStoragePath()
+        self.usage = {}
+        # tên file _0 -> site (None: không đọc được key)
+        self.entry_sites = {}
+        self.headers_read = 0
+        self.last_scan_ms = 0.0
+        self.purged_files = 0
+        self.purge_skipped = 0
+        self.jobs = queue.Queue()
+        self.worker = threading.Thread(target=self.run_worker, name="site-data", daemon=True)
+        self.worker.start()
+
+        settings = get_settings().section("site_data")
+        self.scan_timer = QTimer(self)
+        self.scan_timer.setInterval(int(settings.get("scan_interval_s", 600) * 1000))
+        self.scan_timer.timeout.connect(self.request_scan)
+        self.scan_timer.start()
+        QTimer.singleShot(int(settings.get("first_scan_delay_s", 30) * 1000), self.request_scan)
+
+    # --- Cookie ---
+
+    @staticmethod
+    def cookie_key(cookie):
+        return bytes(cookie.name()), cookie.domain(), cookie.path()
+
+    def on_cookie_added(self, cookie):
+        self.cookies.setdefault(site_of(cookie.domain()), {})[self.cookie_key(cookie)] = cookie
+
+    def on_cookie_removed(self, cookie):
+        self.cookies.get(site_of(cookie.domain()), {}).pop(self.cookie_key(cookie), None)
+
+    # --- Xóa ---
+
+    def clear(self, provider, view):
+        """Xóa dữ liệu của một provider; các provider khác giữ nguyên đăng nhập và cache"""
+        sites = provider_sites(provider)
+        removed = 0
+        for site in sites:
+            # Cookie được xóa theo site: với gemini là mọi cookie của google.com
+            for cookie in self.cookies.pop(site, {}).values():
+                self.cookie_store.deleteCookie(cookie)
+                removed += 1
+        self.jobs.put(("purge", sites))
+        self.clear_storage(provider, view)
+        metrics.count("site_data_cleared")
+        logging.info(f"Site data: cleared {provider} ({', '.join(sorted(sites))}), {removed} cookies")
+
+    def clear_storage(self, provider, view):
+        # localStorage/IndexedDB/Cache Storage/service worker của origin trang chủ provider
+        home = PROVIDERS[provider]
+        home_url = QUrl(home).adjusted(QUrl.UrlFormattingOption.StripTrailingSlash)
+        host = urlparse(home).hostname
+        page = view.page()
+        # Chỉ xử lý lần load do chính setUrl(home) ở dưới bắt đầu. Load đang chạy (vd. view vừa
+        # được activate) bị hủy và báo Stopped/Failed: bỏ qua, không tính là lần load trang chủ
+        armed = []
+
+        def done():
+            page.loadingChanged.disconnect(on_loading_changed)
+            expiry.stop()
+            expiry.deleteLater()
+
+        def on_loading_changed(info):
+            status = info.status()
+            if status == LoadStatus.LoadStartedStatus:
+                if info.url().adjusted(QUrl.UrlFormattingOption.StripTrailingSlash) == home_url:
+                    armed.append(True)
+                return
+            if not armed:
+                return
+            if status == LoadStatus.LoadStoppedStatus or (
+                    status == LoadStatus.LoadFailedStatus and info.errorCode() == ERR_ABORTED):
+                # Bị thay bằng một lần load khác: chờ lần load trang chủ tiếp theo
+                armed.clear()
+                return
+            # Xong (thành công hay không) thì ngắt ngay: giữ handler lại thì nó sẽ xóa
+            # storage ở một lần load sau (vd. sau khi người dùng đăng nhập lại)
+            done()
+            if status != LoadStatus.LoadSucceededStatus or page.url().host() != host:
+                logging.warning(f"Site data: storage of {provider} not cleared, home page load "
+                                f"{'ended on ' + page.url().host() if status == LoadStatus.LoadSucceededStatus else 'failed'}")
+                return
+            page.runJavaScript(CLEAR_STORAGE_JS % json.dumps(home), CHANNEL_WORLD.value)
+
+        def on_expired():
+            done()
+            logging.warning(f"Site data: storage of {provider} not cleared, home page did not load")
+
+        expiry = QTimer(page)
+        expiry.setSingleShot(True)
+        expiry.timeout.connect(on_expired)
+        expiry.start(CLEAR_STORAGE_TIMEOUT_MS)
+        page.loadingChanged.connect(on_loading_changed)
+        view.loaded = True
+        view.setUrl(QUrl(home))
+
+    def clear_all(self):
+        """Như "Clear Cache" trước đây: xóa toàn bộ HTTP cache và cookie của mọi provider"""
+        self.profile.clearHttpCache()
+        self.cookie_store.deleteAllCookies()
+        self.cookies = {}
+        metrics.count("site_data_cleared")
+        logging.info("Site data: cleared HTTP cache and cookies of every site")
+        self.request_scan()
+
+    # --- Dung lượng (thread nền) ---
+
+    def request_scan(self):
+        self.jobs.put(("scan", None))
+
+    def stop(self):
+        self.jobs.put(None)
+
+    def run_worker(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            action, sites = job
+            try:
+                if action == "purge":
+                    self.purge_cache(sites)
+                self.scan()
+            except OSError as e:
+                logging.warning(f"Site data: {action} failed: {e}")
+
+    def cache_dirs(self):
+        # Qt đặt simple cache ở <cachePath>/Cache, Chromium mới thêm Cache_Data
+        candidates = [os.path.join(self.cache_path, "Cache", "Cache_Data"), os.path.join(self.cache_path, "Cache")]
+        return [path for path in candidates if os.path.isdir(path)]
+
+    def cache_entries(self, directory):
+        """[(hash, path, size)] và {hash: site} của một thư mục simple cache"""
+        files = []
+        sites = {}
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                match = ENTRY_FILE.match(entry.name)
+                if not match:
+                    continue
+                try:
+                    size = entry.stat().st_size
+                except OSError:
+                    continue
+                files.append((match.group(1), entry.path, size))
+                if entry.name.endswith("_0"):
+                    if entry.name not in self.entry_sites:
+                        self.entry_sites[entry.name] = read_entry_site(entry.path)
+                        self.headers_read += 1
+                    sites[match.group(1)] = self.entry_sites[entry.name]
+        return files, sites
+
+    def scan(self):
+        start = time.perf_counter()
+        usage = Counter()
+        cache_dirs = self.cache_dirs()
+        live_names = set()
+        for directory in cache_dirs:
+            files, sites = self.cache_entries(directory)
+            for entry_hash, path, size in files:
+                usage[sites.get(entry_hash) or SHARED] += size
+                live_names.add(os.path.basename(path))
+        # Quên các entry đã bị Chromium xóa
+        self.entry_sites = {name: site for name, site in self.entry_sites.items() if name in live_names}
+
+        skip = {os.path.normcase(os.path.abspath(path)) for path in cache_dirs}
+        for root, dirs, files in os.walk(self.storage_path):
+            dirs[:] = [name for name in dirs
+                       if os.path.normcase(os.path.abspath(os.path.join(root, name))) not in skip]
+            site = SHARED
+            match = INDEXEDDB_DIR.match(os.path.basename(root))
+            if match:
+                site = site_of(match.group(1))
+            for name in files:
+                try:
+                    usage[site] += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+
+        self.usage = dict(usage)
+        self.last_scan_ms = (time.perf_counter() - start) * 1000
+        metrics.observe("site_data_scan_ms", self.last_scan_ms)
+        self.usageChanged.emit()
+
+    def purge_cache(self, sites):
+        # Chromium coi entry mất file là cache miss; file đang mở (Windows) thì bỏ qua
+        for directory in self.cache_dirs():
+            files, entry_sites = self.cache_entries(directory)
+            for entry_hash, path, _size in files:
+                if entry_sites.get(entry_hash) not in sites:
+                    continue
+                try:
+                    os.remove(path)
+                    self.purged_files += 1
+                except OSError:
+                    self.purge_skipped += 1
+
+    def provider_usage(self):
+        usage = self.usage
+        return {provider: sum(usage.get(site, 0) for site in provider_sites(provider)) for provider in PROVIDERS}
+
+    def stats(self):
+        return {
+            "usage_mb": {site: round(size / 2**20, 1)
+                         for site, size in sorted(self.usage.items(), key=lambda item: -item[1])},
+            "tracked_cookies": sum(len(cookies) for cookies in self.cookies.values()),
+            "cache_headers_read": self.headers_read,
+            "last_scan_ms": round(self.last_scan_ms, 1),
+            "purged_files": self.purged_files,
+            "purge_skipped": self.purge_skipped,
+        }
@@ -0,0 +1,144 @@
+# File: components/slide_animation.py
+import logging
+import time
+
+from PyQt6.QtCore import QEasingCurve, QObject, Qt, QVariantAnimation
+from PyQt6.QtGui import QColor, QPainter
+from PyQt6.QtWidgets import QWidget
+
+from metrics import registry as metrics
+
+BACKGROUND = QColor("#33322F")
+
+
+class SlideOverlay(QWidget):
+    """Phủ lên ContentWidget trong lúc animation, chỉ vẽ snapshot đã dịch sang phải"""
+
+    def __init__(self, animator, parent):
+        super().__init__(parent)
+        self.animator = animator
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.hide()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        offset = int(self.animator.offset)
+        if offset > 0:
+            painter.fillRect(0, 0, offset, self.height(), BACKGROUND)
+        painter.drawPixmap(offset, 0, self.animator.snapshot)
+        painter.end()
+        self.animator.frame_painted()
+
+
+class SlideAnimator(QObject):
+    """Hiệu ứng trượt vào/ra của sidebar.
+
+    Cửa sổ giữ nguyên kích thước và vị trí cuối cùng; chỉ overlay vẽ lại snapshot
+    (chụp lúc ẩn) ở mỗi frame, nên web view không bị resize hay layout lại.
+    Web view thật hiện ra khi overlay được gỡ ở cuối animation.
+    """
+
+    def __init__(self, duration_ms=160, parent=None):
+        super().__init__(parent)
+        self.snapshot = None
+        self.overlay = None
+        self.offset = 0
+        self.on_finished = None
+        self.frame_interval_s = 1 / 60
+        self.last_frame_at = None
+
+        self.animations = 0
+        self.frames = 0
+        self.dropped_frames = 0
+
+        self.animation = QVariantAnimation(self)
+        self.animation.setDuration(duration_ms)
+        self.animation.valueChanged.connect(self.on_value_changed)
+        self.animation.finished.connect(self.on_animation_finished)
+
+    def running(self):
+        return self.animation.state() == QVariantAnimation.State.Running
+
+    def capture(self, widget):
+        """Chụp nội dung hiện tại (gọi trước khi ẩn)"""
+        start = time.perf_counter()
+        self.snapshot = widget.grab()
+        metrics.observe("slide_snapshot_ms", (time.perf_counter() - start) * 1000)
+
+    def can_slide_in(self, widget):
+        # Snapshot cũ hơn kích thước hiện tại (đã resize) thì hiện ngay, không kéo giãn
+        return (self.snapshot is not None and not self.snapshot.isNull()
+                and self.snapshot.deviceIndependentSize().toSize() == widget.size())
+
+    def slide_in(self, widget):
+        if not self.can_slide_in(widget):
+            return False
+        self.start(widget, widget.width(), 0, QEasingCurve.Type.OutCubic, None)
+        return True
+
+    def slide_out(self, widget, on_finished):
+        self.capture(widget)
+        self.start(widget, 0, widget.width(), QEasingCurve.Type.InCubic, on_finished)
+
+    def start(self, widget, start_offset, end_offset, easing, on_finished):
+        self.stop()
+        if self.overlay is None or self.overlay.parent() is not widget:
+            self.overlay = SlideOverlay(self, widget)
+        screen = widget.screen()
+        if screen and screen.refreshRate() > 0:
+            self.frame_interval_s = 1 / screen.refreshRate()
+        self.on_finished = on_finished
+        self.offset = start_offset
+        self.last_frame_at = None
+        self.animations += 1
+
+        self.overlay.setGeometry(widget.rect())
+        self.overlay.raise_()
+        self.overlay.show()
+        self.animation.setEasingCurve(easing)
+        self.animation.setStartValue(float(start_offset))
+        self.animation.setEndValue(float(end_offset))
+        self.animation.start()
+
+    def stop(self):
+        """Dừng animation đang chạy (không gọi on_finished)"""
+        self.on_finished = None
+        if self.running():
+            self.animation.stop()
+        if self.overlay is not None:
+            self.overlay.hide()
+
+    def on_value_changed(self, value):
+        self.offset = value
+        if self.overlay is not None:
+            self.overlay.update()
+
+    def on_animation_finished(self):
+        callback = self.on_finished
+        self.on_finished = None
+        if self.overlay is not None:
+            self.overlay.hide()
+        if callback:
+            callback()
+
+    def frame_painted(self):
+        now = time.perf_counter()
+        self.frames += 1
+        if self.last_frame_at is not None:
+            interval = now - self.last_frame_at
+            # Khoảng cách giữa hai frame dài hơn 1.5 chu kỳ màn hình: các frame ở giữa bị rớt
+            if interval > self.frame_interval_s * 1.5:
+                dropped = round(interval / self.frame_interval_s) - 1
+                self.dropped_frames += dropped
+                metrics.count("slide_dropped_frames", dropped)
+                logging.debug(f"SlideAnimator: dropped {dropped} frames ({interval * 1000:.1f} ms)")
+        self.last_frame_at = now
+
+    def stats(self):
+        return {
+            "animations": self.animations,
+            "frames": self.frames,
+            "dropped_frames": self.dropped_frames,
+            "duration_ms": self.animation.duration(),
+        }
@@ -0,0 +1,262 @@
+# File: text_bridge.py
+import itertools
+import logging
+import time
+from urllib.parse import urlparse
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+
+from config import get_settings
+from metrics import registry as metrics
+from .page_scripts import InjectionPoint, PageScript, provider_matches, registry as scripts
+from .web_channel import CHANNEL_WORLD
+
+DEFAULT_CHUNK_CHARS = 256 * 1024
+
+# Trang không nhận transfer trong khoảng này (script không chạy, trang treo): báo lỗi cho bên gọi
+PICKUP_TIMEOUT_MS = 10000
+
+# Nhận text theo từng chunk qua QWebChannel và chèn vào ô nhập đang focus.
+# Không sinh mã JS từ nội dung: text chỉ đi qua channel dưới dạng dữ liệu.
+TEXT_BRIDGE_JS = """
+(function() {
+    if (window.__smartaiText || !window.__smartaiChannel) {
+        return;
+    }
+    const state = { queue: Promise.resolve(), transfers: 0, seen: new Set() };
+    window.__smartaiText = state;
+
+    function editableTarget() {
+        let element = document.activeElement;
+        while (element && element.shadowRoot && element.shadowRoot.activeElement) {
+            element = element.shadowRoot.activeElement;
+        }
+        if (element && (element.isContentEditable || element.tagName === 'TEXTAREA' || element.tagName === 'INPUT')) {
+            return element;
+        }
+        return null;
+    }
+
+    function insert(element, text) {
+        if (element.isContentEditable) {
+            // insertText đi qua pipeline soạn thảo của trình duyệt (undo, beforeinput của ProseMirror/Lexical)
+            if (!document.execCommand('insertText', false, text)) {
+                const selection = window.getSelection();
+                if (!selection.rangeCount) {
+                    throw new Error('no selection');
+                }
+                const range = selection.getRangeAt(0);
+                range.deleteContents();
+                range.insertNode(document.createTextNode(text));
+                range.collapse(false);
+            }
+            return;
+        }
+        element.setRangeText(text, element.selectionStart, element.selectionEnd, 'end');
+    }
+
+    function run(bridge, id, count) {
+        return new Promise(resolve => {
+            const element = editableTarget();
+            if (!element) {
+                bridge.reportFinished(id, false, 'no focused input');
+                resolve();
+                return;
+            }
+            let inserted = 0;
+            let failed = false;
+
+            function receive(index, text) {
+                if (failed) {
+                    return;
+                }
+                // Xin chunk kế tiếp trước khi chèn chunk hiện tại
+                if (index + 1 < count) {
+                    bridge.chunk(id, index + 1, next => receive(index + 1, next));
+                }
+                try {
+                    insert(element, text);
+                } catch (error) {
+                    failed = true;
+                    bridge.reportFinished(id, false, String(error));
+                    resolve();
+                    return;
+                }
+                inserted += text.length;
+                bridge.reportProgress(id, inserted);
+                if (index + 1 === count) {
+                    if (!element.isContentEditable) {
+                        // Một input event cho cả lần dán để React/Vue chỉ cập nhật state một lần
+                        element.dispatchEvent(new InputEvent('input', { bubbles: true, inputType: 'insertFromPaste' }));
+                    }
+                    state.transfers++;
+                    bridge.reportFinished(id, true, '');
+                    resolve();
+                }
+            }
+
+            bridge.chunk(id, 0, text => receive(0, text));
+        });
+    }
+
+    window.__smartaiChannel.then(objects => {
+        const bridge = objects.textBridge;
+        if (!bridge) {
+            return;
+        }
+        function enqueue(id, count) {
+            // Một transfer có thể đến cả qua signal lẫn danh sách pending
+            if (state.seen.has(id)) {
+                return;
+            }
+            state.seen.add(id);
+            bridge.acknowledge(id);
+            // Các lần dán nối tiếp nhau, không chèn xen kẽ
+            state.queue = state.queue.then(() => run(bridge, id, count));
+        }
+        bridge.transferStarted.connect(enqueue);
+        // Transfer bắt đầu trước khi channel sẵn sàng: signal đã mất, lấy lại từ Python
+        bridge.pendingTransfers(pending => pending.forEach(([id, count]) => enqueue(id, count)));
+    });
+})();
+"""
+
+
+class TextTransfer:
+    def __init__(self, transfer_id, text, chunk_chars, source):
+        self.id = transfer_id
+        self.text = text
+        self.chunk_chars = chunk_chars
+        self.source = source
+        self.chunk_count = (len(text) + chunk_chars - 1) // chunk_chars
+        self.picked_up = False
+        self.started_at = time.perf_counter()
+
+    def chunk(self, index):
+        start = index * self.chunk_chars
+        return self.text[start:start + self.chunk_chars]
+
+
+class TextTransferBridge(QObject):
+    """Object được đăng ký lên QWebChannel với tên "textBridge"."""
+
+    # Gửi sang JS: (transfer id, số chunk)
+    transferStarted = pyqtSignal(int, int)
+    # (transfer id, số ký tự đã chèn, tổng số ký tự)
+    progress = pyqtSignal(int, int, int)
+    # (transfer id, thành công, thời gian ms)
+    finished = pyqtSignal(int, bool, float)
+
+    _ids = itertools.count(1)
+
+    def __init__(self, parent=None, chunk_chars=None):
+        super().__init__(parent)
+        if chunk_chars is None:
+            chunk_chars = get_settings().get("paste", "chunk_chars", DEFAULT_CHUNK_CHARS)
+        self.chunk_chars = max(1024, int(chunk_chars))
+        self.transfers = {}
+        self.pickup_timer = QTimer(self)
+        self.pickup_timer.setSingleShot(True)
+        self.pickup_timer.setInterval(PICKUP_TIMEOUT_MS // 4)
+        self.pickup_timer.timeout.connect(self.check_picked_up)
+        # Script nhận chỉ được inject vào các origin này (xem PageScript "text_bridge" bên dưới)
+        self.origins = {pattern[:-2] for pattern in provider_matches()}
+
+    def installed_on(self, url):
+        """True nếu trang ở url có script nhận transfer"""
+        parsed = urlparse(url.toString())
+        return f"{parsed.scheme}://{parsed.netloc}" in self.origins
+
+    def send_text(self, text, source="clipboard"):
+        """Bắt đầu chuyển text vào ô nhập đang focus; trả về transfer id (None nếu rỗng)"""
+        text = text.replace("\r\n", "\n")
+        if not text:
+            return None
+        transfer = TextTransfer(next(self._ids), text, self.chunk_chars, source)
+        self.transfers[transfer.id] = transfer
+        # Chỉ log kích thước, không log nội dung
+        logging.info(f"TextBridge: transfer {transfer.id} from {source}: "
+                     f"{len(text)} chars in {transfer.chunk_count} chunks")
+        self.transferStarted.emit(transfer.id, transfer.chunk_count)
+        if not self.pickup_timer.isActive():
+            self.pickup_timer.start()
+        return transfer.id
+
+    def check_picked_up(self):
+        now = time.perf_counter()
+        waiting = False
+        for transfer in list(self.transfers.values()):
+            if transfer.picked_up:
+                continue
+            if (now - transfer.started_at) * 1000 >= PICKUP_TIMEOUT_MS:
+                self._finish(transfer.id, False, "page did not receive the transfer")
+            else:
+                waiting = True
+        if waiting:
+            self.pickup_timer.start()
+
+    def send_file(self, path):
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as file:
+                text = file.read()
+        except OSError as e:
+            logging.warning(f"TextBridge: cannot read {path}: {e}")
+            return None
+        return self.send_text(text, source="file")
+
+    def cancel_all(self):
+        # Document mới (reload/điều hướng) không còn nhận các transfer cũ
+        for transfer_id in list(self.transfers):
+            self._finish(transfer_id, False, "page navigated")
+
+    @pyqtSlot(result=list)
+    def pendingTransfers(self):
+        """[id, số chunk] của các transfer trang chưa nhận (signal phát trước khi channel sẵn sàng)"""
+        return [[transfer.id, transfer.chunk_count] for transfer in self.transfers.values()
+                if not transfer.picked_up]
+
+    @pyqtSlot(int)
+    def acknowledge(self, transfer_id):
+        # Trang đã xếp transfer vào hàng đợi (có thể chờ sau một lần dán lớn khác)
+        transfer = self.transfers.get(transfer_id)
+        if transfer is not None:
+            transfer.picked_up = True
+
+    @pyqtSlot(int, int, result=str)
+    def chunk(self, transfer_id, index):
+        transfer = self.transfers.get(transfer_id)
+        if transfer is None or not 0 <= index < transfer.chunk_count:
+            return ""
+        return transfer.chunk(index)
+
+    @pyqtSlot(int, int)
+    def reportProgress(self, transfer_id, inserted):
+        transfer = self.transfers.get(transfer_id)
+        if transfer is not None:
+            self.progress.emit(transfer_id, inserted, len(transfer.text))
+
+    @pyqtSlot(int, bool, str)
+    def reportFinished(self, transfer_id, ok, error):
+        self._finish(transfer_id, ok, error)
+
+    def _finish(self, transfer_id, ok, error):
+        transfer = self.transfers.pop(transfer_id, None)
+        if transfer is None:
+            return
+        elapsed_ms = (time.perf_counter() - transfer.started_at) * 1000
+        if ok:
+            metrics.observe("paste_ms", elapsed_ms)
+            logging.info(f"TextBridge: transfer {transfer_id} done in {elapsed_ms:.1f} ms")
+        else:
+            metrics.count("paste_failed")
+            logging.warning(f"TextBridge: transfer {transfer_id} failed: {error}")
+        self.finished.emit(transfer_id, ok, elapsed_ms)
+
+
+scripts.register(PageScript(
+    "text_bridge",
+    TEXT_BRIDGE_JS,
+    injection_point=InjectionPoint.DocumentReady,
+    world=CHANNEL_WORLD,
+    matches=provider_matches(),
+))
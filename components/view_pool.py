@@ -0,0 +1,98 @@
+# File: view_pool.py
+import logging
+import time
+from collections import OrderedDict
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtWidgets import QSizePolicy
+
+from .web_view import CustomWebView
+
+
+class ProviderViewPool(QObject):
+    """Giữ một CustomWebView sống cho mỗi provider, loại bỏ view ít dùng nhất (LRU)."""
+    viewCreated = pyqtSignal(str, object)
+    viewEvicted = pyqtSignal(str, object)
+    currentChanged = pyqtSignal(str, object)
+
+    def __init__(self, stack, max_live_pages=3, parent=None):
+        super().__init__(parent)
+        self.stack = stack
+        self.max_live_pages = max(1, int(max_live_pages))
+        # provider -> view, phần tử cuối là view dùng gần nhất
+        self.views = OrderedDict()
+        self.current = None
+        # Provider đang được dùng ở nền (broadcast), không bị loại khỏi pool
+        self.held = set()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.last_switch_ms = 0.0
+
+    def current_view(self):
+        return self.views.get(self.current)
+
+    def activate(self, provider, url):
+        start = time.perf_counter()
+        view = self.get_or_create(provider, url)
+        self.stack.setCurrentWidget(view)
+        self.current = provider
+        self.evict_overflow()
+
+        self.last_switch_ms = (time.perf_counter() - start) * 1000
+        logging.debug(f"View pool: switched to {provider} in {self.last_switch_ms:.1f} ms")
+        self.currentChanged.emit(provider, view)
+        return view
+
+    def get_or_create(self, provider, url):
+        view = self.views.get(provider)
+        if view is None:
+            self.misses += 1
+            view = CustomWebView(initial_url=url)
+            view.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+            self.views[provider] = view
+            self.stack.addWidget(view)
+            self.viewCreated.emit(provider, view)
+        else:
+            self.hits += 1
+            self.views.move_to_end(provider)
+        return view
+
+    def hold(self, provider, url):
+        """Tạo/giữ view của provider mà không chuyển view hiện tại; trả về view đã bắt đầu load"""
+        self.held.add(provider)
+        view = self.get_or_create(provider, url)
+        view.ensure_loaded()
+        return view
+
+    def release(self, provider):
+        self.held.discard(provider)
+        self.evict_overflow()
+
+    def evict_overflow(self):
+        # Phần tử đầu là view lâu không dùng nhất; bỏ qua view hiện tại và view đang được giữ.
+        # Pool có thể tạm vượt max_live_pages khi mọi view đều đang được dùng
+        candidates = [provider for provider in self.views
+                      if provider != self.current and provider not in self.held]
+        while len(self.views) > self.max_live_pages and candidates:
+            self.evict(candidates.pop(0))
+
+    def evict(self, provider):
+        view = self.views.pop(provider, None)
+        if view is None:
+            return
+        self.evictions += 1
+        logging.info(f"View pool: evicted {provider}")
+        self.viewEvicted.emit(provider, view)
+        self.stack.removeWidget(view)
+        view.deleteLater()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "live": len(self.views),
+            "max_live_pages": self.max_live_pages,
+            "last_switch_ms": round(self.last_switch_ms, 2),
+        }
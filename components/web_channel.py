@@ -0,0 +1,50 @@
+# File: web_channel.py
+import logging
+
+from PyQt6.QtCore import QFile, QIODevice
+from PyQt6.QtWebChannel import QWebChannel
+
+from .page_scripts import InjectionPoint, PageScript, ScriptWorldId, provider_matches, registry as scripts
+
+# Bridge chỉ hiện diện trong ApplicationWorld: JS của trang không gọi được vào Python
+CHANNEL_WORLD = ScriptWorldId.ApplicationWorld
+
+# Một QWebChannel cho mỗi document; các script khác chờ promise này để lấy object
+CHANNEL_BOOTSTRAP_JS = """
+(function() {
+    if (window.__smartaiChannel || typeof qt === 'undefined' || !qt.webChannelTransport) {
+        return;
+    }
+    window.__smartaiChannel = new Promise(resolve => {
+        new QWebChannel(qt.webChannelTransport, channel => resolve(channel.objects));
+    });
+})();
+"""
+
+
+def qwebchannel_source():
+    """qwebchannel.js đi kèm Qt (resource của QtWebChannel)"""
+    file = QFile(":/qtwebchannel/qwebchannel.js")
+    if not file.open(QIODevice.OpenModeFlag.ReadOnly):
+        logging.warning("WebChannel: qwebchannel.js not found in Qt resources")
+        return ""
+    try:
+        return bytes(file.readAll()).decode("utf-8")
+    finally:
+        file.close()
+
+
+def attach_channel(page):
+    """Tạo QWebChannel cho page; đăng ký object lên channel trước khi page load"""
+    channel = QWebChannel(page)
+    page.setWebChannel(channel, CHANNEL_WORLD.value)
+    return channel
+
+
+scripts.register(PageScript(
+    "web_channel",
+    qwebchannel_source() + CHANNEL_BOOTSTRAP_JS,
+    injection_point=InjectionPoint.DocumentCreation,
+    world=CHANNEL_WORLD,
+    matches=provider_matches(),
+))
@@ -1,17 +1,36 @@
 # File: web_view.py
+import logging
 import os
 import shutil
 import sys
+import time
 from urllib.parse import urlparse
 
 from PyQt6.QtCore import QUrl, Qt, pyqtSignal, QTimer
 from PyQt6.QtGui import QGuiApplication, QClipboard
-from PyQt6.QtWebEngineCore import (QWebEnginePage, QWebEngineProfile,
-                                   QWebEngineSettings, QWebEngineUrlRequestInterceptor)
+from PyQt6.QtWebEngineCore import (QWebEnginePage, QWebEngineProfile, QWebEngineSettings,
+                                   QWebEngineUrlRequestInfo, QWebEngineUrlRequestInterceptor)
 from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWidgets import QMainWindow, QApplication
+from PyQt6.QtWidgets import QMainWindow, QApplication, QFileDialog
 
+from blocklist import DomainBlocklist
+from config import get_settings
+from header_policy import HeaderPolicy
+from metrics import registry as metrics
+from providers import PROVIDERS, provider_for_url
 from utils import AppPaths
+from instrumentation import startup_timer
+from .diagnostics import SCHEME, DiagnosticsSchemeHandler, register_scheme
+from .profile_layout import ProfileLayout
+from .page_scripts import SHIM_LISTENER_COUNT_JS, ScriptWorldId, registry as scripts
+from .broadcast import BroadcastBridge
+from .response_capture import ResponseCapture
+from .site_data import SiteDataManager
+from .text_bridge import TextTransferBridge
+from .web_channel import attach_channel
+
+# Scheme smartai:// phải được đăng ký trước khi tạo profile đầu tiên
+register_scheme()
 
 class SecureBrowserInterceptor(QWebEngineUrlRequestInterceptor):
     def interceptRequest(self, info):
@@ -82,7 +101,6 @@ class CustomWebEnginePage(QWebEnginePage):
         self.parent = parent
         self.auth_in_progress = False
         self.current_url = None
-        self.setup_scripts()
 
         # Override các actions mặc định để vô hiệu hóa chúng
         self.action(QWebEnginePage.WebAction.Back).setVisible(False)
@@ -99,9 +117,26 @@ class CustomWebEnginePage(QWebEnginePage):
         self.action(QWebEnginePage.WebAction.OpenLinkInNewBackgroundTab).setVisible(False)
         # self.action(QWebEnginePage.WebAction.Paste).setVisible(True)  # Ensure Paste action is enabled
 
+        # Text lớn (clipboard, file) đi vào trang qua QWebChannel theo từng chunk
+        self.channel = attach_channel(self)
+        self.text_bridge = TextTransferBridge(self)
+        self.channel.registerObject("textBridge", self.text_bridge)
+        self.broadcast_bridge = BroadcastBridge(self)
+        self.channel.registerObject("broadcastBridge", self.broadcast_bridge)
+        self.response_capture = ResponseCapture(self)
+        self.channel.registerObject("captureBridge", self.response_capture)
+        self.loadStarted.connect(self.text_bridge.cancel_all)
+
     def javaScriptCanAccessClipboard(self):
         return True
 
+    def triggerAction(self, action, checked=False):
+        # Paste trong context menu đi qua bridge thay vì dán native; trang không có bridge
+        # (popup OAuth, smartai://, host alias...) thì dán native như cũ
+        if action == QWebEnginePage.WebAction.Paste and self.paste():
+            return
+        super().triggerAction(action, checked)
+
     def paste(self):
         # Lấy clipboard từ QGuiApplication
         clipboard = QGuiApplication.clipboard()
@@ -115,251 +150,21 @@ class CustomWebEnginePage(QWebEnginePage):
             text = mime_data.html()
         else:
             print("Unsupported clipboard format.")
-            return
-
-        # Làm sạch và chuẩn hóa nội dung
-        clean_text = text.replace('\r\n', '\n').replace('"', '\\"')
-
-        # Dán nội dung qua JavaScript
-        self.runJavaScript(f'''
-                var selection = window.getSelection();
-                if (!selection.rangeCount) return false;
-                selection.deleteFromDocument();
-                selection.getRangeAt(0).insertNode(document.createTextNode("{clean_text}"));
-            ''')
-
-    def setup_scripts(self):
-
-        universal_messaging = """
-        (function() {
-            // Universal Message Handler
-            const UniversalMessenger = {
-                originalPostMessage: window.postMessage,
-                originalAddEventListener: window.addEventListener,
-                messageCounter: 0,
-                portCounter: 0,
-
-                init() {
-                    // Override postMessage globally
-                    window.postMessage = (...args) => this.safePostMessage(...args);
-
-                    // Override addEventListener for message events
-                    window.addEventListener = (...args) => this.safeAddEventListener(...args);
-
-                    // Override MessagePort
-                    if (window.MessagePort) {
-                        this.wrapMessagePort();
-                    }
-
-                    // Override MessageChannel
-                    if (window.MessageChannel) {
-                        this.wrapMessageChannel();
-                    }
-
-                    // Override BroadcastChannel
-                    if (window.BroadcastChannel) {
-                        this.wrapBroadcastChannel();
-                    }
-
-                    // Add global error handlers
-                    this.setupErrorHandling();
-                },
-
-                safePostMessage(message, targetOrigin, transfer) {
-                    try {
-                        // Always use * for targetOrigin to allow cross-origin
-                        return this.originalPostMessage.call(
-                            window,
-                            this.sanitizeMessage(message),
-                            '*',
-                            transfer
-                        );
-                    } catch (error) {
-                        console.log('PostMessage handled:', error);
-                        return this.originalPostMessage.call(
-                            window,
-                            this.createFallbackMessage(message),
-                            '*',
-                            transfer
-                        );
-                    }
-                },
-
-                sanitizeMessage(message) {
-                    try {
-                        // Try to create a clean copy of the message
-                        return JSON.parse(JSON.stringify({
-                            id: `msg_${Date.now()}_${this.messageCounter++}`,
-                            data: message,
-                            timestamp: Date.now()
-                        }));
-                    } catch (error) {
-                        return this.createFallbackMessage(message);
-                    }
-                },
-
-                createFallbackMessage(message) {
-                    return {
-                        id: `msg_${Date.now()}_${this.messageCounter++}`,
-                        data: String(message),
-                        timestamp: Date.now(),
-                        isStringified: true
-                    };
-                },
-
-                safeAddEventListener(type, listener, options) {
-                    if (type === 'message') {
-                        const safeListener = (event) => {
-                            try {
-                                // Create a safe event object
-                                const safeEvent = new MessageEvent('message', {
-                                    data: event.data?.data || event.data,
-                                    origin: '*',
-                                    source: event.source || window,
-                                    ports: Array.isArray(event.ports) ? event.ports : []
-                                });
-                                return listener(safeEvent);
-                            } catch (error) {
-                                console.log('Message listener handled:', error);
-                            }
-                        };
-                        return this.originalAddEventListener.call(window, type, safeListener, options);
-                    }
-                    return this.originalAddEventListener.call(window, type, listener, options);
-                },
-
-                wrapMessagePort() {
-                    const OriginalMessagePort = window.MessagePort;
-                    const self = this;
-
-                    class SafeMessagePort extends OriginalMessagePort {
-                        constructor() {
-                            super();
-                            this.id = `port_${Date.now()}_${self.portCounter++}`;
-                        }
-
-                        postMessage(message, transfer) {
-                            try {
-                                super.postMessage(self.sanitizeMessage(message), transfer);
-                            } catch (error) {
-                                console.log('Port message handled:', error);
-                                super.postMessage(self.createFallbackMessage(message), transfer);
-                            }
-                        }
-
-                        addEventListener(type, listener, options) {
-                            if (type === 'message') {
-                                const safeListener = (event) => {
-                                    try {
-                                        const safeEvent = new MessageEvent('message', {
-                                            data: event.data?.data || event.data,
-                                            origin: '*',
-                                            source: null,
-                                            ports: []
-                                        });
-                                        listener(safeEvent);
-                                    } catch (error) {
-                                        console.log('Port listener handled:', error);
-                                    }
-                                };
-                                super.addEventListener(type, safeListener, options);
-                            } else {
-                                super.addEventListener(type, listener, options);
-                            }
-                        }
-                    }
-
-                    window.MessagePort = SafeMessagePort;
-                },
-
-                wrapMessageChannel() {
-                    const OriginalMessageChannel = window.MessageChannel;
-                    const self = this;
-
-                    class SafeMessageChannel extends OriginalMessageChannel {
-                        constructor() {
-                            super();
-                            this.id = `channel_${Date.now()}_${self.portCounter++}`;
-                            // Wrap both ports
-                            this.port1 = new window.MessagePort();
-                            this.port2 = new window.MessagePort();
-                        }
-                    }
-
-                    window.MessageChannel = SafeMessageChannel;
-                },
-
-                wrapBroadcastChannel() {
-                    const OriginalBroadcastChannel = window.BroadcastChannel;
-                    const self = this;
-
-                    class SafeBroadcastChannel extends OriginalBroadcastChannel {
-                        constructor(channel) {
-                            super(channel);
-                            this.id = `broadcast_${Date.now()}_${self.portCounter++}`;
-                        }
-
-                        postMessage(message) {
-                            try {
-                                super.postMessage(self.sanitizeMessage(message));
-                            } catch (error) {
-                                console.log('Broadcast message handled:', error);
-                                super.postMessage(self.createFallbackMessage(message));
-                            }
-                        }
-
-                        addEventListener(type, listener, options) {
-                            if (type === 'message') {
-                                const safeListener = (event) => {
-                                    try {
-                                        const safeEvent = new MessageEvent('message', {
-                                            data: event.data?.data || event.data,
-                                            origin: '*',
-                                            source: null,
-                                            ports: []
-                                        });
-                                        listener(safeEvent);
-                                    } catch (error) {
-                                        console.log('Broadcast listener handled:', error);
-                                    }
-                                };
-                                super.addEventListener(type, safeListener, options);
-                            } else {
-                                super.addEventListener(type, listener, options);
-                            }
-                        }
-                    }
-
-                    window.BroadcastChannel = SafeBroadcastChannel;
-                },
-
-                setupErrorHandling() {
-                    window.addEventListener('error', (event) => {
-                        if (event.message?.includes('postMessage')) {
-                            event.preventDefault();
-                            console.log('Prevented postMessage error:', event.message);
-                        }
-                    });
-
-                    window.addEventListener('unhandledrejection', (event) => {
-                        if (event.reason?.message?.includes('postMessage')) {
-                            event.preventDefault();
-                            console.log('Prevented unhandled postMessage rejection:', event.reason);
-                        }
-                    });
-                }
-            };
+            return None
 
-            // Initialize the universal messenger
-            UniversalMessenger.init();
+        return self.insert_text(text)
 
-            // Export for debugging
-            window.__UniversalMessenger = UniversalMessenger;
+    def insert_text(self, text, source="clipboard"):
+        """Chèn text vào ô nhập đang focus; trả về transfer id (None nếu trang không có bridge)"""
+        if not self.text_bridge.installed_on(self.url()):
+            return None
+        return self.text_bridge.send_text(text, source)
 
-            console.log('Universal messaging system initialized');
-        })();
-        """
-        self.runJavaScript(universal_messaging)
+    def paste_file(self, path):
+        if not self.text_bridge.installed_on(self.url()):
+            logging.warning(f"TextBridge: not available on {self.url().host()}, file not pasted")
+            return None
+        return self.text_bridge.send_file(path)
 
     def javaScriptConsoleMessage(self, level, message, line, sourceid):
         print(f"JS [{level}] {message} (line {line})")
@@ -386,8 +191,11 @@ class CustomWebEnginePage(QWebEnginePage):
 
     def createWindow(self, window_type):
         try:
+            start = time.perf_counter()
+            metrics.count("popups")
             popup = PopupWindow(self._profile, self.parent)
             popup.show()
+            metrics.observe("popup_open_ms", (time.perf_counter() - start) * 1000)
             self.popupCreated.emit(popup)
             return popup.page
         except Exception as e:
@@ -395,19 +203,97 @@ class CustomWebEnginePage(QWebEnginePage):
             return None
 
 
+class BrowserProfile(QWebEngineProfile):
+    """Profile dùng chung cho mọi page: view trong pool, popup OAuth..."""
+    _shared = None
+
+    def __init__(self, name="secure_browser_profile", parent=None):
+        super().__init__(name, parent)
+        self.setup_profile()
+        # Cookie/cache/storage theo từng provider và dung lượng đĩa theo site
+        self.site_data = SiteDataManager(self, self)
+
+    @classmethod
+    def shared(cls):
+        if cls._shared is None:
+            cls._shared = cls(parent=QApplication.instance())
+        return cls._shared
+
+    def setup_profile(self):
+        """Enhanced profile setup with additional browser features"""
+        # HTTP cache (có giới hạn, có thể nằm trên RAM) tách khỏi cookie/IndexedDB
+        paths = AppPaths(app_name="SmartAI", app_author="Hsx2Coder")
+        self.layout = ProfileLayout.from_settings(get_settings().section("profile_cache"), paths)
+        self.layout.apply(self)
+        metrics.add_source("profile_cache", self.layout.stats)
+        self.setPersistentCookiesPolicy(QWebEngineProfile.PersistentCookiesPolicy.AllowPersistentCookies)
+
+
+        # Enhanced profile settings
+        self.setSpellCheckEnabled(True)
+        self.setSpellCheckLanguages(['en-US'])
+
+        # Set default settings
+        settings = self.settings()
+        settings.setAttribute(QWebEngineSettings.WebAttribute.ScreenCaptureEnabled, True)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.PlaybackRequiresUserGesture, False)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptCanAccessClipboard, True)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.DnsPrefetchEnabled, True)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.Accelerated2dCanvasEnabled, True)
+
+        # Header tĩnh đi qua API của profile, không tốn lời gọi Python cho mỗi request
+        self.header_policy = HeaderPolicy.from_settings(get_settings().section("request_headers"))
+        self.setHttpUserAgent(self.header_policy.user_agent)
+        self.setHttpAcceptLanguage(self.header_policy.accept_language)
+
+        metrics_settings = get_settings().section("metrics")
+        metrics.configure(
+            enabled=metrics_settings.get("enabled", True),
+            sample_every=metrics_settings.get("request_sample_every", 10)
+        )
+
+        self.blocklist = self.load_blocklist()
+
+        # Chỉ cài interceptor khi còn rule theo loại resource, cần đếm hoặc chặn request
+        # (giữ tham chiếu, Qt không nhận quyền sở hữu interceptor)
+        self.interceptor = None
+        if self.header_policy.rules or metrics.enabled or self.blocklist:
+            self.interceptor = EnhancedBrowserInterceptor(
+                self.header_policy, metrics if metrics.enabled else None, self.blocklist, self)
+            self.setUrlRequestInterceptor(self.interceptor)
+
+        # Script được cài một lần trên profile thay vì chạy lại cho từng page
+        scripts.install(self)
+
+        # Trang nội bộ smartai://diagnostics
+        self.diagnostics_handler = DiagnosticsSchemeHandler(self)
+        self.installUrlSchemeHandler(SCHEME, self.diagnostics_handler)
+
+    def load_blocklist(self):
+        settings = get_settings().section("blocklist")
+        if not settings.get("enabled", True):
+            return None
+        paths = AppPaths()
+        lists = []
+        if settings.get("include_default", True):
+            lists.append(paths.get_path("blocklists", "trackers.txt"))
+        lists.extend(settings.get("lists", []))
+        blocklist = DomainBlocklist.load(lists, paths.get_appdata_dir("blocklist"))
+        return blocklist if len(blocklist) else None
+
+
 class CustomWebView(QWebEngineView):
     popupCreated = pyqtSignal(object)
     popupClosed = pyqtSignal()
     authCompleted = pyqtSignal(str)
-    clearCacheRequested = pyqtSignal()
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, profile=None, initial_url=None):
         super().__init__(parent)
         self.setStyleSheet("background-color: white;")
 
-        # Create and configure profile with enhanced settings
-        self.profile = QWebEngineProfile("secure_browser_profile", self)
-        self.setup_profile()
+        # Mọi view dùng chung một profile (cookie, cache, interceptor)
+        self.profile = profile or BrowserProfile.shared()
+        self.initial_url = initial_url
 
         # Create and configure custom page
         self.custom_page = CustomWebEnginePage(self.profile, self)
@@ -416,10 +302,13 @@ class CustomWebView(QWebEngineView):
         # Connect signals
         self.custom_page.popupCreated.connect(self.handle_popup_created)
         self.custom_page.authCallback.connect(self.handle_auth_callback)
+        self.page().loadStarted.connect(self.on_load_started)
         self.page().loadFinished.connect(self.on_load_finished)
+        self.load_started_at = None
+        self.shim_listeners = None
+        self.restore_scroll_y = None
 
         self.setup_settings()
-        self.setup_cookie_store()
 
         self.setMouseTracking(True)
         self.loaded = False
@@ -468,51 +357,6 @@ class CustomWebView(QWebEngineView):
         # Áp dụng style
         self.setStyleSheet(self.menu_style)
 
-    def clear_cache(self):
-        # Clear HTTP cache
-        self.logout_chatgpt()
-
-        self.page().profile().clearHttpCache()
-        print("HTTP cache cleared")
-
-        # Clear cookies
-        cookie_store = self.page().profile().cookieStore()
-        cookie_store.deleteAllCookies()
-        print("Cookies cleared")
-
-
-    def logout_chatgpt(self):
-        # Navigate to the ChatGPT logout URL
-        logout_url = "https://chat.openai.com/logout"
-        self.setUrl(QUrl(logout_url))
-        print("Navigated to ChatGPT logout URL")
-
-    def setup_profile(self):
-        """Enhanced profile setup with additional browser features"""
-        paths = AppPaths(app_name="SmartAI", app_author="Hsx2Coder")
-        cache_path = os.path.abspath(paths.get_appdata_dir("cache"))
-        if not os.path.exists(cache_path):
-            os.makedirs(cache_path)
-
-        self.profile.setCachePath(cache_path)
-        self.profile.setPersistentStoragePath(cache_path)
-        self.profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
-        self.profile.setPersistentCookiesPolicy(QWebEngineProfile.PersistentCookiesPolicy.AllowPersistentCookies)
-
-
-        # Enhanced profile settings
-        self.profile.setSpellCheckEnabled(True)
-        self.profile.setSpellCheckLanguages(['en-US'])
-
-        # Set default settings
-        settings = self.profile.settings()
-        settings.setAttribute(QWebEngineSettings.WebAttribute.ScreenCaptureEnabled, True)
-        settings.setAttribute(QWebEngineSettings.WebAttribute.PlaybackRequiresUserGesture, False)
-        settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptCanAccessClipboard, True)
-        settings.setAttribute(QWebEngineSettings.WebAttribute.DnsPrefetchEnabled, True)
-        settings.setAttribute(QWebEngineSettings.WebAttribute.Accelerated2dCanvasEnabled, True)
-        self.profile.setUrlRequestInterceptor(EnhancedBrowserInterceptor())
-
     def setup_settings(self):
         settings = self.settings()
         settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptEnabled, True)
@@ -533,46 +377,23 @@ class CustomWebView(QWebEngineView):
         settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptCanAccessClipboard, True)  # Ensure this is set to True
         settings.setDefaultTextEncoding('UTF-8')
 
-    def setup_cookie_store(self):
-        cookie_store = self.profile.cookieStore()
-
-        # def on_cookie_added(cookie):
-        #     cookie_name = cookie.name().data().decode()
-        #     domain = cookie.domain()
-        #     print(f"Cookie added: {cookie_name} for domain: {domain}")
-        #
-        # def on_cookie_removed(cookie):
-        #     cookie_name = cookie.name().data().decode()
-        #     print(f"Cookie removed: {cookie_name}")
-        #
-        # # Connect signals
-        # cookie_store.cookieAdded.connect(on_cookie_added)
-        # cookie_store.cookieRemoved.connect(on_cookie_removed)
-
-        # Ensure cookies are not added/removed repeatedly
-        self.cookie_set = set()
-
-        def handle_cookie_added(cookie):
-            cookie_name = cookie.name().data().decode()
-            if cookie_name not in self.cookie_set:
-                self.cookie_set.add(cookie_name)
-                # on_cookie_added(cookie)
-
-        def handle_cookie_removed(cookie):
-            cookie_name = cookie.name().data().decode()
-            if cookie_name in self.cookie_set:
-                self.cookie_set.remove(cookie_name)
-                # on_cookie_removed(cookie)
-
-        cookie_store.cookieAdded.connect(handle_cookie_added)
-        cookie_store.cookieRemoved.connect(handle_cookie_removed)
+    def on_load_started(self):
+        self.load_started_at = time.perf_counter()
 
     def on_load_finished(self, ok):
         """Handle page load completion"""
+        if self.load_started_at is not None:
+            duration_ms = (time.perf_counter() - self.load_started_at) * 1000
+            self.load_started_at = None
+            metrics.observe_load(provider_for_url(self.url().toString()), duration_ms)
         if ok:
+            startup_timer.mark("first_page_load")
             # self.inject_enhanced_scripts()
-            self.hide_scrollbar()
-            print("JavaScript injected successfully.")
+            # CSS/hành vi theo site đã được profile chèn ở DocumentReady (page_scripts.py)
+            self.report_shim_listeners()
+            if self.restore_scroll_y:
+                self.page().runJavaScript(f"window.scrollTo(0, {int(self.restore_scroll_y)})")
+                self.restore_scroll_y = None
         else:
             print("Page load failed")
 
@@ -651,41 +472,13 @@ class CustomWebView(QWebEngineView):
         """
         self.page().runJavaScript(enhanced_scripts)
 
-    def hide_scrollbar(self):
-        self.page().runJavaScript("""
-            const style = document.createElement('style');
-            style.innerHTML = `
-                ::-webkit-scrollbar {
-                    display: none;
-                }
-                body {
-                    overflow: hidden;
-                }
-            `;
-            document.head.appendChild(style);
-            document.body.addEventListener('wheel', function(event) {
-                window.scrollBy(0, event.deltaY);
-            });
-        """)
-
-    def save_last_url(self, url):
-        try:
-            with open("lasturl", "w") as file:
-                file.write(url)
-            print(f"URL saved to lasturl: {url}")
-        except Exception as e:
-            print(f"Error saving URL to lasturl: {e}")
-
-    def load_last_url(self):
-        try:
-            if os.path.exists("lasturl"):
-                with open("lasturl", "r") as file:
-                    url = file.read().strip()
-                print(f"URL loaded from lasturl: {url}")
-                return url
-        except Exception as e:
-            print(f"Error loading URL from lasturl: {e}")
-        return "https://claude.ai/"
+    def report_shim_listeners(self, callback=None):
+        """Đếm listener do shim cài trong document hiện tại (kiểm tra rò rỉ)"""
+        def on_result(count):
+            self.shim_listeners = count
+            if callback:
+                callback(count)
+        self.page().runJavaScript(SHIM_LISTENER_COUNT_JS, ScriptWorldId.ApplicationWorld.value, on_result)
 
     def handle_auth_callback(self, callback_url):
         print(f"WebView: Auth callback received: {callback_url}")
@@ -698,36 +491,73 @@ class CustomWebView(QWebEngineView):
     def createWindow(self, window_type):
         return self.page().createWindow(window_type)
 
+    def reload(self):
+        metrics.count("reloads")
+        super().reload()
+
     def showEvent(self, event):
         super().showEvent(event)
+        self.ensure_loaded()
+
+    def ensure_loaded(self):
+        # View chỉ load URL khi được hiển thị, hoặc khi cần chạy nền (broadcast)
         if not self.loaded:
             print("Loading initial URL...")
-            last_url = self.load_last_url()
-            self.setUrl(QUrl(last_url))
+            self.setUrl(QUrl(self.initial_url or PROVIDERS["claude"]))
             self.loaded = True
 
+    def contextMenuEvent(self, event):
+        menu = self.createStandardContextMenu()
+        menu.addSeparator()
+        menu.addAction("Paste from File...", self.paste_from_file)
+        menu.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        menu.popup(event.globalPos())
+
+    def paste_from_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Paste from File", "", "Text (*.txt *.md *.log *.json *.py *.csv);;All files (*)")
+        if path:
+            self.custom_page.paste_file(path)
+
     def enterEvent(self, event):
         self.setFocus()
         super().enterEvent(event)
 
 class EnhancedBrowserInterceptor(QWebEngineUrlRequestInterceptor):
-    def interceptRequest(self, info):
-        """Enhanced request interceptor with full browser headers"""
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.5993.88 Safari/537.36",
-            "Accept": "text/html",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate, br",
-            "DNT": "1",
-            "Upgrade-Insecure-Requests": "1",
-            "Sec-Fetch-Site": "none",
-            "Sec-Fetch-Mode": "navigate",
-            "Sec-Fetch-User": "?1",
-            "Sec-Fetch-Dest": "document",
-            "Sec-Ch-Ua": '"Chromium";v="122", "Not(A:Brand";v="24", "Google Chrome";v="122"',
-            "Sec-Ch-Ua-Mobile": "?0",
-            "Sec-Ch-Ua-Platform": '"Windows"'
+    """Chặn request tới tracker theo DomainBlocklist, gắn header theo loại resource
+    từ HeaderPolicy (bảng tra được tính sẵn một lần) và lấy mẫu request cho MetricsRegistry"""
+
+    def __init__(self, policy, metrics=None, blocklist=None, parent=None):
+        super().__init__(parent)
+        self.metrics = metrics
+        self.blocklist = blocklist
+        self.blocked_count = 0
+        by_name = policy.headers_by_type(member.name for member in QWebEngineUrlRequestInfo.ResourceType)
+        self.headers_by_type = {
+            QWebEngineUrlRequestInfo.ResourceType[name]: headers for name, headers in by_name.items()
         }
 
-        for name, value in headers.items():
-            info.setHttpHeader(name.encode(), value.encode())
\ No newline at end of file
+    def interceptRequest(self, info):
+        resource_type = info.resourceType()
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.request_tick += 1
+            if metrics.request_tick >= metrics.sample_every:
+                metrics.request_tick = 0
+                metrics.record_request(info.requestUrl().host(), resource_type.value, resource_type.name)
+
+        # Không bao giờ chặn trang người dùng chủ động mở
+        blocklist = self.blocklist
+        if blocklist is not None and resource_type != QWebEngineUrlRequestInfo.ResourceType.ResourceTypeMainFrame:
+            first_party = info.firstPartyUrl().host() if blocklist.third_party_domains else ""
+            if blocklist.should_block(info.requestUrl().host(), first_party):
+                info.block(True)
+                self.blocked_count += 1
+                if metrics is not None:
+                    metrics.count("blocked_requests")
+                return
+
+        headers = self.headers_by_type.get(resource_type)
+        if headers is None:
+            return
+        for name, value in headers:
+            info.setHttpHeader(name, value)
\ No newline at end of file
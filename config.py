@@ -0,0 +1,174 @@
+# File: config.py
+import copy
+import json
+import logging
+import os
+
+from header_policy import DEFAULT_ACCEPT_LANGUAGE, DEFAULT_HEADER_RULES, DEFAULT_USER_AGENT
+from utils import AppPaths
+
+# Giá trị mặc định; người dùng ghi đè bằng settings.json trong thư mục appdata
+DEFAULT_SETTINGS = {
+    "startup": {
+        # Chỉ import QtWebEngine khi mở sidebar lần đầu (hoặc khi hết thời gian idle)
+        "lazy_webengine": True,
+        # Tạo web view sau N ms kể từ khi khởi động; 0 = chỉ tạo khi show_sidebar()
+        "preload_idle_ms": 5000,
+    },
+    "view_pool": {
+        # Số provider giữ page sống cùng lúc; vượt quá thì bỏ page lâu không dùng nhất
+        "max_live_pages": 3,
+    },
+    "page_lifecycle": {
+        "enabled": True,
+        # Page chạy nền quá N giây thì chuyển sang Frozen
+        "freeze_after_s": 60,
+        # Page chạy nền quá N giây thì Discarded (0 = chỉ discard khi vượt budget)
+        "discard_after_s": 0,
+        # Tổng RSS của các renderer process; vượt quá thì discard page nền
+        "memory_budget_mb": 1500,
+        # Provider không bao giờ bị discard (vẫn có thể bị freeze)
+        "pinned_providers": [],
+        "check_interval_s": 10,
+    },
+    "suspend_on_hide": {
+        "enabled": True,
+        # "freeze": freeze page sau grace period; "throttle": chỉ để Chromium throttle
+        "mode": "freeze",
+        "grace_period_s": 30,
+    },
+    "request_headers": {
+        "user_agent": DEFAULT_USER_AGENT,
+        "accept_language": DEFAULT_ACCEPT_LANGUAGE,
+        # {resource_type: {header: value}}; rỗng thì không cài interceptor
+        "rules": DEFAULT_HEADER_RULES,
+    },
+    "metrics": {
+        "enabled": True,
+        # Chỉ ghi 1/N request để chi phí mỗi request không đáng kể
+        "request_sample_every": 10,
+    },
+    "blocklist": {
+        "enabled": True,
+        # Dùng blocklists/trackers.txt đi kèm ứng dụng
+        "include_default": True,
+        # Đường dẫn tới các danh sách EasyList/hosts bổ sung
+        "lists": [],
+    },
+    # Ghi đè theo tên script: {"universal_messaging": {"enabled": true, "matches": [...]}}
+    "scripts": {},
+    # CSS/hành vi theo site: {"chatgpt": {"css": "...", "behaviors": ["wheel_scroll"]}}
+    "site_tweaks": {},
+    "clipboard_history": {
+        "enabled": True,
+        "max_entries": 50,
+        # Tổng dung lượng giữ trong RAM; vượt quá thì đẩy mục cũ ra đĩa
+        "memory_budget_kb": 4096,
+        # Mục lớn hơn ngưỡng này được ghi thẳng ra đĩa
+        "spill_threshold_kb": 256,
+        # Bỏ qua nội dung lớn hơn N MB
+        "max_clip_mb": 32,
+        "debounce_ms": 250,
+    },
+    "broadcast": {
+        # Provider được chọn sẵn trong chế độ broadcast
+        "providers": ["gemini", "chatgpt", "mistral"],
+        # Chờ ô nhập xuất hiện sau khi trang load xong
+        "input_timeout_s": 30,
+        "answer_timeout_s": 180,
+        # Câu trả lời không đổi trong N ms (và không còn nút Stop) thì coi là xong
+        "idle_ms": 3000,
+    },
+    # Ghi đè selector theo provider (xem providers.py):
+    # {"chatgpt": {"input": "...", "submit": "...", "response": "...", "streaming": "..."}}
+    "selectors": {},
+    "capture": {
+        # Theo dõi câu trả lời của assistant (MutationObserver) và gửi delta về Python
+        "enabled": True,
+        # Gộp mọi thay đổi DOM trong khoảng này thành một message
+        "flush_ms": 250,
+        # Câu trả lời không đổi trong N ms (và không còn nút Stop) thì coi là xong
+        "idle_ms": 1500,
+    },
+    "profile_cache": {
+        # "disk" (thư mục cache XDG), "tmpfs" (đĩa RAM) hoặc "memory" (không ghi đĩa)
+        "mode": "disk",
+        # Giới hạn HTTP cache; 0 = để Chromium tự chọn
+        "max_size_mb": 256,
+    },
+    "site_data": {
+        # Quét dung lượng cache/storage theo site ở thread nền
+        "first_scan_delay_s": 30,
+        "scan_interval_s": 600,
+    },
+    "archive": {
+        # Lưu prompt/câu trả lời vào archive.db (SQLite FTS5) để tìm kiếm lại
+        "enabled": True,
+    },
+    "paste": {
+        # Kích thước mỗi chunk (ký tự) khi chuyển text vào trang qua QWebChannel
+        "chunk_chars": 262144,
+    },
+    "edge_trigger": {
+        # Con trỏ phải dừng ở mép màn hình ít nhất dwell_ms mới mở sidebar (0: mở ngay)
+        "dwell_ms": 150,
+        # Di chuyển dọc mép nhanh hơn mức này thì đếm dwell lại
+        "max_velocity_px_s": 1500,
+        # Bỏ qua khi con trỏ ở góc màn hình
+        "corner_px": 8,
+    },
+    "resize": {
+        # "preview" (khung khi kéo, áp dụng lúc thả), "throttled" (tối đa một lần mỗi frame) hoặc "live"
+        "mode": "preview",
+    },
+    "animation": {
+        # Trượt sidebar vào/ra bằng snapshot; web view không bị resize trong lúc trượt
+        "enabled": True,
+        "duration_ms": 160,
+    },
+    "session": {
+        # Gộp các thay đổi trong khoảng này thành một lần ghi session.json
+        "debounce_ms": 1000,
+    },
+}
+
+
+class AppSettings:
+    def __init__(self, path=None):
+        if path is None:
+            path = os.environ.get("SMARTAI_SETTINGS") or os.path.join(
+                AppPaths().get_appdata_dir(), "settings.json")
+        self.path = path
+        self.data = copy.deepcopy(DEFAULT_SETTINGS)
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                user_settings = json.load(file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logging.warning(f"Could not read settings from {self.path}: {e}")
+            return
+
+        for section, values in user_settings.items():
+            if section in self.data and isinstance(values, dict):
+                self.data[section].update(values)
+
+    def get(self, section, key, default=None):
+        return self.data.get(section, {}).get(key, default)
+
+    def section(self, name):
+        return dict(self.data.get(name, {}))
+
+
+_settings = None
+
+
+def get_settings():
+    """Settings được đọc một lần cho cả process."""
+    global _settings
+    if _settings is None:
+        _settings = AppSettings()
+    return _settings
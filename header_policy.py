@@ -0,0 +1,68 @@
+# File: header_policy.py
+
+# Header tĩnh: đặt một lần ở mức profile (setHttpUserAgent / setHttpAcceptLanguage),
+# Chromium tự gắn vào mọi request mà không cần gọi sang Python
+DEFAULT_USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                      "(KHTML, like Gecko) Chrome/118.0.5993.88 Safari/537.36")
+DEFAULT_ACCEPT_LANGUAGE = "en-US,en;q=0.9"
+
+# Header theo loại resource (tên theo QWebEngineUrlRequestInfo.ResourceType, dạng
+# snake_case: main_frame, sub_frame, xhr, script...; "*" áp dụng cho mọi loại).
+# Accept, Accept-Encoding, Sec-Fetch-* do Chromium tự đặt đúng cho từng request.
+DEFAULT_HEADER_RULES = {
+    "main_frame": {
+        "DNT": "1",
+        "Upgrade-Insecure-Requests": "1",
+        "Sec-Ch-Ua": '"Chromium";v="122", "Not(A:Brand";v="24", "Google Chrome";v="122"',
+        "Sec-Ch-Ua-Mobile": "?0",
+        "Sec-Ch-Ua-Platform": '"Windows"',
+    },
+    "sub_frame": {
+        "DNT": "1",
+        "Sec-Ch-Ua": '"Chromium";v="122", "Not(A:Brand";v="24", "Google Chrome";v="122"',
+        "Sec-Ch-Ua-Mobile": "?0",
+        "Sec-Ch-Ua-Platform": '"Windows"',
+    },
+}
+
+
+def resource_type_enum_name(type_name):
+    """main_frame -> ResourceTypeMainFrame"""
+    return "ResourceType" + "".join(part.capitalize() for part in type_name.split("_"))
+
+
+class HeaderPolicy:
+    def __init__(self, user_agent=DEFAULT_USER_AGENT, accept_language=DEFAULT_ACCEPT_LANGUAGE,
+                 rules=None):
+        self.user_agent = user_agent
+        self.accept_language = accept_language
+        self.rules = self.compile(DEFAULT_HEADER_RULES if rules is None else rules)
+
+    @staticmethod
+    def compile(rules):
+        """{main_frame: {name: value}} -> {ResourceTypeMainFrame: ((b"name", b"value"), ...)}"""
+        compiled = {}
+        for type_name, headers in rules.items():
+            pairs = tuple((name.encode(), str(value).encode()) for name, value in headers.items())
+            if pairs:
+                key = type_name if type_name == "*" else resource_type_enum_name(type_name)
+                compiled[key] = pairs
+        return compiled
+
+    @classmethod
+    def from_settings(cls, section):
+        return cls(
+            user_agent=section.get("user_agent", DEFAULT_USER_AGENT),
+            accept_language=section.get("accept_language", DEFAULT_ACCEPT_LANGUAGE),
+            rules=section.get("rules"),
+        )
+
+    def headers_by_type(self, enum_names):
+        """Gộp rule "*" với rule riêng của từng loại; chỉ trả về các loại có header."""
+        common = self.rules.get("*", ())
+        table = {}
+        for enum_name in enum_names:
+            headers = common + self.rules.get(enum_name, ())
+            if headers:
+                table[enum_name] = headers
+        return table
@@ -9,9 +9,21 @@ SOURCE_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/SmartAI"
 
 echo "Installing $APP_NAME..."
 
-# 1. Xóa bản cũ
+# Dữ liệu người dùng nằm chung thư mục cài đặt (AppPaths.get_appdata_dir): giữ lại khi cài lại.
+# profile: cookie, IndexedDB; cache: profile của bản cũ, được chuyển sang profile ở lần chạy đầu
+KEEP=(profile cache settings.json session.json archive clipboard)
+
+# 1. Xóa bản cũ (trừ dữ liệu người dùng)
 if [ -d "$INSTALL_DIR" ]; then
-    rm -rf "$INSTALL_DIR"
+    for entry in "$INSTALL_DIR"/* "$INSTALL_DIR"/.[!.]*; do
+        [ -e "$entry" ] || continue
+        name="$(basename "$entry")"
+        if [[ " ${KEEP[*]} " == *" $name "* ]]; then
+            echo "Keeping $name"
+            continue
+        fi
+        rm -rf "$entry"
+    done
 fi
 
 # 2. Copy ứng dụng
@@ -0,0 +1,146 @@
+# File: instrumentation.py
+import logging
+import os
+import statistics
+import time
+from collections import deque
+
+# psutil là tùy chọn; trên Linux đọc trực tiếp /proc nếu không có
+HAS_PSUTIL = False
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    pass
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+class StartupTimer:
+    """Ghi lại các mốc khởi động, tính bằng ms từ lúc module này được import."""
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.milestones = []
+
+    def mark(self, name):
+        # Mỗi mốc chỉ ghi một lần (first paint, first load...)
+        if any(milestone == name for milestone, _ in self.milestones):
+            return
+        elapsed = (time.perf_counter() - self.t0) * 1000
+        previous = self.milestones[-1][1] if self.milestones else 0.0
+        self.milestones.append((name, elapsed))
+        logging.info(f"[startup] {name}: {elapsed:.1f} ms (+{elapsed - previous:.1f} ms)")
+
+    def summary(self):
+        return dict(self.milestones)
+
+
+class ShowLatencyProbe:
+    """Các mốc của một lần hiện sidebar: trigger (hover/phím tắt) -> show_sidebar ->
+    cửa sổ exposed -> frame đầu tiên của web view được vẽ.
+
+    Mỗi lần hiện là một trace; trace hoàn tất ở mốc "first_frame".
+    """
+
+    PHASES = ("show_sidebar", "exposed", "first_frame")
+    # Trace không hoàn tất sau khoảng này (sidebar đã hiện sẵn...) bị bỏ
+    STALE_AFTER_S = 5.0
+
+    def __init__(self, keep=500):
+        self.trace = None
+        self.samples = deque(maxlen=keep)
+        self.completed = 0
+        self.dropped = 0
+
+    def begin(self, source):
+        now = time.perf_counter()
+        if self.trace is not None:
+            if now - self.trace["trigger"] < self.STALE_AFTER_S:
+                return
+            self.dropped += 1
+        self.trace = {"source": source, "trigger": now}
+
+    def mark(self, phase):
+        trace = self.trace
+        if trace is None or phase in trace:
+            return
+        trace[phase] = time.perf_counter()
+        if phase == "first_frame":
+            self.finish(trace)
+
+    def cancel(self):
+        self.trace = None
+
+    def active(self):
+        return self.trace is not None
+
+    def finish(self, trace):
+        self.trace = None
+        sample = {"source": trace["source"]}
+        previous = "trigger"
+        for phase in self.PHASES:
+            if phase not in trace:
+                continue
+            # Thời gian của từng giai đoạn, tính từ mốc trước đó
+            sample[phase] = (trace[phase] - trace[previous]) * 1000
+            previous = phase
+        sample["total"] = (trace["first_frame"] - trace["trigger"]) * 1000
+        self.samples.append(sample)
+        self.completed += 1
+        logging.debug(f"[show] {trace['source']}: {sample['total']:.1f} ms")
+
+    def summary(self):
+        """p50/p95 (ms) của từng giai đoạn trên các lần hiện gần nhất"""
+        result = {"completed": self.completed, "dropped": self.dropped}
+        for phase in self.PHASES + ("total",):
+            values = sorted(sample[phase] for sample in self.samples if phase in sample)
+            if values:
+                result[phase] = {
+                    "p50_ms": round(statistics.median(values), 2),
+                    "p95_ms": round(values[min(len(values) - 1, int(round(0.95 * (len(values) - 1))))], 2),
+                }
+        return result
+
+
+def process_rss_bytes(pid):
+    """RSS của một process (renderer...), None nếu không đọc được."""
+    if not pid:
+        return None
+    if HAS_PSUTIL:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except (psutil.Error, OSError):
+            return None
+    try:
+        with open(f"/proc/{pid}/status", "r") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def process_cpu_seconds(pid):
+    """Tổng CPU time (user + system) của một process, None nếu không đọc được."""
+    if not pid:
+        return None
+    if HAS_PSUTIL:
+        try:
+            times = psutil.Process(pid).cpu_times()
+            return times.user + times.system
+        except (psutil.Error, OSError):
+            return None
+    try:
+        with open(f"/proc/{pid}/stat", "r") as file:
+            # Tên process nằm trong ngoặc và có thể chứa khoảng trắng
+            fields = file.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# main.py import module này trước Qt để t0 gần với lúc process bắt đầu
+startup_timer = StartupTimer()
+show_probe = ShowLatencyProbe()
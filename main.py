@@ -1,6 +1,9 @@
 import os
 import sys
 
+# Import trước Qt để mốc thời gian khởi động bắt đầu sớm nhất có thể
+from instrumentation import show_probe, startup_timer
+
 # --- CẤU HÌNH MÔI TRƯỜNG LINUX (PHẢI ĐẶT TRƯỚC KHI IMPORT QT) ---
 if sys.platform != 'win32':
     # 1. Ép dùng X11 (XWayland)
@@ -16,10 +19,8 @@ if sys.platform != 'win32':
     os.environ["QT_LINUX_ACCESSIBILITY_ALWAYS_ON"] = "1"
 
 import logging
-from PyQt6.QtGui import QAction, QIcon
-from PyQt6.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QMessageBox, QWidget
-from utils import AppPaths
-from sidebar import Sidebar
+from PyQt6.QtCore import Qt, QCoreApplication, QTimer
+from single_instance import InstanceServer, forward_to_running_instance, instance_command
 
 # Cấu hình logging
 logging.basicConfig(
@@ -29,8 +30,10 @@ logging.basicConfig(
         logging.StreamHandler(sys.stdout)  # Chỉ log ra console
     ]
 )
+startup_timer.mark("imports")
 
 def show_error(message):
+    from PyQt6.QtWidgets import QMessageBox
     msg = QMessageBox()
     msg.setIcon(QMessageBox.Icon.Critical)
     msg.setText("Error")
@@ -41,9 +44,49 @@ def show_error(message):
 
 def main():
     try:
+        # Đã có instance đang chạy: chuyển lệnh (show/toggle) cho nó rồi thoát ngay,
+        # trước khi import QtWidgets/QtWebEngine và dựng Chromium thứ hai trên cùng profile
+        command = instance_command(sys.argv)
+        forwarded = forward_to_running_instance(command, sys.argv[1:])
+        if forwarded is not None:
+            # Không xác nhận (treo/đang khởi động): vẫn không mở instance thứ hai trên cùng profile;
+            # lệnh đã nằm trong socket và sẽ được xử lý nếu instance kia chạy tiếp
+            return 0 if forwarded else 1
+
+        from PyQt6.QtGui import QAction
+        from PyQt6.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QWidget
+        from archive import get_archive
+        from clipboard_history import ClipboardHistory
+        from components.navigation_bar import nav_icon_specs
+        from config import get_settings
+        from metrics import registry as metrics
+        from resources import get_resources
+        from session_store import get_session
+        from utils import AppPaths
+        from sidebar import Sidebar
+        startup_timer.mark("app_imports")
+
         logging.info("Starting application...")
+        settings = get_settings()
+        lazy_webengine = settings.get("startup", "lazy_webengine", True)
+
+        # QtWebEngineWidgets có thể được import sau QApplication (lazy mode),
+        # nên phải bật chia sẻ OpenGL context trước khi tạo QApplication
+        QCoreApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
         app = QApplication(sys.argv)
         app.setQuitOnLastWindowClosed(False)
+        startup_timer.mark("qapplication")
+
+        instance_server = InstanceServer(parent=app)
+        if not instance_server.listen():
+            # Một instance khác vừa khởi động cùng lúc và đã giữ tên server
+            return 0 if forward_to_running_instance(command, sys.argv[1:]) else 1
+        app.aboutToQuit.connect(instance_server.close)
+        metrics.add_source("single_instance", instance_server.stats)
+
+        # Đọc phiên trước một lần, trước khi dựng sidebar/web view
+        session = get_session()
+        app.aboutToQuit.connect(session.flush)
 
         paths = AppPaths()
 
@@ -57,41 +100,91 @@ def main():
                 logging.warning("Fcitx plugin NOT FOUND. Vietnamese input may not work.")
         # --- END DEBUG ---
 
-        # Load icon
-        icon_path = paths.get_path('images', 'tray.svg')
-        logging.info(f"Trying to load icon from: {icon_path}")
-
-        icon = QIcon(icon_path)
-        if not os.path.exists(icon_path):
-            logging.warning(f"Icon file not found: {icon_path}")
-        elif icon.isNull():
-            logging.warning("Failed to load icon (format might not be supported)")
+        # Load icon (thư mục images/ được quét một lần, pixmap lấy từ cache nếu có)
+        resources = get_resources()
+        icon = resources.tray_icon()
+        if icon.isNull():
+            logging.warning(f"Failed to load tray icon from {resources.images_dir}")
         
         tray_icon = QSystemTrayIcon(icon, parent=app)
         tray_menu = QMenu()
 
+        # Lịch sử clipboard: handler chỉ debounce, phần nặng chạy ở thread nền
+        clipboard_history = None
+        if settings.get("clipboard_history", "enabled", True):
+            clipboard_history = ClipboardHistory(app.clipboard(), parent=app)
+            app.clipboard().dataChanged.connect(clipboard_history.on_clipboard_changed)
+            app.aboutToQuit.connect(clipboard_history.stop)
+            metrics.add_source("clipboard_history", clipboard_history.stats)
+
+        # Archive hội thoại: database được mở và ghi ở thread nền
+        if settings.get("archive", "enabled", True):
+            archive = get_archive()
+            app.aboutToQuit.connect(archive.close)
+            metrics.add_source("archive", archive.stats)
+
         # Widget ẩn làm cha để ẩn Sidebar khỏi Taskbar
         dummy_parent = QWidget()
         dummy_parent.hide()
 
         logging.info("Creating sidebar...")
         try:
-            sidebar = Sidebar(parent=dummy_parent)
+            sidebar = Sidebar(parent=dummy_parent, lazy_content=lazy_webengine,
+                              clipboard_history=clipboard_history)
         except Exception as e:
             logging.exception("Failed to create sidebar")
             raise Exception(f"Failed to create sidebar: {str(e)}")
 
         show_action = QAction("Show")
         show_action.triggered.connect(sidebar.show_sidebar)
+        if sidebar.slide:
+            metrics.add_source("slide_animation", sidebar.slide.stats)
+        metrics.add_source("resize", sidebar.resize_handle.stats)
+        metrics.add_source("screen_layout", sidebar.screens.stats)
+        if sidebar.edge_trigger:
+            metrics.add_source("edge_trigger", sidebar.edge_trigger.stats)
         tray_menu.addAction(show_action)
 
+        if clipboard_history is not None:
+            clipboard_action = QAction("Clipboard History")
+            clipboard_action.triggered.connect(sidebar.show_clipboard_picker)
+            tray_menu.addAction(clipboard_action)
+
         exit_action = QAction("Quit")
         exit_action.triggered.connect(app.quit)
         tray_menu.addAction(exit_action)
 
         tray_icon.setContextMenu(tray_menu)
         tray_icon.show()
-        
+        startup_timer.mark("tray")
+        metrics.add_source("startup_ms", startup_timer.summary)
+        metrics.add_source("show_latency", show_probe.summary)
+
+        # Lệnh từ các lần chạy sau (shortcut .desktop, autostart...)
+        def on_instance_command(received, _argv):
+            if received == "toggle":
+                sidebar.toggle_sidebar()
+            elif received == "hide":
+                if sidebar.is_visible:
+                    sidebar.hide_sidebar()
+            elif received == "quit":
+                app.quit()
+            else:
+                show_probe.begin("launch")
+                sidebar.show_sidebar()
+
+        instance_server.commandReceived.connect(on_instance_command)
+        if any(arg in ("--show", "--toggle") for arg in sys.argv[1:]):
+            QTimer.singleShot(0, lambda: on_instance_command(command, sys.argv[1:]))
+
+        # Dựng sẵn icon thanh điều hướng khi rảnh, trước khi sidebar được mở
+        QTimer.singleShot(0, lambda: resources.prerender(nav_icon_specs()))
+
+        if lazy_webengine:
+            preload_idle_ms = settings.get("startup", "preload_idle_ms", 0)
+            if preload_idle_ms > 0:
+                QTimer.singleShot(preload_idle_ms, sidebar.ensure_content)
+
         logging.info("Application started successfully.")
         return app.exec()
 
@@ -0,0 +1,153 @@
+# File: metrics.py
+import json
+import logging
+import os
+import threading
+import time
+
+# Ngưỡng (ms) của các bucket histogram thời gian load trang; bucket cuối là +inf
+LOAD_TIME_BUCKETS_MS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+
+# Đủ chỗ cho mọi giá trị của QWebEngineUrlRequestInfo.ResourceType
+MAX_RESOURCE_TYPES = 32
+
+# Số host được đếm riêng; khi đầy, nửa ít request hơn được gộp vào OTHER_HOSTS
+MAX_HOSTS = 200
+OTHER_HOSTS = "(other)"
+
+
+class Histogram:
+    def __init__(self, buckets=LOAD_TIME_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        index = 0
+        for bound in self.buckets:
+            if value <= bound:
+                break
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def snapshot(self):
+        labels = [f"<={bound}" for bound in self.buckets] + [f">{self.buckets[-1]}"]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 1) if self.count else 0.0,
+            "max": round(self.max, 1),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class MetricsRegistry:
+    """Bộ đếm nhẹ cho trình duyệt nhúng.
+
+    Request chỉ được ghi mẫu mỗi sample_every lần (kết quả được nhân lại khi xuất),
+    bộ đếm theo loại resource là list cấp phát sẵn nên đường nóng không cấp phát.
+    """
+
+    def __init__(self, sample_every=10):
+        self.enabled = True
+        self.sample_every = max(1, int(sample_every))
+        self.request_tick = 0
+        self.requests_by_type = [0] * MAX_RESOURCE_TYPES
+        self.requests_by_host = {}
+        self.resource_type_names = {}
+        self.counters = {"popups": 0, "reloads": 0}
+        self.load_times = {}
+        self.histograms = {}
+        self.sources = {}
+        self.started_at = time.time()
+        self.lock = threading.Lock()
+
+    def configure(self, enabled=True, sample_every=10):
+        self.enabled = enabled
+        self.sample_every = max(1, int(sample_every))
+
+    def record_request(self, host, type_value, type_name=None):
+        # Gọi từ interceptor, chỉ với request được lấy mẫu
+        with self.lock:
+            if 0 <= type_value < MAX_RESOURCE_TYPES:
+                self.requests_by_type[type_value] += 1
+                if type_name and type_value not in self.resource_type_names:
+                    self.resource_type_names[type_value] = type_name
+            if host not in self.requests_by_host and len(self.requests_by_host) >= MAX_HOSTS:
+                self.fold_rare_hosts()
+            self.requests_by_host[host] = self.requests_by_host.get(host, 0) + 1
+
+    def fold_rare_hosts(self):
+        # Giữ bộ nhớ cố định trong phiên dài: gộp các host ít request nhất (gọi khi đang giữ lock)
+        by_host = self.requests_by_host
+        other = by_host.pop(OTHER_HOSTS, 0)
+        ranked = sorted(by_host.items(), key=lambda item: -item[1])
+        keep = MAX_HOSTS // 2
+        other += sum(count for _, count in ranked[keep:])
+        self.requests_by_host = dict(ranked[:keep])
+        self.requests_by_host[OTHER_HOSTS] = other
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe_load(self, provider, duration_ms):
+        histogram = self.load_times.get(provider)
+        if histogram is None:
+            histogram = self.load_times[provider] = Histogram()
+        histogram.observe(duration_ms)
+
+    def observe(self, name, value_ms):
+        """Histogram thời gian bất kỳ (popup_open_ms...)"""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(value_ms)
+
+    def add_source(self, name, callback):
+        """Thêm số liệu từ nơi khác (pool, lifecycle...) vào snapshot"""
+        self.sources[name] = callback
+
+    def snapshot(self):
+        scale = self.sample_every
+        with self.lock:
+            by_type = {
+                self.resource_type_names.get(value, str(value)): count * scale
+                for value, count in enumerate(self.requests_by_type) if count
+            }
+            by_host = {host: count * scale for host, count in self.requests_by_host.items()}
+
+        sources = {}
+        for name, callback in self.sources.items():
+            try:
+                sources[name] = callback()
+            except Exception as e:
+                sources[name] = {"error": str(e)}
+
+        return {
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "request_sample_every": scale,
+            "requests_by_type": dict(sorted(by_type.items(), key=lambda item: -item[1])),
+            "requests_by_host": dict(sorted(by_host.items(), key=lambda item: -item[1])),
+            "counters": dict(self.counters),
+            "page_load_ms": {provider: h.snapshot() for provider, h in self.load_times.items()},
+            "timings_ms": {name: h.snapshot() for name, h in self.histograms.items()},
+            "sources": sources,
+        }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2, default=str)
+
+    def dump(self, directory):
+        path = os.path.join(directory, f"diagnostics-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.to_json())
+        logging.info(f"Diagnostics written to {path}")
+        return path
+
+
+registry = MetricsRegistry()
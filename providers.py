@@ -0,0 +1,78 @@
+# File: providers.py
+from urllib.parse import urlparse
+
+from config import get_settings
+
+# Trang chủ của từng nhà cung cấp chat, dùng làm khóa cho pool/session...
+PROVIDERS = {
+    "gemini": "https://gemini.google.com/",
+    "chatgpt": "https://chatgpt.com/",
+    "mistral": "https://chat.mistral.ai/",
+    "claude": "https://claude.ai/",
+    "copilot": "https://copilot.microsoft.com/",
+    "hugging": "https://huggingface.co/chat/",
+}
+
+# Các host khác thuộc cùng một provider
+HOST_ALIASES = {
+    "chat.openai.com": "chatgpt",
+}
+
+# Selector của ô nhập, nút gửi, câu trả lời cuối cùng và (tùy chọn) dấu hiệu đang stream.
+# Giao diện các site thay đổi thường xuyên: ghi đè qua settings "selectors"
+GENERIC_SELECTORS = {
+    "input": "textarea, [contenteditable='true']",
+    "submit": "button[type='submit'], button[aria-label*='Send' i]",
+    "response": "[data-message-author-role='assistant']",
+    "streaming": "",
+}
+
+PROVIDER_SELECTORS = {
+    "chatgpt": {
+        "input": "#prompt-textarea",
+        "submit": "button[data-testid='send-button']",
+        "response": "[data-message-author-role='assistant']",
+        "streaming": "button[data-testid='stop-button']",
+    },
+    "gemini": {
+        "input": "rich-textarea [contenteditable='true']",
+        "submit": "button.send-button, button[aria-label*='Send' i]",
+        "response": "model-response message-content",
+        "streaming": "button[aria-label*='Stop' i]",
+    },
+    "mistral": {
+        "input": "textarea, div[contenteditable='true']",
+        "submit": "button[type='submit'], button[aria-label*='Send' i]",
+        "response": "[data-message-author-role='assistant']",
+        "streaming": "button[aria-label*='Stop' i]",
+    },
+    "claude": {
+        "input": "div.ProseMirror[contenteditable='true']",
+        "submit": "button[aria-label*='Send' i]",
+        "response": "[data-is-streaming]",
+        "streaming": "[data-is-streaming='true']",
+    },
+}
+
+
+def provider_selectors():
+    """Selector theo provider, đã gộp với ghi đè trong settings"""
+    selectors = {provider: dict(GENERIC_SELECTORS, **values) for provider, values in PROVIDER_SELECTORS.items()}
+    for provider, values in get_settings().section("selectors").items():
+        selectors[provider] = dict(selectors.get(provider, GENERIC_SELECTORS), **values)
+    return selectors
+
+
+_HOSTS = {urlparse(url).netloc: name for name, url in PROVIDERS.items()}
+_HOSTS.update(HOST_ALIASES)
+
+
+def provider_for_url(url):
+    """Trả về tên provider của URL, hoặc host nếu không thuộc provider nào."""
+    host = urlparse(url).netloc.lower()
+    if host in _HOSTS:
+        return _HOSTS[host]
+    for known_host, name in _HOSTS.items():
+        if host.endswith("." + known_host):
+            return name
+    return host
@@ -0,0 +1,142 @@
+# File: resources.py
+import glob
+import logging
+import os
+
+from PyQt6.QtCore import QRectF, QSize, Qt
+from PyQt6.QtGui import QGuiApplication, QIcon, QImage, QPainter, QPixmap, QPixmapCache
+from PyQt6.QtSvg import QSvgRenderer
+
+from utils import AppPaths
+
+# Các kích thước (logical px) của icon khay hệ thống
+TRAY_ICON_SIZES = (16, 22, 24, 32, 48, 64)
+
+
+class ResourceRegistry:
+    """Tìm thư mục images/ một lần và dựng sẵn pixmap của icon.
+
+    Pixmap được giữ trong QPixmapCache và lưu PNG vào cache trên đĩa theo
+    (tên, kích thước, DPR, mtime) nên lần sau không phải parse SVG nữa.
+    """
+
+    def __init__(self, paths=None):
+        paths = paths or AppPaths()
+        self.images_dir = os.path.join(paths.get_root(), "images")
+        self.cache_dir = paths.get_appdata_dir("icon_cache")
+        self.images = {}
+        self.scan()
+
+    def scan(self):
+        # Một lần quét thay cho os.path.exists ở mỗi lần tra cứu
+        try:
+            with os.scandir(self.images_dir) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        self.images[entry.name] = (entry.path, entry.stat().st_mtime_ns)
+        except OSError as e:
+            logging.warning(f"Resources: cannot scan {self.images_dir}: {e}")
+
+    def image_path(self, name):
+        entry = self.images.get(name)
+        if entry is None:
+            logging.warning(f"Resources: missing image {name} in {self.images_dir}")
+            return None
+        return entry[0]
+
+    @staticmethod
+    def default_dpr():
+        screen = QGuiApplication.primaryScreen()
+        return screen.devicePixelRatio() if screen else 1.0
+
+    def pixmap(self, name, size, dpr=None):
+        """Pixmap của ảnh vừa khít trong size (logical px, giữ tỉ lệ) ở device pixel ratio dpr"""
+        entry = self.images.get(name)
+        if entry is None:
+            self.image_path(name)
+            return QPixmap()
+        path, mtime = entry
+        dpr = dpr or self.default_dpr()
+        key = f"smartai:{name}:{size.width()}x{size.height()}@{dpr:g}"
+
+        pixmap = QPixmapCache.find(key)
+        if pixmap is not None and not pixmap.isNull():
+            return pixmap
+
+        stem = os.path.splitext(name)[0]
+        prefix = f"{stem}-{size.width()}x{size.height()}@{dpr:g}-"
+        disk_path = os.path.join(self.cache_dir, f"{prefix}{mtime}.png")
+        pixmap = QPixmap()
+        if not pixmap.load(disk_path):
+            pixmap = self.render(path, size, dpr)
+            if pixmap.isNull():
+                return pixmap
+            # Bỏ bản cache cũ của file ảnh trước khi bị sửa
+            for stale in glob.glob(os.path.join(self.cache_dir, glob.escape(prefix) + "*.png")):
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+            pixmap.save(disk_path, "PNG")
+        pixmap.setDevicePixelRatio(dpr)
+        QPixmapCache.insert(key, pixmap)
+        return pixmap
+
+    @staticmethod
+    def render(path, size, dpr):
+        if not path.lower().endswith(".svg"):
+            image = QImage(path)
+            if image.isNull():
+                return QPixmap()
+            return QPixmap.fromImage(image.scaled(
+                size * dpr, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+
+        renderer = QSvgRenderer(path)
+        if not renderer.isValid():
+            logging.warning(f"Resources: cannot parse {path}")
+            return QPixmap()
+        target = renderer.defaultSize().scaled(size * dpr, Qt.AspectRatioMode.KeepAspectRatio)
+        image = QImage(target, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(image)
+        renderer.render(painter, QRectF(0, 0, target.width(), target.height()))
+        painter.end()
+        return QPixmap.fromImage(image)
+
+    def icon(self, name, size, dpr=None):
+        icon = QIcon()
+        pixmap = self.pixmap(name, size, dpr)
+        if not pixmap.isNull():
+            icon.addPixmap(pixmap)
+        return icon
+
+    def tray_icon(self, dpr=None):
+        icon = QIcon()
+        for size in TRAY_ICON_SIZES:
+            pixmap = self.pixmap("tray.svg", QSize(size, size), dpr)
+            if not pixmap.isNull():
+                icon.addPixmap(pixmap)
+        return icon
+
+    def prerender(self, specs, dpr=None):
+        """specs: [(tên ảnh, QSize)], đưa sẵn vào QPixmapCache trước khi widget được vẽ.
+
+        Không chỉ định dpr: dựng cho DPR của mọi màn hình, vì widget vẽ theo màn hình
+        nó đang ở (sidebar nằm ở màn hình bên phải nhất, không nhất thiết là màn hình chính).
+        """
+        dprs = [dpr]
+        if not dpr:
+            dprs = sorted({screen.devicePixelRatio() for screen in QGuiApplication.screens()}) or [self.default_dpr()]
+        for value in dprs:
+            for name, size in specs:
+                self.pixmap(name, size, value)
+
+
+_resources = None
+
+
+def get_resources():
+    global _resources
+    if _resources is None:
+        _resources = ResourceRegistry()
+    return _resources
@@ -0,0 +1,113 @@
+# File: screen_layout.py
+import logging
+
+from PyQt6.QtCore import QObject, QRect, QTimer, pyqtSignal
+from PyQt6.QtGui import QGuiApplication
+
+# Độ rộng sidebar so với màn hình: mặc định, nhỏ nhất, lớn nhất
+DEFAULT_WIDTH_RATIO = 0.6
+MIN_WIDTH_RATIO = 0.2
+MAX_WIDTH_RATIO = 0.8
+
+TRIGGER_WIDTH = 5
+
+
+def screen_key(screen):
+    # Tên output (HDMI-1, \\.\DISPLAY2...) không đổi khi đổi độ phân giải
+    return screen.name() or f"{screen.manufacturer()} {screen.model()}".strip() or "screen"
+
+
+class ScreenLayout(QObject):
+    """Màn hình bên phải nhất và geometry của sidebar/edge trigger trên màn hình đó.
+
+    Chỉ tính lại khi có màn hình được cắm/rút hoặc đổi geometry; đường hiện sidebar
+    chỉ đọc các giá trị đã tính sẵn. Độ rộng sidebar được nhớ riêng cho từng màn hình.
+    """
+
+    layoutChanged = pyqtSignal()
+
+    def __init__(self, session, parent=None):
+        super().__init__(parent)
+        self.session = session
+        self.widths = dict(session.get("sidebar_widths") or {})
+        # Độ rộng của bản cũ (một giá trị chung) dùng cho màn hình chưa có độ rộng riêng
+        self.legacy_width = session.get("sidebar_width")
+        self.recomputes = 0
+
+        self.screen = None
+        self.key = None
+        self.geometry = QRect()
+        self.available = QRect()
+        self.trigger_rect = QRect()
+
+        # Cắm/rút màn hình phát nhiều signal liên tiếp: gộp thành một lần tính lại
+        self.recompute_timer = QTimer(self)
+        self.recompute_timer.setSingleShot(True)
+        self.recompute_timer.setInterval(0)
+        self.recompute_timer.timeout.connect(self.recompute)
+
+        app = QGuiApplication.instance()
+        app.screenAdded.connect(self.on_screen_added)
+        app.screenRemoved.connect(self.on_screen_removed)
+        for screen in app.screens():
+            self.watch(screen)
+        self.recompute()
+
+    def watch(self, screen):
+        screen.geometryChanged.connect(self.recompute_timer.start)
+        screen.availableGeometryChanged.connect(self.recompute_timer.start)
+
+    def on_screen_added(self, screen):
+        self.watch(screen)
+        self.recompute_timer.start()
+
+    def on_screen_removed(self, screen):
+        # Màn hình bị rút có thể là màn hình đang dùng: tính lại ngay
+        if screen is self.screen:
+            self.screen = None
+        self.recompute_timer.start()
+
+    def recompute(self):
+        screens = [screen for screen in QGuiApplication.screens() if screen is not None]
+        if not screens:
+            return
+        screen = max(screens, key=lambda s: s.geometry().x() + s.geometry().width())
+        self.screen = screen
+        self.key = screen_key(screen)
+        self.geometry = screen.geometry()
+        self.available = screen.availableGeometry()
+        self.trigger_rect = QRect(self.geometry.x() + self.geometry.width() - TRIGGER_WIDTH,
+                                  self.geometry.y(), TRIGGER_WIDTH, self.geometry.height())
+        self.recomputes += 1
+        logging.info(f"Screen layout: {self.key} {self.geometry.width()}x{self.geometry.height()} "
+                     f"at {self.geometry.x()},{self.geometry.y()} ({len(screens)} screens)")
+        self.layoutChanged.emit()
+
+    def min_width(self):
+        return int(self.geometry.width() * MIN_WIDTH_RATIO)
+
+    def max_width(self):
+        return int(self.geometry.width() * MAX_WIDTH_RATIO)
+
+    def width(self):
+        """Độ rộng sidebar đã lưu cho màn hình hiện tại, giới hạn theo kích thước màn hình"""
+        width = self.widths.get(self.key) or self.legacy_width
+        if not width:
+            return int(self.geometry.width() * DEFAULT_WIDTH_RATIO)
+        return max(self.min_width(), min(self.max_width(), int(width)))
+
+    def remember_width(self, width):
+        self.widths[self.key] = width
+        self.session.set("sidebar_widths", dict(self.widths))
+
+    def sidebar_rect(self, width):
+        return QRect(self.available.x() + self.available.width() - width, self.available.y(),
+                     width, self.available.height())
+
+    def stats(self):
+        return {
+            "screen": self.key,
+            "geometry": [self.geometry.x(), self.geometry.y(), self.geometry.width(), self.geometry.height()],
+            "recomputes": self.recomputes,
+            "widths": dict(self.widths),
+        }
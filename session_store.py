@@ -0,0 +1,191 @@
+# File: session_store.py
+import copy
+import json
+import logging
+import os
+import threading
+import time
+
+from config import get_settings
+from utils import AppPaths
+
+SESSION_VERSION = 1
+
+# Kiểu hợp lệ của các khóa đã biết (None luôn hợp lệ); file sửa tay sai kiểu thì dùng mặc định
+SESSION_TYPES = {
+    "active_provider": str,
+    "sidebar_width": (int, float),
+    "sidebar_widths": dict,
+    "providers": dict,
+}
+
+# Ghi lỗi (ổ đầy, không có quyền...): thử lại sau khoảng chờ tăng dần tới MAX_RETRY_S
+MAX_RETRY_S = 60.0
+
+
+class SessionStore:
+    """Trạng thái phiên: provider đang mở, URL/scroll/zoom theo provider, độ rộng sidebar.
+
+    Đọc một lần lúc khởi động. Mỗi thay đổi chỉ cập nhật dict trong RAM; thread nền
+    gộp các thay đổi liên tiếp (debounce) rồi ghi nguyên tử (file tạm + rename).
+    """
+
+    def __init__(self, path=None, debounce_s=1.0):
+        self.path = path or os.path.join(AppPaths().get_appdata_dir(), "session.json")
+        self.debounce_s = debounce_s
+        self.data = {"version": SESSION_VERSION, "active_provider": None,
+                     "sidebar_width": None, "sidebar_widths": {}, "providers": {}}
+        self.lock = threading.Lock()
+        self.io_lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.dirty = False
+        self.changed_at = 0.0
+        self.retry_at = 0.0
+        self.failures = 0
+        self.closed = False
+        self.writer = None
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                stored = json.load(file)
+            if isinstance(stored, dict) and stored.get("version") == SESSION_VERSION:
+                self.data.update(self.validated(stored))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logging.warning(f"Session: ignoring unreadable {self.path}: {e}")
+
+    @staticmethod
+    def valid_value(key, value):
+        expected = SESSION_TYPES.get(key)
+        if expected is None:
+            return True
+        if value is None:
+            # Các khóa dict được truy cập trực tiếp, không được là null
+            return expected is not dict
+        return isinstance(value, expected) and not isinstance(value, bool)
+
+    def validated(self, stored):
+        valid = {}
+        for key, value in stored.items():
+            if not self.valid_value(key, value):
+                logging.warning(f"Session: ignoring {key!r} of type {type(value).__name__}")
+                continue
+            valid[key] = value
+        if "providers" in valid:
+            valid["providers"] = {provider: state for provider, state in valid["providers"].items()
+                                  if isinstance(state, dict)}
+        if "sidebar_widths" in valid:
+            valid["sidebar_widths"] = {screen: width for screen, width in valid["sidebar_widths"].items()
+                                       if self.valid_value("sidebar_width", width) and width is not None}
+        return valid
+
+    # --- Đọc ---
+
+    def get(self, key, default=None):
+        with self.lock:
+            value = self.data.get(key)
+        return default if value is None else value
+
+    def provider_state(self, provider):
+        with self.lock:
+            return dict(self.data["providers"].get(provider, {}))
+
+    def last_url(self, provider):
+        return self.provider_state(provider).get("url")
+
+    # --- Ghi (chỉ đánh dấu dirty, việc ghi đĩa do thread nền làm) ---
+
+    def set(self, key, value):
+        with self.lock:
+            if self.data.get(key) == value:
+                return
+            self.data[key] = value
+            self.mark_dirty()
+
+    def update_provider(self, provider, **values):
+        with self.lock:
+            state = self.data["providers"].setdefault(provider, {})
+            changed = {key: value for key, value in values.items()
+                       if value is not None and state.get(key) != value}
+            if not changed:
+                return
+            state.update(changed)
+            self.mark_dirty()
+
+    def mark_dirty(self):
+        # Gọi khi đang giữ self.lock
+        self.dirty = True
+        self.changed_at = time.monotonic()
+        if self.writer is None:
+            self.writer = threading.Thread(target=self.run_writer, name="session-writer", daemon=True)
+            self.writer.start()
+        self.changed.notify()
+
+    def run_writer(self):
+        while True:
+            with self.lock:
+                while not self.dirty and not self.closed:
+                    self.changed.wait()
+                if self.closed:
+                    return
+                # Chờ tới khi không còn thay đổi mới trong debounce_s (và hết thời gian chờ sau lỗi ghi)
+                remaining = self.remaining_delay()
+                while remaining > 0 and not self.closed:
+                    self.changed.wait(remaining)
+                    remaining = self.remaining_delay()
+            self.write()
+
+    def remaining_delay(self):
+        now = time.monotonic()
+        return max(self.debounce_s - (now - self.changed_at), self.retry_at - now)
+
+    def write(self):
+        with self.io_lock:
+            with self.lock:
+                if not self.dirty:
+                    return
+                payload = json.dumps(copy.deepcopy(self.data), indent=2)
+                self.dirty = False
+
+            temp_path = self.path + ".tmp"
+            try:
+                with open(temp_path, "w", encoding="utf-8") as file:
+                    file.write(payload)
+                    file.flush()
+                    os.fsync(file.fileno())
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                with self.lock:
+                    self.dirty = True
+                    self.failures += 1
+                    delay = min(MAX_RETRY_S, self.debounce_s * 2 ** self.failures)
+                    self.retry_at = time.monotonic() + delay
+                # Chỉ log lần lỗi đầu của mỗi chuỗi lỗi liên tiếp
+                if self.failures == 1:
+                    logging.warning(f"Session: cannot write {self.path}: {e}; retrying with backoff")
+                return
+            if self.failures:
+                logging.info(f"Session: written {self.path} after {self.failures} failed attempts")
+                with self.lock:
+                    self.failures = 0
+                    self.retry_at = 0.0
+
+    def flush(self):
+        """Ghi ngay phần còn lại (gọi khi thoát ứng dụng)"""
+        with self.lock:
+            self.closed = True
+            self.changed.notify_all()
+        self.write()
+
+
+_session = None
+
+
+def get_session():
+    global _session
+    if _session is None:
+        _session = SessionStore(debounce_s=get_settings().get("session", "debounce_ms", 1000) / 1000)
+    return _session
@@ -1,5 +1,7 @@
 # File: sidebar.py
 import sys
+import time
+from collections import deque
 from PyQt6.QtCore import Qt, QTimer, QPoint, QEvent
 from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QApplication
 from PyQt6.QtGui import QCursor, QShortcut, QKeySequence
@@ -14,14 +16,47 @@ if sys.platform == 'win32':
     except ImportError:
         pass
 
+from components.clipboard_picker import ClipboardPicker
+from components.slide_animation import SlideAnimator
 from components.title_bar import TitleBar
 from components.resize_handle import ResizeHandle
-from components.content_widget import ContentWidget
+from config import get_settings
+from instrumentation import show_probe, startup_timer
+from screen_layout import ScreenLayout
+from session_store import get_session
 
 class EdgeTrigger(QWidget):
+    """Dải 5 px ở mép màn hình; chỉ mở sidebar khi con trỏ thật sự dừng lại ở đó.
+
+    Con trỏ phải ở trong dải đủ dwell_ms với tốc độ dưới max_velocity_px_s
+    (tính từ mouse-move của chính dải, không polling), và không nằm ở góc màn hình.
+    """
+
+    # Sidebar bị ẩn trong khoảng này sau khi mở bằng hover: coi là mở nhầm
+    QUICK_HIDE_S = 1.0
+    # Tốc độ tính trên quãng dịch chuyển trong cửa sổ này, không theo từng mouse-move:
+    # chuột polling 1000 Hz rung 1-2 px giữa hai event đã vượt 1500 px/s
+    VELOCITY_WINDOW_S = 0.05
+
     def __init__(self, sidebar_ref):
         super().__init__(None)
         self.sidebar_ref = sidebar_ref
+        options = get_settings().section("edge_trigger")
+        self.dwell_ms = options.get("dwell_ms", 150)
+        self.max_velocity = options.get("max_velocity_px_s", 1500)
+        self.corner_px = options.get("corner_px", 8)
+        self.last_move = None
+        self.recent_moves = deque()
+        self.hover_shown_at = None
+        # Dwell đã hết hạn ở góc: đếm lại khi con trỏ rời góc mà vẫn trong dải
+        self.rearm_outside_corner = False
+        self.counters = {"hover_shows": 0, "click_shows": 0, "avoided": 0,
+                         "velocity_resets": 0, "corner_ignored": 0, "quick_hides": 0}
+
+        self.dwell_timer = QTimer(self)
+        self.dwell_timer.setSingleShot(True)
+        self.dwell_timer.timeout.connect(self.on_dwell)
+
         self.setWindowFlags(
             Qt.WindowType.FramelessWindowHint |
             Qt.WindowType.WindowStaysOnTopHint |
@@ -32,27 +67,115 @@ class EdgeTrigger(QWidget):
         self.setMouseTracking(True)
         self.setStyleSheet("background-color: rgba(0, 0, 0, 1);")
 
+    def start_tracking(self, y):
+        self.last_move = (time.perf_counter(), y)
+        self.recent_moves.clear()
+        self.recent_moves.append(self.last_move)
+
     def enterEvent(self, event):
-        if self.sidebar_ref:
-            self.sidebar_ref.show_sidebar()
+        if self.sidebar_ref and not self.sidebar_ref.is_visible:
+            self.start_tracking(event.position().y())
+            if self.dwell_ms <= 0:
+                self.show_from_hover()
+            else:
+                self.dwell_timer.start(self.dwell_ms)
         super().enterEvent(event)
-        
+
+    def in_corner(self, y):
+        return y < self.corner_px or y > self.height() - self.corner_px
+
+    def mouseMoveEvent(self, event):
+        if self.rearm_outside_corner and not self.in_corner(event.position().y()):
+            self.rearm_outside_corner = False
+            if self.sidebar_ref and not self.sidebar_ref.is_visible:
+                self.start_tracking(event.position().y())
+                self.dwell_timer.start(self.dwell_ms)
+        elif self.dwell_timer.isActive():
+            now, y = time.perf_counter(), event.position().y()
+            moves = self.recent_moves
+            # Giữ mẫu cũ nhất còn trong cửa sổ làm gốc để đo quãng dịch chuyển
+            while len(moves) > 1 and now - moves[1][0] >= self.VELOCITY_WINDOW_S:
+                moves.popleft()
+            if moves:
+                since, start_y = moves[0]
+                # Chia cho ít nhất cả cửa sổ: vài px rung trong 1 ms không thành tốc độ lớn
+                velocity = abs(y - start_y) / max(now - since, self.VELOCITY_WINDOW_S)
+                # Lướt dọc mép (về phía góc, thanh cuộn...): đếm dwell lại từ đầu
+                if velocity > self.max_velocity:
+                    self.counters["velocity_resets"] += 1
+                    self.dwell_timer.start(self.dwell_ms)
+                    moves.clear()
+            self.last_move = (now, y)
+            moves.append(self.last_move)
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        self.rearm_outside_corner = False
+        if self.dwell_timer.isActive():
+            # Con trỏ chỉ lướt qua: tránh được một lần hiện/ẩn vô ích
+            self.dwell_timer.stop()
+            self.counters["avoided"] += 1
+        super().leaveEvent(event)
+
+    def on_dwell(self):
+        if not self.sidebar_ref or self.sidebar_ref.is_visible:
+            return
+        y = self.last_move[1] if self.last_move else 0
+        if self.in_corner(y):
+            self.counters["corner_ignored"] += 1
+            self.rearm_outside_corner = True
+            return
+        self.show_from_hover()
+
+    def show_from_hover(self):
+        show_probe.begin("hover")
+        self.counters["hover_shows"] += 1
+        self.hover_shown_at = time.perf_counter()
+        self.sidebar_ref.show_sidebar()
+
     def mousePressEvent(self, event):
+        # Click là ý định rõ ràng: mở ngay
         if self.sidebar_ref:
+            self.dwell_timer.stop()
+            self.rearm_outside_corner = False
+            show_probe.begin("click")
+            self.counters["click_shows"] += 1
             self.sidebar_ref.show_sidebar()
         super().mousePressEvent(event)
 
+    def note_hidden(self):
+        if self.hover_shown_at is not None and time.perf_counter() - self.hover_shown_at < self.QUICK_HIDE_S:
+            self.counters["quick_hides"] += 1
+        self.hover_shown_at = None
+
+    def stats(self):
+        return dict(self.counters, dwell_ms=self.dwell_ms)
+
 class Sidebar(QMainWindow):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, lazy_content=False, clipboard_history=None):
         super().__init__(parent)
         self.setWindowTitle("SmartAI Sidebar")
         self.is_visible = False
-        self.active_screen = None
         self.is_resizing = False
         self.has_active_popup = False
         self.popup_windows = []
-        self.last_width = None
+        self.session = get_session()
+        # Geometry màn hình tính sẵn, cập nhật khi cắm/rút màn hình hoặc đổi độ phân giải
+        self.screens = ScreenLayout(self.session, self)
+        self.screens.layoutChanged.connect(self.on_screen_layout_changed)
         self.edge_trigger = None
+        self.lazy_content = lazy_content
+        self.content_widget = None
+        self.first_paint_done = False
+        self.clipboard_history = clipboard_history
+        self.clipboard_picker = None
+        # Widget mà paint đầu tiên sau khi hiện được tính là "first frame" (show_probe)
+        self.frame_target = None
+        # Trượt vào/ra bằng snapshot của ContentWidget (None: hiện/ẩn ngay)
+        animation = get_settings().section("animation")
+        self.slide = None
+        if animation.get("enabled", True):
+            self.slide = SlideAnimator(animation.get("duration_ms", 160), self)
         self.init_ui()
         self.setup_shortcut()
 
@@ -62,6 +185,8 @@ class Sidebar(QMainWindow):
     def setup_shortcut(self):
         shortcut = QShortcut(QKeySequence("Ctrl+Shift+F"), self)
         shortcut.activated.connect(self.toggle_sidebar)
+        clipboard_shortcut = QShortcut(QKeySequence("Ctrl+Shift+V"), self)
+        clipboard_shortcut.activated.connect(self.show_clipboard_picker)
 
     def init_ui(self):
         # Dùng Tool + Parent để ổn định focus và ẩn khỏi taskbar
@@ -87,20 +212,17 @@ class Sidebar(QMainWindow):
         self.title_bar = TitleBar(self)
         main_layout.addWidget(self.title_bar)
 
-        self.content_widget = ContentWidget()
-        main_layout.addWidget(self.content_widget)
-
-        self.content_widget.web_view.popupCreated.connect(self.handle_popup_created)
-        self.content_widget.web_view.authCompleted.connect(self.handle_auth_completed)
+        # Giữ chỗ cho ContentWidget; QtWebEngine chỉ được tạo trong ensure_content()
+        self.main_layout = main_layout
+        self.content_placeholder = QWidget()
+        self.content_placeholder.setStyleSheet("background-color: #33322F;")
+        main_layout.addWidget(self.content_placeholder)
 
         container_layout.addWidget(main_widget)
 
         self.setCentralWidget(container)
 
-        self.rightmost_screen = max(QApplication.screens(), key=lambda s: s.geometry().x() + s.geometry().width())
-        
-        if self.rightmost_screen:
-            self.setFixedWidth(int(self.rightmost_screen.geometry().width() * 0.6))
+        self.setFixedWidth(self.screens.width())
 
         if not HAS_WIN32:
             self.setup_edge_trigger()
@@ -112,6 +234,46 @@ class Sidebar(QMainWindow):
             }
         """)
 
+        if not self.lazy_content:
+            self.ensure_content()
+
+    def ensure_content(self):
+        """Import QtWebEngine và dựng ContentWidget (chỉ ở lần gọi đầu tiên)"""
+        if self.content_widget is not None:
+            return self.content_widget
+
+        from components.content_widget import ContentWidget
+        startup_timer.mark("webengine_import")
+
+        self.content_widget = ContentWidget()
+        self.content_widget.popupCreated.connect(self.handle_popup_created)
+        self.content_widget.authCompleted.connect(self.handle_auth_completed)
+        self.content_widget.clipboardHistoryRequested.connect(self.show_clipboard_picker)
+        startup_timer.mark("webengine_ready")
+
+        self.main_layout.replaceWidget(self.content_placeholder, self.content_widget)
+        self.content_placeholder.deleteLater()
+        self.content_placeholder = None
+        return self.content_widget
+
+    def show_clipboard_picker(self):
+        if self.clipboard_history is None:
+            return
+        if not self.is_visible:
+            self.show_sidebar()
+        if self.clipboard_picker is None:
+            self.clipboard_picker = ClipboardPicker(self.clipboard_history, self)
+            self.clipboard_picker.clipSelected.connect(self.send_clip)
+        self.clipboard_picker.popup_at(self)
+
+    def send_clip(self, digest):
+        # Gửi vào ô chat đang focus của provider hiện tại qua text bridge
+        text = self.clipboard_history.text(digest)
+        view = self.ensure_content().web_view
+        if text and view:
+            view.setFocus()
+            view.custom_page.insert_text(text, source="history")
+
     def setup_edge_trigger(self):
         try:
             self.edge_trigger = EdgeTrigger(self)
@@ -121,15 +283,17 @@ class Sidebar(QMainWindow):
             print(f"Failed to setup edge trigger: {e}")
 
     def update_trigger_position(self):
-        if self.edge_trigger and self.rightmost_screen:
-            geo = self.rightmost_screen.geometry()
-            trigger_width = 5
-            x = geo.x() + geo.width() - trigger_width
-            y = geo.y()
-            h = geo.height()
-            self.edge_trigger.setGeometry(x, y, trigger_width, h)
+        if self.edge_trigger:
+            self.edge_trigger.setGeometry(self.screens.trigger_rect)
             self.edge_trigger.raise_()
 
+    def on_screen_layout_changed(self):
+        self.update_trigger_position()
+        if not self.is_resizing:
+            self.setFixedWidth(self.screens.width())
+        if self.is_visible:
+            self.update_position()
+
     def handle_popup_created(self, popup):
         self.popup_windows.append(popup)
         self.has_active_popup = True
@@ -153,26 +317,53 @@ class Sidebar(QMainWindow):
         if self.is_visible:
             self.hide_sidebar()
         else:
+            show_probe.begin("shortcut")
             self.show_sidebar()
 
     def hide_sidebar(self):
-        self.hide()
         self.is_visible = False
+        # Trace chưa tới first frame thì bỏ: lần hiện sau phải đo từ trigger của chính nó
+        show_probe.cancel()
+        # Snapshot phải được chụp trước khi page bị suspend
+        animate = self.slide is not None and self.content_widget is not None and self.isVisible()
+        if animate:
+            self.slide.slide_out(self.content_widget, self.finish_hide)
+        if self.content_widget:
+            self.content_widget.suspend()
+        if not animate:
+            self.finish_hide()
+
+    def finish_hide(self):
+        self.hide()
         if self.edge_trigger:
+            self.edge_trigger.note_hidden()
             self.edge_trigger.show()
             self.edge_trigger.raise_()
 
     def show_sidebar(self):
-        screen = self.rightmost_screen
-        if screen:
-            self.active_screen = screen
+        # Đo độ trễ hiện sidebar; gọi lại khi đang hiện thì không có frame mới để đo
+        if self.is_visible:
+            show_probe.cancel()
+        else:
+            show_probe.begin("direct")
+            show_probe.mark("show_sidebar")
+        content = self.ensure_content()
+        content.resume()
+        self.frame_target = self.first_frame_target()
+        # Đang trượt ra thì dừng lại: cửa sổ vẫn hiện, nội dung thật hiện ngay
+        was_shown = self.isVisible()
+        if self.slide:
+            self.slide.stop()
+        if self.screens.screen is not None:
             if not self.is_resizing:
-                self.setFixedWidth(self.last_width or int(screen.geometry().width() * 0.6))
-            
+                self.setFixedWidth(self.screens.width())
+
+            # Geometry đã được tính sẵn; showEvent đặt lại vị trí một lần nữa sau khi map cửa sổ
             self.update_position()
             self.show()
-            self.update_position()
             self.is_visible = True
+            if self.slide and not was_shown:
+                self.slide.slide_in(content)
             
             # Force focus sequence - Quan trọng để bắt sự kiện mất focus sau này
             self.raise_()
@@ -182,29 +373,36 @@ class Sidebar(QMainWindow):
             # Double check focus sau 100ms
             QTimer.singleShot(100, self.ensure_focus)
 
+    def first_frame_target(self):
+        current = self.content_widget.view_stack.currentWidget() if self.content_widget else None
+        if current is None:
+            return self
+        # QWebEngineView vẽ qua widget con của Chromium (focus proxy)
+        return current.focusProxy() or current
+
     def ensure_focus(self):
         if self.is_visible:
             self.activateWindow()
             self.setFocus()
 
     def update_position(self):
-        if not self.active_screen:
+        if self.screens.screen is None:
             return
-        avail_geo = self.active_screen.availableGeometry()
-        x = avail_geo.x() + avail_geo.width() - self.width()
-        y = avail_geo.y()
-        h = avail_geo.height()
-        self.setGeometry(x, y, self.width(), h)
-        self.move(x, y)
-        
-        if not HAS_WIN32 and self.edge_trigger:
-            self.update_trigger_position()
+        self.setGeometry(self.screens.sidebar_rect(self.width()))
 
     def showEvent(self, event):
         QTimer.singleShot(0, self.update_position)
         super().showEvent(event)
 
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_paint_done:
+            self.first_paint_done = True
+            startup_timer.mark("first_paint")
+
     def closeEvent(self, event):
+        if self.slide:
+            self.slide.stop()
         for popup in self.popup_windows[:]:
             popup.close()
         self.popup_windows.clear()
@@ -213,6 +411,12 @@ class Sidebar(QMainWindow):
         super().closeEvent(event)
 
     def eventFilter(self, obj, event):
+        if show_probe.trace is not None:
+            if event.type() == QEvent.Type.Expose and obj is self.windowHandle() and obj.isExposed():
+                show_probe.mark("exposed")
+            elif event.type() == QEvent.Type.Paint and obj is self.frame_target:
+                show_probe.mark("first_frame")
+
         # Chỉ bắt sự kiện mất focus (WindowDeactivate)
         # Đây là cách duy nhất đáng tin cậy để biết người dùng đã click ra ngoài
         if event.type() == QEvent.Type.WindowDeactivate:
@@ -225,13 +429,11 @@ class Sidebar(QMainWindow):
         return super().eventFilter(obj, event)
 
     def get_current_screen_width(self):
-        if self.active_screen:
-            return self.active_screen.geometry().width()
-        return QApplication.primaryScreen().geometry().width()
+        return self.screens.geometry.width()
 
     def resizing_started(self):
         self.is_resizing = True
 
     def resizing_finished(self):
         self.is_resizing = False
-        self.last_width = self.width()
+        self.screens.remember_width(self.width())
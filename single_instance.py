@@ -0,0 +1,118 @@
+# File: single_instance.py
+import getpass
+import json
+import logging
+import re
+import time
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+
+# Lệnh mà lần chạy thứ hai gửi cho instance đang chạy
+COMMANDS = ("show", "toggle", "hide", "quit")
+
+CONNECT_TIMEOUT_MS = 200
+REPLY_TIMEOUT_MS = 1000
+
+
+def server_name():
+    # Mỗi user một instance; tên socket chỉ gồm ký tự an toàn
+    return "SmartAI-" + re.sub(r"[^A-Za-z0-9_.-]", "_", getpass.getuser())
+
+
+def instance_command(argv):
+    """--toggle/--hide/--quit trên dòng lệnh; mặc định là hiện sidebar"""
+    for command in COMMANDS:
+        if f"--{command}" in argv[1:]:
+            return command
+    return "show"
+
+
+def forward_to_running_instance(command, argv=(), name=None):
+    """Gửi lệnh cho instance đang chạy.
+
+    None: không có instance nào; True: instance đã xác nhận lệnh; False: có instance giữ
+    socket nhưng không xác nhận trong REPLY_TIMEOUT_MS (bị treo hoặc đang khởi động).
+
+    Chỉ dùng QtCore/QtNetwork (không cần QApplication), để lần chạy thứ hai
+    thoát ngay mà không import QtWidgets/QtWebEngine.
+    """
+    start = time.perf_counter()
+    socket = QLocalSocket()
+    socket.connectToServer(name or server_name())
+    if not socket.waitForConnected(CONNECT_TIMEOUT_MS):
+        return None
+    message = json.dumps({"command": command, "argv": list(argv)}) + "\n"
+    socket.write(message.encode("utf-8"))
+    socket.flush()
+    socket.waitForBytesWritten(REPLY_TIMEOUT_MS)
+    # Chờ xác nhận để biết instance kia còn xử lý lệnh, không chỉ còn giữ socket
+    acknowledged = socket.waitForReadyRead(REPLY_TIMEOUT_MS) and bytes(socket.readLine()).strip() == b"ok"
+    socket.disconnectFromServer()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if acknowledged:
+        logging.info(f"Single instance: forwarded {command!r} in {elapsed_ms:.1f} ms")
+    else:
+        logging.warning(f"Single instance: running instance did not acknowledge {command!r} "
+                        f"within {elapsed_ms:.0f} ms")
+    return acknowledged
+
+
+class InstanceServer(QObject):
+    """QLocalServer của instance chính: nhận lệnh từ các lần chạy sau"""
+
+    commandReceived = pyqtSignal(str, list)
+
+    def __init__(self, name=None, parent=None):
+        super().__init__(parent)
+        self.name = name or server_name()
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self.server.newConnection.connect(self.on_new_connection)
+        self.received = 0
+
+    def listen(self):
+        """False nếu một instance khác đã giữ tên này"""
+        if self.server.listen(self.name):
+            return True
+        if self.server.serverError() == QLocalSocket.LocalSocketError.AddressInUseError:
+            # File socket còn sót lại sau khi instance trước bị kill: không ai trả lời thì xóa
+            probe = QLocalSocket()
+            probe.connectToServer(self.name)
+            if probe.waitForConnected(CONNECT_TIMEOUT_MS):
+                probe.disconnectFromServer()
+                return False
+            QLocalServer.removeServer(self.name)
+            if self.server.listen(self.name):
+                return True
+        logging.warning(f"Single instance: cannot listen on {self.name}: {self.server.errorString()}")
+        # Không nghe được vì lý do khác: vẫn chạy bình thường, chỉ mất tính năng chuyển lệnh
+        return True
+
+    def on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            socket.readyRead.connect(lambda s=socket: self.on_ready_read(s))
+            socket.disconnected.connect(socket.deleteLater)
+
+    def on_ready_read(self, socket):
+        while socket.canReadLine():
+            line = bytes(socket.readLine()).decode("utf-8", "replace").strip()
+            try:
+                message = json.loads(line)
+            except ValueError:
+                logging.warning("Single instance: malformed message")
+                continue
+            command = message.get("command")
+            if command not in COMMANDS:
+                continue
+            self.received += 1
+            socket.write(b"ok\n")
+            socket.flush()
+            self.commandReceived.emit(command, message.get("argv", []))
+
+    def close(self):
+        self.server.close()
+
+    def stats(self):
+        return {"name": self.name, "listening": self.server.isListening(), "received": self.received}
@@ -17,10 +17,8 @@ class AppPaths:
         return self.root_path
 
     def get_path(self, *paths):
-        abs_path = os.path.join(self.root_path, *paths)
-        if not os.path.exists(abs_path):
-            print(f"Warning: Path does not exist: {abs_path}")
-        return abs_path
+        # Không kiểm tra tồn tại ở mỗi lần gọi: nơi mở file tự xử lý file thiếu
+        return os.path.join(self.root_path, *paths)
 
     def get_data_dir(self, subfolder=None):
         base_path = os.path.join(self.root_path, "data")
@@ -45,6 +43,23 @@ class AppPaths:
         os.makedirs(base_path, exist_ok=True)
         return base_path
 
+    def get_cache_dir(self, subfolder=None):
+        if sys.platform == 'win32':
+            base_path = os.path.join(
+                os.environ.get('LOCALAPPDATA', os.path.expanduser('~\\AppData\\Local')),
+                self.app_author,
+                self.app_name,
+                'Cache'
+            )
+        else:
+            # XDG: ~/.cache/AppName, ngoài thư mục cài đặt và không cần backup
+            base_path = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), self.app_name)
+
+        if subfolder:
+            base_path = os.path.join(base_path, subfolder)
+        os.makedirs(base_path, exist_ok=True)
+        return base_path
+
     def ensure_dir(self, dir_path):
         if not os.path.exists(dir_path):
             os.makedirs(dir_path, exist_ok=True)